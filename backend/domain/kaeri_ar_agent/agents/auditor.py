@@ -1,11 +1,44 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List, Optional
+import json
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..gates import gate_g2_citations
 from ..schemas import AuditResult, DraftNode, SourceRecord
-from ..llm_stream import StreamEmit, stream_llm_response
+from ..llm_stream import StreamEmit, stream_llm_response, strip_code_fence
+from ..tools.citations import citation_key, parse_citations
+from ..tools.keyed_cache import text_hash
+from .qa_rules import chapter_issue
+
+
+def draft_fingerprint(draft: DraftNode) -> str:
+    return text_hash("\x00".join([draft.chapter_id, draft.text, *draft.citation_source_ids]))
+
+
+def check_draft_citations(draft: DraftNode, index: Set[str]) -> List[str]:
+    """Deterministic tier: findings that make the chapter worth an LLM review.
+
+    Every ID-shaped token in a ``(id, id)`` group is parsed, known or not. Citing a
+    source outside the index, citing a known source that is not among the
+    chapter's evidence, or citing nothing despite having evidence only marks the
+    chapter suspicious; the LLM tier decides whether it is an issue.
+    """
+    evidence = {citation_key(source_id) for source_id in draft.citation_source_ids}
+    cited = parse_citations(draft.text, index | evidence)
+    findings = [
+        chapter_issue(draft.chapter_id, f"Citation to unknown source: {key}")
+        for key in cited
+        if key not in index and key not in evidence
+    ]
+    findings.extend(
+        chapter_issue(draft.chapter_id, f"Citation not backed by chapter evidence: {key}")
+        for key in cited
+        if key in index and key not in evidence
+    )
+    if evidence and not cited:
+        findings.append(chapter_issue(draft.chapter_id, "No citation found in text."))
+    return findings
 
 
 async def audit_citations_async(
@@ -14,33 +47,72 @@ async def audit_citations_async(
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
+    passed: Optional[Dict[str, str]] = None,
+    max_concurrency: int = 1,
+    stats: Optional[Dict[str, int]] = None,
 ) -> AuditResult:
+    """Tiered audit: ``gate_g2_citations`` and per-chapter checks, then the LLM per suspicious chapter.
+
+    ``passed`` maps chapter IDs to the ``draft_fingerprint`` of the last draft that
+    passed; unchanged chapters skip the LLM tier and the map is updated in place. A
+    suspicious chapter whose review reply cannot be parsed counts as not reviewed:
+    it raises no issue but is not recorded as passed either.
+    """
     audit = gate_g2_citations(sources, drafts)
-    if llm is None:
-        return audit
+    index = {citation_key(source.canonical_source_id or source.source_id) for source in sources}
+    index |= {citation_key(source.source_id) for source in sources}
+    passed = passed if passed is not None else {}
+    chapter_issues: Dict[str, List[str]] = {}
+    suspicious: List[Tuple[DraftNode, List[str]]] = []
+    unreviewed: Set[str] = set()
+    skipped = 0
+    for draft in drafts:
+        findings = check_draft_citations(draft, index)
+        chapter_issues[draft.chapter_id] = []
+        if not findings:
+            continue
+        if passed.get(draft.chapter_id) == draft_fingerprint(draft):
+            skipped += 1
+            continue
+        suspicious.append((draft, findings))
+
+    async def _review(draft: DraftNode, findings: List[str], semaphore: asyncio.Semaphore) -> None:
+        prompt = (
+            "You are a citation auditor. Review this chapter for citation issues given the "
+            "automated findings. Return a JSON array of short issue strings ([] if the "
+            "citations are acceptable).\n\n"
+            f"Findings: {'; '.join(findings)}\n"
+            f"Evidence sources: {', '.join(draft.citation_source_ids)}\n"
+            f"[{draft.chapter_id}] {draft.text}\n"
+        )
+        async with semaphore:
+            text = await stream_llm_response(llm, prompt, emit, "auditor", system_prompt=system_prompt)
+        try:
+            extra_issues = json.loads(strip_code_fence(text))
+        except ValueError:
+            extra_issues = None
+        if not isinstance(extra_issues, list):
+            unreviewed.add(draft.chapter_id)
+            return
+        chapter_issues[draft.chapter_id].extend(
+            chapter_issue(draft.chapter_id, str(item)) for item in extra_issues
+        )
+
+    if llm is not None and suspicious:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        await asyncio.gather(*(_review(draft, findings, semaphore) for draft, findings in suspicious))
 
-    prompt = (
-        "You are a citation auditor. Review the draft for potential citation issues. "
-        "Return a JSON array of short issue strings.\n\n"
-    )
     for draft in drafts:
-        prompt += f"[{draft.chapter_id}] {draft.text}\n"
-    text = await stream_llm_response(
-        llm,
-        prompt,
-        emit,
-        "auditor",
-        system_prompt=system_prompt,
-    )
-    try:
-        import json
-
-        extra_issues = json.loads(text)
-        if isinstance(extra_issues, list):
-            audit.issues.extend(str(item) for item in extra_issues)
-            audit.passed = audit.passed and not extra_issues
-    except Exception:
-        pass
+        issues = chapter_issues[draft.chapter_id]
+        if issues or draft.chapter_id in unreviewed:
+            passed.pop(draft.chapter_id, None)
+            audit.issues.extend(issues)
+        else:
+            passed[draft.chapter_id] = draft_fingerprint(draft)
+    audit.passed = not audit.issues
+    if stats is not None:
+        stats["audit_llm_chapters"] = len(suspicious) if llm is not None else 0
+        stats["audit_skipped_chapters"] = skipped
     return audit
 
 
@@ -50,6 +122,9 @@ def audit_citations(
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
+    passed: Optional[Dict[str, str]] = None,
+    max_concurrency: int = 1,
+    stats: Optional[Dict[str, int]] = None,
 ) -> AuditResult:
     return asyncio.run(
         audit_citations_async(
@@ -58,5 +133,8 @@ def audit_citations(
             llm=llm,
             emit=emit,
             system_prompt=system_prompt,
+            passed=passed,
+            max_concurrency=max_concurrency,
+            stats=stats,
         )
     )
@@ -2,10 +2,101 @@ from __future__ import annotations
 
 import asyncio
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern
 
 from ..schemas import DraftNode
 from ..llm_stream import StreamEmit, stream_llm_response
+from ..tools.sentence_select import excerpt, sentence_spans
+from ..tools.token_budget import count_tokens
+
+
+def _trie_alternation(words: List[str]) -> str:
+    """Regex alternation over ``words`` factored into a prefix trie.
+
+    Python's ``re`` tries alternatives one by one, so a flat ``a|b|...`` over
+    hundreds of IDs costs hundreds of attempts per position; the trie shares
+    prefixes and rejects most positions on the first character. Optional tails
+    are greedy, so the longest ID is tried first.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _node(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + _node(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+    return _node(trie)
+
+
+ID_BOUNDARY = re.compile(r"[\w/.:-]")
+
+
+def citation_pattern(source_ids: List[str]) -> Optional[Pattern[str]]:
+    """One pattern over all cited IDs, longest first, so ``doi:10.1/abc`` wins over ``doi:10.1/ab``."""
+    ids = [source_id for source_id in set(source_ids) if source_id]
+    if not ids:
+        return None
+    return re.compile(rf"(?:{_trie_alternation(ids)})(?![\w/-]|\.\w)")
+
+
+def renumber_citations(
+    text: str,
+    citation_index: Dict[str, int],
+    pattern: Optional[Pattern[str]] = None,
+) -> str:
+    """Replace every cited ID with ``[n]`` in a single scan of ``text``.
+
+    A match preceded by an ID character is part of a longer ID and is left alone.
+    Parentheses right around a match are dropped, so ``(a, b)`` becomes ``[1], [2]``.
+    """
+    pattern = pattern or citation_pattern(list(citation_index))
+    if pattern is None:
+        return text
+    pieces: List[str] = []
+    last = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if start and ID_BOUNDARY.match(text, start - 1):
+            continue
+        if start > last and text[start - 1] == "(":
+            pieces.append(text[last : start - 1])
+        else:
+            pieces.append(text[last:start])
+        pieces.append(f"[{citation_index[match.group(0)]}]")
+        last = end + 1 if text.startswith(")", end) else end
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def draft_context(drafts: List[DraftNode], budget: int = 0, model: str = "") -> str:
+    """``[chapter] text`` lines for the abstract/keyword prompts, within ``budget`` tokens.
+
+    When the full drafts do not fit, each chapter gets an equal share and is cut to
+    its lead sentences (always at least one), a cheap extractive summary.
+    """
+    lines = [f"[{draft.chapter_id}] {draft.text}\n" for draft in drafts]
+    full = "".join(lines)
+    if budget <= 0 or not drafts or count_tokens(full, model) <= budget:
+        return full
+    share = max(1, budget // len(drafts))
+    summaries: List[str] = []
+    for draft in drafts:
+        spans = sentence_spans(draft.text)
+        kept = spans[:1]
+        for span in spans[1:]:
+            if count_tokens(excerpt(draft.text, kept + [span]), model) > share:
+                break
+            kept.append(span)
+        summaries.append(f"[{draft.chapter_id}] {excerpt(draft.text, kept)}\n")
+    return "".join(summaries)
 
 
 async def compose_text_async(
@@ -19,37 +110,26 @@ async def compose_text_async(
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
+    context_token_budget: int = 0,
+    model: str = "",
 ) -> str:
     sections: List[str] = []
     if llm is not None:
+        context = draft_context(drafts, context_token_budget, model)
         prompt = (
             "Create a short abstract in Korean for the report based on the draft sections. "
             "Return a single paragraph.\n\n"
-        )
-        for draft in drafts:
-            prompt += f"[{draft.chapter_id}] {draft.text}\n"
-        abstract = await stream_llm_response(
-            llm,
-            prompt,
-            emit,
-            "composer",
-            system_prompt=system_prompt,
-        )
-        sections.append(f"## 초록\n{abstract}\n")
-
+        ) + context
         keyword_prompt = (
             "Generate 3-6 concise Korean keywords for the report. "
             "Return as a comma-separated list only.\n\n"
+        ) + context
+        # Independent calls on the critical path before QA: run them side by side.
+        abstract, keywords = await asyncio.gather(
+            stream_llm_response(llm, prompt, emit, "composer", system_prompt=system_prompt),
+            stream_llm_response(llm, keyword_prompt, emit, "composer", system_prompt=system_prompt),
         )
-        for draft in drafts:
-            keyword_prompt += f"[{draft.chapter_id}] {draft.text}\n"
-        keywords = await stream_llm_response(
-            llm,
-            keyword_prompt,
-            emit,
-            "composer",
-            system_prompt=system_prompt,
-        )
+        sections.append(f"## 초록\n{abstract}\n")
         sections.append(f"**키워드**: {keywords.strip()}\n")
     for draft in drafts:
         sections.append(f"## {draft.chapter_id}\n{draft.text}\n")
@@ -107,11 +187,7 @@ async def compose_text_async(
         return (label + "".join(parts)).strip()
 
     citation_index = {sid: idx + 1 for idx, sid in enumerate(used_ids)}
-    text = "\n".join(sections)
-    for source_id, idx in citation_index.items():
-        text = text.replace(source_id, f"[{idx}]")
-    text = re.sub(r"\(\[", "[", text)
-    text = re.sub(r"\]\)", "]", text)
+    text = renumber_citations("\n".join(sections), citation_index)
 
     if used_ids:
         references = ["## 참고문헌"]
@@ -135,6 +211,8 @@ def compose_text(
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
+    context_token_budget: int = 0,
+    model: str = "",
 ) -> str:
     return asyncio.run(
         compose_text_async(
@@ -148,5 +226,7 @@ def compose_text(
             llm=llm,
             emit=emit,
             system_prompt=system_prompt,
+            context_token_budget=context_token_budget,
+            model=model,
         )
     )
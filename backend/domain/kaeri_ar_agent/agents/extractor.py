@@ -1,11 +1,25 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List, Optional, Tuple
+import math
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from ..config import AgentConfig
 from ..schemas import EvidenceItem, SourceRecord
-from ..llm_stream import StreamEmit, stream_llm_response
+from ..llm_stream import (
+    JsonPrefixGuard,
+    StreamAborted,
+    StreamEmit,
+    StreamGuard,
+    stream_llm_response,
+    strip_code_fence,
+)
+from ..tools.extraction_cache import ExtractionCache
+from ..tools.sentence_select import excerpt, select_sentences
+from ..tools.token_budget import count_tokens
+
+
+NOT_RELEVANT = {"not relevant", "n/a", "none", "null", "관련 없음", "해당 없음"}
 
 
 def _looks_like_refusal(text: str) -> bool:
@@ -26,18 +40,229 @@ def _looks_like_refusal(text: str) -> bool:
     return any(pattern in lowered for pattern in patterns)
 
 
-def extract_evidence(
+# Refusals show up in the opening sentence; only this many characters are checked.
+REFUSAL_WINDOW = 300
+DEFAULT_RELEVANCE = 0.5
+
+
+def extraction_guard(expect_json: bool) -> StreamGuard:
+    """Abort a reply that opens with a refusal or, when JSON is required, stops being JSON."""
+    json_guard = JsonPrefixGuard() if expect_json else None
+    opening = ""
+
+    def _guard(delta: str) -> Optional[str]:
+        nonlocal opening
+        if len(opening) < REFUSAL_WINDOW:
+            opening = (opening + delta)[:REFUSAL_WINDOW]
+            head = opening.lstrip()
+            if head and head[0] not in "{[`" and _looks_like_refusal(opening):
+                return "refusal"
+        if json_guard is not None:
+            return json_guard(delta)
+        return None
+
+    return _guard
+
+
+# Typical tokens of one packed (chapter, abstract) item, used only for call estimates.
+PACK_ITEM_TOKEN_ESTIMATE = 400
+
+PACK_PREAMBLE = (
+    "For each numbered item, summarize what the abstract contributes to the chapter "
+    "in 1-2 concise Korean sentences. Return a JSON array with one object per item: "
+    '{"index": <item number>, "snippet": "...", "locator": "abstract"}; '
+    "use null for snippet when the abstract is not relevant to the chapter.\n\n"
+)
+
+
+def predicted_llm_calls(
+    config: AgentConfig,
+    sources: List[SourceRecord],
+    chapters: List[str],
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
+) -> int:
+    """Expected extractor LLM calls once the relevance pre-filter is applied.
+
+    Only (chapter, source) pairs that survive ``select_extraction_pairs`` and have
+    a non-empty abstract are counted. Calls beyond this only happen when earlier
+    snippets for a chapter are rejected and further candidates are needed to fill
+    its quota.
+    """
+    if config.extraction_mode == "extractive" or not sources:
+        return 0
+    sent = {
+        chapter: [index for index in indexes if (sources[index].abstract or "").strip()]
+        for chapter, indexes in select_extraction_pairs(config, sources, chapters, relevance).items()
+    }
+    if config.extraction_mode == "per_source" and len(chapters) > 1:
+        return len({index for indexes in sent.values() for index in indexes})
+    pairs = sum(len(indexes) for indexes in sent.values())
+    if config.extraction_mode == "packed" and pairs:
+        budget = max(1, config.extraction_pack_token_budget)
+        return min(pairs, math.ceil(pairs * PACK_ITEM_TOKEN_ESTIMATE / budget))
+    return pairs
+
+
+def pack_items(
+    texts: List[str],
+    budget: int,
+    model: str = "",
+    overhead: int = 0,
+) -> List[List[int]]:
+    """Greedily group item indexes so each group's tokens plus ``overhead`` fit ``budget``.
+
+    An item that exceeds the budget on its own still gets a group of one.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    used = overhead
+    for position, text in enumerate(texts):
+        tokens = count_tokens(text, model)
+        if current and used + tokens > budget:
+            packs.append(current)
+            current = []
+            used = overhead
+        current.append(position)
+        used += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def select_extraction_pairs(
+    config: AgentConfig,
+    sources: List[SourceRecord],
+    chapters: List[str],
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
+    capped: bool = True,
+) -> Dict[str, Dict[int, float]]:
+    """Chapter -> {source index: relevance} worth extracting, most relevant first.
+
+    Keeps sources at or above ``evidence_relevance_threshold``, at most
+    ``max_evidence_per_chapter`` of them unless ``capped`` is False; a chapter with
+    nothing above the threshold keeps its single best source. Sources without a
+    score keep the default.
+    """
+    limit = max(1, config.max_evidence_per_chapter) if capped else len(sources)
+    selected: Dict[str, Dict[int, float]] = {}
+    for chapter in chapters:
+        scores = (relevance or {}).get(chapter) or {}
+        scored = [
+            (index, float(scores.get(source.source_id, DEFAULT_RELEVANCE)))
+            for index, source in enumerate(sources)
+        ]
+        ranked = sorted(scored, key=lambda pair: -pair[1])
+        kept = [pair for pair in ranked if pair[1] >= config.evidence_relevance_threshold]
+        selected[chapter] = dict((kept or ranked[:1])[:limit])
+    return selected
+
+
+ChapterCallback = Callable[[str, List[EvidenceItem]], None]
+
+
+async def extract_evidence_async(
     _config: AgentConfig,
     sources: List[SourceRecord],
     chapters: List[str],
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
+    source_system_prompt: str = "",
+    packed_system_prompt: str = "",
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
+    cache: Optional[ExtractionCache] = None,
+    chapter_queries: Optional[Dict[str, List[str]]] = None,
+    stats: Optional[Dict[str, int]] = None,
+    on_chapter: Optional[ChapterCallback] = None,
 ) -> List[EvidenceItem]:
+    """Extract evidence for every chapter.
+
+    ``on_chapter`` is called once per chapter, from inside the event loop, as soon as
+    that chapter's evidence set is final; in per_pair and per_source modes this
+    happens while other chapters are still being extracted.
+    """
     evidence: List[EvidenceItem] = []
+    notified: Set[str] = set()
+
+    def _notify(chapter: str, items: List[EvidenceItem]) -> None:
+        if on_chapter is not None and chapter not in notified:
+            notified.add(chapter)
+            on_chapter(chapter, items)
+
+    def _complete(items: List[EvidenceItem]) -> List[EvidenceItem]:
+        for chapter in chapters:
+            _notify(chapter, [item for item in items if item.chapter_id == chapter])
+        return items
+
+    # Quota-driven modes keep every candidate above the threshold and stop per
+    # chapter once max_evidence_per_chapter snippets are accepted.
+    quota_driven = (
+        not _config.mock_mode
+        and llm is not None
+        and _config.extraction_mode in ("per_source", "per_pair", "extractive_llm")
+    )
+    pairs = select_extraction_pairs(_config, sources, chapters, relevance, capped=not quota_driven)
+    limit = max(1, _config.max_evidence_per_chapter)
+    if stats is not None:
+        stats.update(
+            {
+                "extraction_streams_aborted": 0,
+                "extraction_aborted_chars": 0,
+                "extraction_pairs_skipped": 0,
+                "extraction_tasks_cancelled": 0,
+            }
+        )
+
+    def _count(key: str, amount: int = 1) -> None:
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + amount
+
+    async def _stream(prompt: str, prompt_system: str, expect_json: bool) -> Optional[str]:
+        """Stream one extractor reply; None when the guard aborted it early."""
+        try:
+            return await stream_llm_response(
+                llm,
+                prompt,
+                emit,
+                "extractor",
+                system_prompt=prompt_system,
+                should_abort=extraction_guard(expect_json),
+            )
+        except StreamAborted as aborted:
+            _count("extraction_streams_aborted")
+            _count("extraction_aborted_chars", len(aborted.text))
+            _count(f"extraction_aborted_{aborted.reason}")
+            return None
+
+    def _select(chapter: str, abstract: str) -> List[Tuple[int, int]]:
+        queries = [chapter] + list((chapter_queries or {}).get(chapter, []))
+        return select_sentences(abstract, queries, _config.extractive_max_sentences)
+
+    if _config.extraction_mode == "extractive":
+        # Local fast path: quote the best abstract sentences verbatim, no LLM involved.
+        for chapter in chapters:
+            for index, source in enumerate(sources):
+                abstract = source.abstract or ""
+                if index not in pairs[chapter] or not abstract.strip():
+                    continue
+                spans = _select(chapter, abstract)
+                item = _evidence_item(
+                    chapter,
+                    index,
+                    source,
+                    excerpt(abstract, spans),
+                    "abstract",
+                    pairs[chapter][index],
+                    offsets=spans,
+                )
+                if item:
+                    evidence.append(item)
+        return _complete(evidence)
     if _config.mock_mode or llm is None:
         for chapter in chapters:
             for index, source in enumerate(sources):
+                if index not in pairs[chapter]:
+                    continue
                 claim_id = f"{chapter}-C{index+1:03d}"
                 source_id = source.canonical_source_id or source.source_id
                 evidence.append(
@@ -46,11 +271,11 @@ def extract_evidence(
                         source_id=source_id,
                         snippet=f"{chapter} evidence placeholder from {source.title}",
                         locator="abstract",
-                        relevance_score=0.5,
+                        relevance_score=pairs[chapter][index],
                         chapter_id=chapter,
                     )
                 )
-        return evidence
+        return _complete(evidence)
 
     async def _extract_one(
         args: Tuple[str, int, SourceRecord],
@@ -59,23 +284,40 @@ def extract_evidence(
         abstract_text = (source.abstract or "").strip()
         if not abstract_text:
             return None
-        snippet = abstract_text
+        offsets: Optional[List[Tuple[int, int]]] = None
+        source_text = abstract_text
+        if tiered:
+            # First tier picks the sentences locally; the LLM only translates/compresses them.
+            offsets = _select(chapter, source.abstract or "")
+            source_text = excerpt(source.abstract or "", offsets)
+        snippet = source_text
         locator = "abstract"
-        if llm is not None:
-            prompt = (
-                "Summarize the abstract into 1-2 concise Korean sentences. "
-                "Return a JSON object with keys: snippet, locator.\n\n"
-                f"Chapter: {chapter}\n"
-                f"Source title: {source.title}\n"
-                f"Abstract: {abstract_text}\n"
-            )
-            text = await stream_llm_response(
-                llm,
-                prompt,
-                emit,
-                "extractor",
-                system_prompt=system_prompt,
+        cached = cache.get(source_text, chapter, system_prompt) if cache is not None else None
+        if cached is not None:
+            item = _evidence_item(
+                chapter, index, source, cached[0], cached[1], pairs[chapter][index], offsets=offsets
             )
+            return ((chapter, index), item) if item else None
+        if llm is not None:
+            if tiered:
+                prompt = (
+                    "Translate and compress the excerpt into 1-2 concise Korean sentences without adding facts. "
+                    "Return a JSON object with keys: snippet, locator.\n\n"
+                    f"Chapter: {chapter}\n"
+                    f"Source title: {source.title}\n"
+                    f"Excerpt: {source_text}\n"
+                )
+            else:
+                prompt = (
+                    "Summarize the abstract into 1-2 concise Korean sentences. "
+                    "Return a JSON object with keys: snippet, locator.\n\n"
+                    f"Chapter: {chapter}\n"
+                    f"Source title: {source.title}\n"
+                    f"Abstract: {abstract_text}\n"
+                )
+            text = await _stream(prompt, system_prompt, expect_json=False)
+            if text is None:
+                return None
             try:
                 import json
 
@@ -85,48 +327,404 @@ def extract_evidence(
                     locator = payload.get("locator", locator)
             except Exception:
                 snippet = text or snippet
-        if snippet is None:
-            snippet = ""
-        if not isinstance(snippet, str):
-            snippet = str(snippet)
-        if not snippet or _looks_like_refusal(snippet):
+        if tiered:
+            locator = "abstract"
+        item = _evidence_item(chapter, index, source, snippet, locator, pairs[chapter][index], offsets=offsets)
+        if item is None:
             return None
-        if isinstance(locator, (dict, list)):
-            import json
-
-            locator = json.dumps(locator, ensure_ascii=False)
-        if locator is not None and not isinstance(locator, str):
-            locator = str(locator)
-        claim_id = f"{chapter}-C{index+1:03d}"
-        source_id = source.canonical_source_id or source.source_id
-        item = EvidenceItem(
-            claim_id=claim_id,
-            source_id=source_id,
-            snippet=snippet,
-            locator=locator or "abstract",
-            relevance_score=0.5,
-            chapter_id=chapter,
-        )
+        if cache is not None:
+            cache.put(source_text, chapter, system_prompt, snippet, locator)
         return (chapter, index), item
 
-    tasks: List[Tuple[str, int, SourceRecord]] = []
-    for chapter in chapters:
-        for index, source in enumerate(sources):
-            tasks.append((chapter, index, source))
+    async def _extract_source(
+        index: int,
+        source: SourceRecord,
+        source_chapters: List[str],
+    ) -> List[Tuple[Tuple[str, int], EvidenceItem]]:
+        abstract_text = (source.abstract or "").strip()
+        if not abstract_text:
+            return []
+        if len(source_chapters) == 1:
+            result = await _extract_one((source_chapters[0], index, source))
+            return [result] if result is not None else []
+        multi_prompt = source_system_prompt or system_prompt
+        results: List[Tuple[Tuple[str, int], EvidenceItem]] = []
+        if cache is not None:
+            pending: List[str] = []
+            for chapter in source_chapters:
+                cached = cache.get(abstract_text, chapter, multi_prompt)
+                if cached is None:
+                    pending.append(chapter)
+                    continue
+                item = _evidence_item(chapter, index, source, cached[0], cached[1], pairs[chapter][index])
+                if item:
+                    results.append(((chapter, index), item))
+            source_chapters = pending
+            if not source_chapters:
+                return results
+        chapter_lines = "\n".join(
+            f"{number}. {chapter}" for number, chapter in enumerate(source_chapters, 1)
+        )
+        prompt = (
+            "For each chapter, summarize what the abstract contributes in 1-2 concise Korean sentences. "
+            "Return a JSON object keyed by chapter number whose values are objects with keys: "
+            "snippet, locator; use null for chapters the abstract is not relevant to.\n\n"
+            f"Chapters:\n{chapter_lines}\n\n"
+            f"Source title: {source.title}\n"
+            f"Abstract: {abstract_text}\n"
+        )
+        text = await _stream(prompt, multi_prompt, expect_json=True)
+        mapping = _parse_chapter_map(text, source_chapters) if text is not None else None
+        if mapping is None:
+            # Unparseable reply: fall back to one call per chapter for this source only.
+            for chapter in source_chapters:
+                result = await _extract_one((chapter, index, source))
+                if result is not None:
+                    results.append(result)
+            return results
+        for chapter in source_chapters:
+            if chapter not in mapping:
+                # Judged not relevant; remember that so repeat runs skip the call.
+                if cache is not None:
+                    cache.put(abstract_text, chapter, multi_prompt, None, None)
+                continue
+            snippet, locator = mapping[chapter]
+            item = _evidence_item(chapter, index, source, snippet, locator, pairs[chapter][index])
+            if item:
+                results.append(((chapter, index), item))
+                if cache is not None:
+                    cache.put(abstract_text, chapter, multi_prompt, snippet, locator)
+        return results
+
+    async def _extract_pack(
+        pack: List[Tuple[str, int, SourceRecord]],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[Tuple[str, int], EvidenceItem]]:
+        """One packed call; unparseable or dropped items are retried concurrently on their own.
+
+        The semaphore is held only around each LLM call, so a failed pack does not keep
+        a slot while its fallbacks queue behind it.
+        """
+
+        async def _guarded_one(
+            args: Tuple[str, int, SourceRecord],
+        ) -> Optional[Tuple[Tuple[str, int], EvidenceItem]]:
+            async with semaphore:
+                return await _extract_one(args)
+
+        if len(pack) == 1:
+            result = await _guarded_one(pack[0])
+            return [result] if result is not None else []
+        prompt = PACK_PREAMBLE + "\n\n".join(
+            _pack_item_text(number, chapter, source) for number, (chapter, _, source) in enumerate(pack, 1)
+        )
+        async with semaphore:
+            # _parse_indexed_items recovers an array after leading prose, so only refusals abort.
+            text = await _stream(prompt, packed_prompt, expect_json=False)
+        parsed = _parse_indexed_items(text, len(pack)) if text is not None else None
+        results: List[Tuple[Tuple[str, int], EvidenceItem]] = []
+        missing: List[Tuple[str, int, SourceRecord]] = []
+        for number, (chapter, index, source) in enumerate(pack, 1):
+            if parsed is None or number not in parsed:
+                missing.append((chapter, index, source))
+                continue
+            snippet, locator = parsed[number]
+            abstract_text = (source.abstract or "").strip()
+            if not snippet or (isinstance(snippet, str) and snippet.strip().lower() in NOT_RELEVANT):
+                if cache is not None:
+                    cache.put(abstract_text, chapter, packed_prompt, None, None)
+                continue
+            item = _evidence_item(chapter, index, source, snippet, locator, pairs[chapter][index])
+            if item:
+                results.append(((chapter, index), item))
+                if cache is not None:
+                    cache.put(abstract_text, chapter, packed_prompt, snippet, locator)
+        # Unparseable reply or dropped items: retry just those pairs, side by side.
+        for result in await asyncio.gather(*(_guarded_one(args) for args in missing)):
+            if result is not None:
+                results.append(result)
+        return results
+
+    per_source = _config.extraction_mode == "per_source" and len(chapters) > 1
+    tiered = _config.extraction_mode == "extractive_llm"
+    packed = _config.extraction_mode == "packed"
+    packed_prompt = packed_system_prompt or system_prompt
 
     async def _run_all() -> List[Tuple[Tuple[str, int], EvidenceItem]]:
-        if not tasks:
-            return []
         semaphore = asyncio.Semaphore(max(1, _config.max_concurrency))
+        if packed:
+            ready: List[Tuple[Tuple[str, int], EvidenceItem]] = []
+            pending: List[Tuple[str, int, SourceRecord]] = []
+            for chapter in chapters:
+                for index, source in enumerate(sources):
+                    abstract_text = (source.abstract or "").strip()
+                    if index not in pairs[chapter] or not abstract_text:
+                        continue
+                    cached = cache.get(abstract_text, chapter, packed_prompt) if cache is not None else None
+                    if cached is None:
+                        pending.append((chapter, index, source))
+                        continue
+                    item = _evidence_item(chapter, index, source, cached[0], cached[1], pairs[chapter][index])
+                    if item:
+                        ready.append(((chapter, index), item))
+            model = _config.agent_settings("extractor")["model"]
+            groups = pack_items(
+                [_pack_item_text(0, chapter, source) for chapter, _, source in pending],
+                _config.extraction_pack_token_budget,
+                model,
+                overhead=count_tokens(packed_prompt + PACK_PREAMBLE, model),
+            )
+
+            batches = await asyncio.gather(
+                *[_extract_pack([pending[position] for position in group], semaphore) for group in groups]
+            )
+            return ready + [result for batch in batches for result in batch]
+        if per_source:
+            accepted = {chapter: 0 for chapter in chapters}
+            collected: Dict[str, List[Tuple[Tuple[str, int], EvidenceItem]]] = {chapter: [] for chapter in chapters}
+            remaining = {chapter: 0 for chapter in chapters}
+            final: Dict[str, List[Tuple[Tuple[str, int], EvidenceItem]]] = {}
+
+            def _open_chapters(index: int) -> List[str]:
+                return [chapter for chapter in chapters if index in pairs[chapter] and accepted[chapter] < limit]
+
+            def _close(chapter: str) -> None:
+                if chapter in final or (accepted[chapter] < limit and remaining[chapter] > 0):
+                    return
+                # Sources in flight together can overshoot a quota; keep the most relevant.
+                ranked = sorted(collected[chapter], key=lambda result: -pairs[chapter][result[0][1]])
+                final[chapter] = ranked[:limit]
+                _notify(chapter, [item for _, item in sorted(final[chapter], key=lambda pair: pair[0])])
+
+            async def _guarded_source(index: int) -> None:
+                try:
+                    async with semaphore:
+                        # Chapters filled while this source waited for a slot are dropped from its prompt.
+                        source_chapters = _open_chapters(index)
+                        if not source_chapters:
+                            _count("extraction_tasks_cancelled")
+                            return
+                        batch = await _extract_source(index, sources[index], source_chapters)
+                        # Count before releasing the slot so the next source sees the new totals.
+                        for result in batch:
+                            collected[result[0][0]].append(result)
+                            accepted[result[0][0]] += 1
+                finally:
+                    for chapter in chapters:
+                        if index in pairs[chapter]:
+                            remaining[chapter] -= 1
+                            _close(chapter)
+
+            ranked_sources = sorted(
+                (index for index in range(len(sources)) if _open_chapters(index)),
+                key=lambda index: -max(pairs[chapter].get(index, 0.0) for chapter in chapters),
+            )
+            for index in ranked_sources:
+                for chapter in chapters:
+                    if index in pairs[chapter]:
+                        remaining[chapter] += 1
+            tasks = {asyncio.create_task(_guarded_source(index)): index for index in ranked_sources}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+                redundant = {task for task in pending if not _open_chapters(tasks[task])}
+                for task in redundant:
+                    task.cancel()
+                if redundant:
+                    await asyncio.gather(*redundant, return_exceptions=True)
+                    _count("extraction_tasks_cancelled", len(redundant))
+                    pending -= redundant
+            for chapter in chapters:
+                remaining[chapter] = 0
+                _close(chapter)
+            return [result for chapter in chapters for result in final[chapter]]
 
         async def _guarded(task: Tuple[str, int, SourceRecord]) -> Optional[Tuple[Tuple[str, int], EvidenceItem]]:
             async with semaphore:
                 return await _extract_one(task)
 
-        results = await asyncio.gather(*[_guarded(task) for task in tasks])
-        return [result for result in results if result is not None]
+        async def _fill_chapter(chapter: str) -> List[Tuple[Tuple[str, int], EvidenceItem]]:
+            # Candidates run in relevance order with no more in flight than the quota
+            # still needs, so a filled chapter never pays for surplus calls.
+            queue = [index for index in pairs[chapter] if (sources[index].abstract or "").strip()]
+            accepted_items: List[Tuple[Tuple[str, int], EvidenceItem]] = []
+            running: Set[asyncio.Task] = set()
+            while queue or running:
+                while queue and len(accepted_items) + len(running) < limit:
+                    index = queue.pop(0)
+                    running.add(asyncio.create_task(_guarded((chapter, index, sources[index]))))
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        accepted_items.append(result)
+                if len(accepted_items) >= limit:
+                    break
+            _count("extraction_pairs_skipped", len(queue))
+            _notify(chapter, [item for _, item in sorted(accepted_items, key=lambda pair: pair[0])])
+            return accepted_items
+
+        batches = await asyncio.gather(*[_fill_chapter(chapter) for chapter in chapters])
+        return [result for batch in batches for result in batch]
 
-    results = asyncio.run(_run_all())
+    results = await _run_all()
     for _, item in sorted(results, key=lambda pair: pair[0]):
         evidence.append(item)
-    return evidence
+    return _complete(evidence)
+
+
+def extract_evidence(
+    _config: AgentConfig,
+    sources: List[SourceRecord],
+    chapters: List[str],
+    llm: Optional[object] = None,
+    emit: Optional[StreamEmit] = None,
+    system_prompt: str = "",
+    source_system_prompt: str = "",
+    packed_system_prompt: str = "",
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
+    cache: Optional[ExtractionCache] = None,
+    chapter_queries: Optional[Dict[str, List[str]]] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[EvidenceItem]:
+    return asyncio.run(
+        extract_evidence_async(
+            _config,
+            sources,
+            chapters,
+            llm=llm,
+            emit=emit,
+            system_prompt=system_prompt,
+            source_system_prompt=source_system_prompt,
+            packed_system_prompt=packed_system_prompt,
+            relevance=relevance,
+            cache=cache,
+            chapter_queries=chapter_queries,
+            stats=stats,
+        )
+    )
+
+
+def _evidence_item(
+    chapter: str,
+    index: int,
+    source: SourceRecord,
+    snippet: Any,
+    locator: Any,
+    relevance_score: float = DEFAULT_RELEVANCE,
+    offsets: Optional[List[Tuple[int, int]]] = None,
+) -> Optional[EvidenceItem]:
+    if snippet is None:
+        snippet = ""
+    if not isinstance(snippet, str):
+        snippet = str(snippet)
+    if not snippet or _looks_like_refusal(snippet):
+        return None
+    if isinstance(locator, (dict, list)):
+        import json
+
+        locator = json.dumps(locator, ensure_ascii=False)
+    if locator is not None and not isinstance(locator, str):
+        locator = str(locator)
+    return EvidenceItem(
+        claim_id=f"{chapter}-C{index+1:03d}",
+        source_id=source.canonical_source_id or source.source_id,
+        snippet=snippet,
+        locator=locator or "abstract",
+        relevance_score=relevance_score,
+        chapter_id=chapter,
+        offsets=list(offsets or []),
+    )
+
+
+def _pack_item_text(number: int, chapter: str, source: SourceRecord) -> str:
+    return (
+        f"[{number}]\n"
+        f"Chapter: {chapter}\n"
+        f"Source title: {source.title}\n"
+        f"Abstract: {(source.abstract or '').strip()}"
+    )
+
+
+def _parse_indexed_items(text: str, count: int) -> Optional[Dict[int, Tuple[Any, Any]]]:
+    """Parse a packed reply into item number -> (snippet, locator).
+
+    Accepts a JSON array of objects carrying ``index`` (or ``id``/``item``), an object
+    keyed by item number, or a bare array of ``count`` entries matched by position.
+    Items the model left out are absent; items it marked null map to a None snippet.
+    Returns None when no JSON array or object can be recovered from the reply.
+    """
+    import json
+
+    cleaned = strip_code_fence(text)
+    try:
+        payload = json.loads(cleaned)
+    except ValueError:
+        start, end = cleaned.find("["), cleaned.rfind("]")
+        if start < 0 or end <= start:
+            return None
+        try:
+            payload = json.loads(cleaned[start : end + 1])
+        except ValueError:
+            return None
+    if isinstance(payload, dict):
+        entries = [(key, value) for key, value in payload.items()]
+    elif isinstance(payload, list):
+        entries = []
+        for position, value in enumerate(payload, 1):
+            number = None
+            if isinstance(value, dict):
+                number = value.get("index", value.get("id", value.get("item")))
+            if number is None and len(payload) == count:
+                number = position
+            entries.append((number, value))
+    else:
+        return None
+    parsed: Dict[int, Tuple[Any, Any]] = {}
+    for number, value in entries:
+        try:
+            number = int(str(number).strip().strip("[]"))
+        except ValueError:
+            continue
+        if not 1 <= number <= count or number in parsed:
+            continue
+        if isinstance(value, dict):
+            parsed[number] = (value.get("snippet"), value.get("locator"))
+        else:
+            parsed[number] = (value, None)
+    return parsed
+
+
+def _parse_chapter_map(text: str, chapters: List[str]) -> Optional[Dict[str, Tuple[Any, Any]]]:
+    """Parse a chapter -> {snippet, locator} reply keyed by chapter number or title.
+
+    Returns None when the reply is not a JSON object; chapters marked null, empty or
+    "not relevant" are omitted from the result.
+    """
+    import json
+
+    try:
+        payload = json.loads(strip_code_fence(text))
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    mapping: Dict[str, Tuple[Any, Any]] = {}
+    for key, value in payload.items():
+        key = str(key).strip()
+        if key.isdigit() and 1 <= int(key) <= len(chapters):
+            chapter = chapters[int(key) - 1]
+        elif key in chapters:
+            chapter = key
+        else:
+            continue
+        if isinstance(value, dict):
+            snippet, locator = value.get("snippet"), value.get("locator")
+        else:
+            snippet, locator = value, None
+        if not snippet or (isinstance(snippet, str) and snippet.strip().lower() in NOT_RELEVANT):
+            continue
+        mapping[chapter] = (snippet, locator)
+    return mapping
@@ -1,10 +1,33 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List, Optional
+import json
+from typing import Dict, List, Optional
 
 from ..schemas import DraftNode
-from ..llm_stream import StreamEmit, stream_llm_response
+from ..llm_stream import StreamEmit, stream_llm_response, strip_code_fence
+from ..tools.keyed_cache import text_hash
+from .qa_rules import (
+    chapter_issue,
+    check_draft_rules,
+    check_required_sections,
+    compile_exclusions,
+    issue_chapter,
+)
+
+
+def sampled_for_review(draft: DraftNode, sample_rate: float) -> bool:
+    """Sample by text hash so an unchanged chapter is drawn the same way on every iteration."""
+    if sample_rate >= 1.0:
+        return True
+    return int(text_hash(draft.text)[:8], 16) / 0xFFFFFFFF < sample_rate
+
+
+def _llm_issue(item: object, chapter_id: str) -> str:
+    if isinstance(item, dict) and item.get("issue"):
+        return chapter_issue(str(item.get("chapter_id") or chapter_id), str(item["issue"]))
+    text = str(item)
+    return text if issue_chapter(text) else chapter_issue(chapter_id, text)
 
 
 async def qa_checks_async(
@@ -13,34 +36,85 @@ async def qa_checks_async(
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
     context: str = "",
+    exclusions: Optional[List[str]] = None,
+    composed_text: Optional[str] = None,
+    required_sections: Optional[List[str]] = None,
+    min_citations: int = 1,
+    sample_rate: float = 1.0,
+    stats: Optional[Dict[str, int]] = None,
+    passed: Optional[Dict[str, str]] = None,
+    max_concurrency: int = 1,
+    rule_routes: Optional[Dict[str, str]] = None,
 ) -> List[str]:
+    """Local rules per chapter first; the LLM reviews only (a sample of) the chapters that pass them.
+
+    Chapters failing a rule are already headed back to the writer, so an LLM review
+    of their current text would be wasted. Each reviewed chapter gets its own LLM
+    call, at most ``max_concurrency`` at a time. ``passed`` maps chapter IDs to the
+    text hash of the last draft the LLM accepted; such chapters are not re-reviewed
+    and the map is updated in place. An unparseable reply is not an acceptance.
+    ``rule_routes`` is filled with issue -> pipeline route for every local rule
+    finding (``compose`` for missing sections, ``write`` for chapter rules), so
+    routing does not depend on the message wording.
+    """
+    passed = passed if passed is not None else {}
+    rule_routes = rule_routes if rule_routes is not None else {}
     issues: List[str] = []
+
+    def _rule(found: List[str], route: str) -> None:
+        issues.extend(found)
+        rule_routes.update((issue, route) for issue in found)
+
     if not drafts:
-        issues.append("Draft output is empty.")
+        _rule(["Draft output is empty."], "write")
+    if composed_text is not None and required_sections:
+        _rule(check_required_sections(composed_text, required_sections), "compose")
+    exclusion_pattern = compile_exclusions(exclusions)
+    clean: List[DraftNode] = []
     for draft in drafts:
-        if "입니다" in draft.text:
-            issues.append(f"Honorific found in {draft.chapter_id}.")
-    if llm is None:
+        draft_issues = check_draft_rules(draft, exclusion_pattern, min_citations)
+        _rule(draft_issues, "write")
+        if draft_issues:
+            passed.pop(draft.chapter_id, None)
+        else:
+            clean.append(draft)
+    sampled = [draft for draft in clean if sampled_for_review(draft, sample_rate)]
+    reviewed = [draft for draft in sampled if passed.get(draft.chapter_id) != text_hash(draft.text)]
+    if stats is not None:
+        stats["qa_rule_failed_chapters"] = len(drafts) - len(clean)
+        stats["qa_llm_chapters"] = len(reviewed) if llm is not None else 0
+        stats["qa_cached_chapters"] = len(sampled) - len(reviewed)
+    if llm is None or not reviewed:
         return issues
 
-    prompt = (
-        "You are a QA reviewer for a Korean technical report. "
-        "Check for style violations (honorifics, missing required sections). "
-        "Return a JSON array of issues.\n\n"
-    )
-    if context:
-        prompt += f"Context: {context}\n"
-    for draft in drafts:
+    async def _review(draft: DraftNode, semaphore: asyncio.Semaphore) -> List[str]:
+        prompt = (
+            "You are a QA reviewer for a Korean technical report. "
+            "Check this chapter for style violations and topic drift beyond what simple rules catch. "
+            "Return a JSON array of issues ([] if none).\n\n"
+        )
+        if context:
+            prompt += f"Context: {context}\n"
         prompt += f"[{draft.chapter_id}] {draft.text}\n"
-    text = await stream_llm_response(llm, prompt, emit, "qa", system_prompt=system_prompt)
-    try:
-        import json
-
-        extra_issues = json.loads(text)
-        if isinstance(extra_issues, list):
-            issues.extend(str(item) for item in extra_issues)
-    except Exception:
-        pass
+        async with semaphore:
+            text = await stream_llm_response(llm, prompt, emit, "qa", system_prompt=system_prompt)
+        try:
+            extra_issues = json.loads(strip_code_fence(text))
+        except ValueError:
+            extra_issues = None
+        if not isinstance(extra_issues, list):
+            passed.pop(draft.chapter_id, None)
+            return []
+        found = [_llm_issue(item, draft.chapter_id) for item in extra_issues]
+        if found:
+            passed.pop(draft.chapter_id, None)
+        else:
+            passed[draft.chapter_id] = text_hash(draft.text)
+        return found
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    for found in await asyncio.gather(*(_review(draft, semaphore) for draft in reviewed)):
+        issues.extend(found)
     return issues
 
 
@@ -50,6 +124,15 @@ def qa_checks(
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
     context: str = "",
+    exclusions: Optional[List[str]] = None,
+    composed_text: Optional[str] = None,
+    required_sections: Optional[List[str]] = None,
+    min_citations: int = 1,
+    sample_rate: float = 1.0,
+    stats: Optional[Dict[str, int]] = None,
+    passed: Optional[Dict[str, str]] = None,
+    max_concurrency: int = 1,
+    rule_routes: Optional[Dict[str, str]] = None,
 ) -> List[str]:
     return asyncio.run(
         qa_checks_async(
@@ -58,5 +141,14 @@ def qa_checks(
             emit=emit,
             system_prompt=system_prompt,
             context=context,
+            exclusions=exclusions,
+            composed_text=composed_text,
+            required_sections=required_sections,
+            min_citations=min_citations,
+            sample_rate=sample_rate,
+            stats=stats,
+            passed=passed,
+            max_concurrency=max_concurrency,
+            rule_routes=rule_routes,
         )
     )
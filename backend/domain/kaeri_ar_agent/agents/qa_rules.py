@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Pattern
+
+from ..schemas import DraftNode
+from ..tools.citations import citation_key, parse_citations
+
+
+CHAPTER_TAG = re.compile(r"^\[([^\]]+)\]\s*")
+HONORIFIC_ENDING = re.compile(r"(?:[습입합됩]니다|십시오|하세요|해요|[에예]요)(?=[\s.!?,)\"']|$)")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def chapter_issue(chapter_id: str, message: str) -> str:
+    """Issue text tagged with the chapter it concerns, e.g. ``[C1] Honorific found.``"""
+    return f"[{chapter_id}] {message}"
+
+
+def issue_chapter(issue: str) -> Optional[str]:
+    match = CHAPTER_TAG.match(issue)
+    return match.group(1).strip() if match else None
+
+
+def compile_exclusions(exclusions: Optional[List[str]]) -> Optional[Pattern[str]]:
+    terms = sorted({term.strip() for term in exclusions or [] if term.strip()}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
+def check_draft_rules(
+    draft: DraftNode,
+    exclusion_pattern: Optional[Pattern[str]] = None,
+    min_citations: int = 1,
+) -> List[str]:
+    """Local style rules for one chapter: honorific endings, citation density, exclusion leakage."""
+    issues: List[str] = []
+    honorific = HONORIFIC_ENDING.search(draft.text)
+    if honorific:
+        issues.append(chapter_issue(draft.chapter_id, f"Honorific ending found: {honorific.group(0)}"))
+    if draft.citation_source_ids and min_citations > 0:
+        known = {citation_key(source_id) for source_id in draft.citation_source_ids}
+        paragraphs = [paragraph for paragraph in PARAGRAPH_BREAK.split(draft.text) if paragraph.strip()]
+        for position, paragraph in enumerate(paragraphs, start=1):
+            if len(parse_citations(paragraph, known)) < min_citations:
+                issues.append(
+                    chapter_issue(draft.chapter_id, f"Paragraph {position} has fewer than {min_citations} citation(s).")
+                )
+    if exclusion_pattern is not None:
+        leaked = sorted({match.group(0) for match in exclusion_pattern.finditer(draft.text)})
+        if leaked:
+            issues.append(chapter_issue(draft.chapter_id, f"Excluded term mentioned: {', '.join(leaked)}"))
+    return issues
+
+
+def check_required_sections(composed_text: str, required: List[str]) -> List[str]:
+    """Required report sections (``## name`` or ``**name**:``) that are missing or empty."""
+    issues: List[str] = []
+    for name in required:
+        heading = re.compile(rf"^(?:##\s*{re.escape(name)}[ \t]*\n|\*\*{re.escape(name)}\*\*:[ \t]*)[ \t]*\S", re.MULTILINE)
+        if not heading.search(composed_text):
+            issues.append(f"Missing required section: {name}")
+    return issues
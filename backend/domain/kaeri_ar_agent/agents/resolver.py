@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 import re
 from typing import Dict, Iterable, List, Optional
 
@@ -13,6 +14,7 @@ from ..schemas import (
     ProviderWork,
     SourceRecord,
 )
+from ..tools.arxiv_client import fetch_by_ids, normalize_arxiv_id
 
 
 DOI_PATTERN = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.IGNORECASE)
@@ -23,6 +25,7 @@ class ResolveStats:
     total: int = 0
     doi_confirmed: int = 0
     preprint_only: int = 0
+    arxiv_refreshed: int = 0
     provider_hits: Dict[str, int] = field(default_factory=dict)
     provider_misses: Dict[str, int] = field(default_factory=dict)
 
@@ -37,6 +40,8 @@ def resolve_sources(
         providers = build_provider_clients(config)
     resolved: List[SourceRecord] = []
     stats = ResolveStats(total=len(sources))
+    if not config.mock_mode:
+        sources = _refresh_arxiv_metadata(config, sources, stats)
     seen: Dict[str, SourceRecord] = {}
     for source in sources:
         updated = _resolve_one(config, source, providers, stats)
@@ -52,6 +57,77 @@ def resolve_sources(
     return resolved, stats
 
 
+def _refresh_arxiv_metadata(
+    config: AgentConfig,
+    sources: List[SourceRecord],
+    stats: ResolveStats,
+) -> List[SourceRecord]:
+    """Fill missing DOIs of arXiv sources with one batched id_list lookup.
+
+    A journal DOI recorded on arXiv lets ``_resolve_one`` go straight to Crossref
+    instead of issuing title searches against OpenAlex and Semantic Scholar. Only
+    records that did not just come from the live API are refreshed: local corpus
+    and snapshot records (no ``retrieved_at``) and ones fetched more than
+    ``arxiv_refresh_max_age_s`` ago.
+    """
+    stale: Dict[str, str] = {}
+    for source in sources:
+        if source.doi or source.identifiers.doi or not _is_stale(source, config.arxiv_refresh_max_age_s):
+            continue
+        arxiv_id = normalize_arxiv_id(source.identifiers.arxiv_id or source.source_id)
+        if arxiv_id:
+            stale[source.source_id] = arxiv_id
+    if not stale:
+        return sources
+    try:
+        entries = fetch_by_ids(
+            config.arxiv_base_url,
+            list(stale.values()),
+            config.request_timeout_s,
+            retry_count=config.request_retry_count,
+            retry_backoff_s=config.request_retry_backoff_s,
+            batch_size=config.arxiv_id_batch_size,
+        )
+    except Exception:
+        return sources
+    by_id: Dict[str, dict] = {}
+    for entry in entries:
+        arxiv_id = entry["identifiers"]["arxiv_id"]
+        by_id[arxiv_id] = entry
+        by_id.setdefault(re.sub(r"v\d+$", "", arxiv_id), entry)
+    refreshed: List[SourceRecord] = []
+    for source in sources:
+        entry = by_id.get(stale.get(source.source_id, ""))
+        if entry is None:
+            refreshed.append(source)
+            continue
+        doi = source.doi or entry.get("doi")
+        identifiers = source.identifiers.model_copy(update={"doi": source.identifiers.doi or doi})
+        refreshed.append(
+            source.model_copy(
+                update={
+                    "doi": doi,
+                    "abstract": source.abstract or entry.get("abstract"),
+                    "identifiers": identifiers,
+                }
+            )
+        )
+        stats.arxiv_refreshed += 1
+    return refreshed
+
+
+def _is_stale(source: SourceRecord, max_age_s: float) -> bool:
+    if not source.retrieved_at:
+        return True
+    try:
+        retrieved = datetime.fromisoformat(source.retrieved_at)
+    except ValueError:
+        return True
+    if retrieved.tzinfo is not None:
+        retrieved = retrieved.astimezone(timezone.utc).replace(tzinfo=None)
+    return (datetime.utcnow() - retrieved).total_seconds() > max_age_s
+
+
 def _resolve_one(
     config: AgentConfig,
     source: SourceRecord,
@@ -2,64 +2,262 @@ from __future__ import annotations
 
 from datetime import datetime
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from ..config import AgentConfig
 from ..schemas import SourceRecord
-from ..tools.arxiv_client import query_arxiv, query_arxiv_async, parse_arxiv_feed
+from ..tools.arxiv_client import (
+    fetch_by_ids_async,
+    normalize_arxiv_id,
+    parse_arxiv_feed,
+    query_arxiv,
+    query_arxiv_async,
+    submitted_since_query,
+)
+from ..tools.arxiv_corpus import aload_arxiv_corpus
+from ..tools.embedding_store import EmbeddingStore, embedding_text
+from ..tools.query_cache import QueryCache, query_key
 from ..llm_stream import StreamEmit, stream_llm_response
 
 
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0.0, 1.0, norms)
+
+
+def _cosine_similarity_matrix(queries: np.ndarray, documents: np.ndarray) -> np.ndarray:
+    return _normalize_rows(queries) @ _normalize_rows(documents).T
+
+
 def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sum(x * x for x in a) ** 0.5
-    nb = sum(y * y for y in b) ** 0.5
-    if na == 0.0 or nb == 0.0:
+    if not len(a) or not len(b) or len(a) != len(b):
         return 0.0
-    return dot / (na * nb)
+    return float(_cosine_similarity_matrix(np.asarray([a]), np.asarray([b]))[0, 0])
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k best scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def _select_covering_sources(
+    scores: np.ndarray,
+    source_matrix: np.ndarray,
+    threshold: float,
+    coverage: int,
+    budget: int,
+    redundancy_lambda: float,
+) -> List[int]:
+    """Greedy MMR set cover: fewest sources giving each chapter ``coverage`` relevant hits.
+
+    A source is relevant to a chapter when its score reaches ``threshold``. Each step
+    picks the source with the most relevance mass over still-uncovered chapters,
+    penalized by its maximum similarity to sources already picked. Chapters with no
+    relevant source fall back to their single best-scoring source.
+    """
+    chapters, candidates = scores.shape
+    if not chapters or not candidates or budget <= 0:
+        return []
+    normalized = _normalize_rows(source_matrix)
+    relevant = scores >= threshold
+    relevance_mass = np.where(relevant, scores, 0.0)
+    need = np.full(chapters, max(0, coverage), dtype=np.int64)
+    available = np.ones(candidates, dtype=bool)
+    redundancy = np.zeros(candidates, dtype=np.float32)
+    selected: List[int] = []
+    while len(selected) < budget:
+        open_chapters = need > 0
+        covers = relevant[open_chapters].any(axis=0) & available
+        if not covers.any():
+            break
+        gain = relevance_mass[open_chapters].sum(axis=0)
+        value = redundancy_lambda * gain - (1.0 - redundancy_lambda) * redundancy
+        pick = int(np.argmax(np.where(covers, value, -np.inf)))
+        selected.append(pick)
+        available[pick] = False
+        need -= relevant[:, pick]
+        redundancy = np.maximum(redundancy, normalized @ normalized[pick])
+    for chapter in range(chapters):
+        if len(selected) >= budget:
+            break
+        if not relevant[chapter, selected].any():
+            best = int(np.argmax(scores[chapter]))
+            if best not in selected:
+                selected.append(best)
+    return selected
+
+
+def _build_embedding_store(config: AgentConfig) -> EmbeddingStore:
+    return EmbeddingStore(
+        config.build_embeddings(),
+        config.embedding_model_id(),
+        root=config.cache_path("embeddings"),
+        dtype=config.embedding_cache_dtype,
+    )
+
+
+def _chapter_query_texts(config: AgentConfig, plan_queries: Dict[str, List[str]]) -> List[str]:
+    return [" ".join(queries)[: config.max_query_length] for queries in plan_queries.values()]
+
+
+def _select_ranked_sources(
+    config: AgentConfig,
+    chapters: List[str],
+    unique: List[SourceRecord],
+    source_matrix: np.ndarray,
+    query_matrix: np.ndarray,
+    store: EmbeddingStore,
+    emit: Optional[StreamEmit] = None,
+    candidate_scores: Optional[Dict[str, Dict[str, float]]] = None,
+) -> List[SourceRecord]:
+    """Pick sources from the chapter x candidate scores.
+
+    When ``candidate_scores`` is given it is filled with chapter -> source_id ->
+    cosine score for every candidate, so callers can reuse the ranking vectors.
+    """
+    scores = _cosine_similarity_matrix(query_matrix, source_matrix)
+    if candidate_scores is not None:
+        candidate_scores.update(
+            {
+                chapter: {source.source_id: float(score) for source, score in zip(unique, row)}
+                for chapter, row in zip(chapters, scores)
+            }
+        )
+    if config.source_selection == "coverage":
+        selected = set(
+            _select_covering_sources(
+                scores,
+                source_matrix,
+                config.selection_relevance_threshold,
+                config.selection_chapter_coverage,
+                config.max_sources,
+                config.selection_redundancy_lambda,
+            )
+        )
+    else:
+        per_chapter = max(1, config.max_sources // max(1, len(chapters)))
+        selected = set(_top_k_indices(scores, per_chapter).ravel().tolist())
+    ranked_indexes = [index for index in range(len(unique)) if index in selected][: config.max_sources]
+    if emit:
+        emit(
+            "retriever",
+            "embedding ranking completed",
+            {
+                "summary": "임베딩 랭킹 및 출처 선정 완료",
+                "selection": config.source_selection,
+                "candidate_sources": len(unique),
+                "selected_sources": min(len(selected), config.max_sources),
+                **store.stats(),
+            },
+        )
+    return [unique[index] for index in ranked_indexes]
 
 
 async def _rank_sources_with_embeddings(
     config: AgentConfig,
     plan_queries: Dict[str, List[str]],
     sources: List[SourceRecord],
+    store: Optional[EmbeddingStore] = None,
+    emit: Optional[StreamEmit] = None,
+    candidate_scores: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> List[SourceRecord]:
     if not sources:
         return sources
-    embeddings = config.build_embeddings()
-    source_texts = [
-        f"{source.title}\n{source.abstract or ''}".strip() for source in sources
-    ]
-    source_vectors = await embeddings.aembed_documents(source_texts)
-
     chapters = list(plan_queries.keys())
     if not chapters:
         return sources[: config.max_sources]
-    per_chapter = max(1, config.max_sources // max(1, len(chapters)))
-
-    selected_ids: List[str] = []
-    for chapter in chapters:
-        query_text = " ".join(plan_queries.get(chapter, []))[: config.max_query_length]
-        query_vector = await embeddings.aembed_query(query_text)
-        scored = sorted(
-            zip(sources, source_vectors),
-            key=lambda pair: _cosine_similarity(query_vector, pair[1]),
-            reverse=True,
-        )
-        for source, _ in scored[:per_chapter]:
-            if source.source_id not in selected_ids:
-                selected_ids.append(source.source_id)
-    id_set = set(selected_ids)
-    ranked = [source for source in sources if source.source_id in id_set]
-    return ranked[: config.max_sources]
+    if store is None:
+        store = _build_embedding_store(config)
+    by_id: Dict[str, SourceRecord] = {}
+    for source in sources:
+        by_id.setdefault(source.source_id, source)
+    unique = list(by_id.values())
+    source_texts = [embedding_text(source.title, source.abstract) for source in unique]
+    source_matrix, query_matrix = await asyncio.gather(
+        store.aembed_documents(source_texts),
+        store.aembed_queries(_chapter_query_texts(config, plan_queries)),
+    )
+    return _select_ranked_sources(
+        config, chapters, unique, source_matrix, query_matrix, store, emit, candidate_scores
+    )
+
+
+async def score_source_relevance(
+    config: AgentConfig,
+    plan_queries: Dict[str, List[str]],
+    sources: List[SourceRecord],
+    store: Optional[EmbeddingStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Chapter -> source_id -> cosine similarity between chapter queries and abstracts."""
+    chapters = list(plan_queries.keys())
+    if not sources or not chapters:
+        return {}
+    if store is None:
+        store = _build_embedding_store(config)
+    source_matrix, query_matrix = await asyncio.gather(
+        store.aembed_documents([embedding_text(source.title, source.abstract) for source in sources]),
+        store.aembed_queries(_chapter_query_texts(config, plan_queries)),
+    )
+    scores = _cosine_similarity_matrix(query_matrix, source_matrix)
+    return {
+        chapter: {source.source_id: float(score) for source, score in zip(sources, row)}
+        for chapter, row in zip(chapters, scores)
+    }
+
+
+async def _ranked_relevance(
+    config: AgentConfig,
+    plan_queries: Dict[str, List[str]],
+    ranked: List[SourceRecord],
+    store: EmbeddingStore,
+    candidate_scores: Dict[str, Dict[str, float]],
+) -> Dict[str, Dict[str, float]]:
+    """Relevance of ``ranked`` from the ranking scores; only sources ranking never scored are embedded."""
+    if not ranked or not plan_queries:
+        return {}
+    scored = next(iter(candidate_scores.values()), {})
+    unseen = [source for source in ranked if source.source_id not in scored]
+    extra = await score_source_relevance(config, plan_queries, unseen, store) if unseen else {}
+    relevance: Dict[str, Dict[str, float]] = {}
+    for chapter in plan_queries:
+        scores = {**candidate_scores.get(chapter, {}), **extra.get(chapter, {})}
+        relevance[chapter] = {
+            source.source_id: scores[source.source_id] for source in ranked if source.source_id in scores
+        }
+    return relevance
 
 
 async def _fetch_one(
     config: AgentConfig,
     query: str,
+    store: Optional[EmbeddingStore] = None,
+    query_cache: Optional[QueryCache] = None,
+    submitted_after: Optional[str] = None,
 ) -> List[SourceRecord]:
+    if config.retrieval_backend == "local":
+        corpus = await aload_arxiv_corpus(config.arxiv_corpus_path or "")
+        entries = await corpus.asearch(
+            query, config.max_sources, store=store, submitted_after=submitted_after
+        )
+        return [SourceRecord(**entry) for entry in entries]
+    if submitted_after:
+        query = submitted_since_query(query, submitted_after)
+    if query_cache is not None:
+        cached = query_cache.get(query, config.max_sources)
+        if cached is not None:
+            return [SourceRecord(**entry) for entry in cached]
     try:
         feed_xml = await query_arxiv_async(
             config.arxiv_base_url,
@@ -68,52 +266,192 @@ async def _fetch_one(
             config.request_timeout_s,
             retry_count=config.request_retry_count,
             retry_backoff_s=config.request_retry_backoff_s,
+            sort_by="submittedDate" if submitted_after else None,
         )
     except Exception:
         return []
+    entries = parse_arxiv_feed(feed_xml)
+    if query_cache is not None:
+        query_cache.put(query, config.max_sources, entries)
     sources: List[SourceRecord] = []
-    for entry in parse_arxiv_feed(feed_xml):
+    for entry in entries:
         sources.append(SourceRecord(**entry))
     return sources
 
 
-async def retrieve_sources_async(
+async def _fetch_known_ids(
     config: AgentConfig,
-    plan_queries: Dict[str, List[str]],
-    llm: Optional[object] = None,
-    emit: Optional[StreamEmit] = None,
+    arxiv_ids: List[str],
+    query_cache: Optional[QueryCache] = None,
 ) -> List[SourceRecord]:
-    if config.mock_mode:
-        return [
-            SourceRecord(
-                source_id="S-ARXIV-0001",
-                title="Coupled AI-physics modeling for multi-physics nuclear simulation",
-                authors=["Kim", "Lee"],
-                year=2024,
-                venue="arXiv",
-                doi="10.48550/arXiv.0000.0000",
-                url="https://arxiv.org/abs/0000.0000",
-                trust_score=0.7,
-                retrieved_at=datetime.utcnow().isoformat(),
-                source_type="paper",
-                identifiers={"arxiv_id": "0000.0000", "doi": "10.48550/arXiv.0000.0000"},
-            )
-        ]
+    if not arxiv_ids:
+        return []
+    if config.retrieval_backend == "local":
+        corpus = await aload_arxiv_corpus(config.arxiv_corpus_path or "")
+        return [SourceRecord(**record) for record in corpus.get_by_ids(arxiv_ids)]
+    # Cached under a synthetic query so refine iterations reuse the lookup.
+    cache_query = "id_list:" + ",".join(sorted(set(arxiv_ids)))
+    if query_cache is not None:
+        cached = query_cache.get(cache_query, len(arxiv_ids))
+        if cached is not None:
+            return [SourceRecord(**entry) for entry in cached]
+    try:
+        entries = await fetch_by_ids_async(
+            config.arxiv_base_url,
+            arxiv_ids,
+            config.request_timeout_s,
+            retry_count=config.request_retry_count,
+            retry_backoff_s=config.request_retry_backoff_s,
+            batch_size=config.arxiv_id_batch_size,
+            max_concurrency=config.max_concurrency,
+        )
+    except Exception:
+        return []
+    if query_cache is not None:
+        query_cache.put(cache_query, len(arxiv_ids), entries)
+    return [SourceRecord(**entry) for entry in entries]
+
+
+def _with_known_sources(
+    config: AgentConfig,
+    known: List[SourceRecord],
+    ranked: List[SourceRecord],
+) -> List[SourceRecord]:
+    """Explicitly requested arXiv IDs take precedence over ranked search results."""
+    known_ids = {source.source_id for source in known}
+    merged = known + [source for source in ranked if source.source_id not in known_ids]
+    return merged[: config.max_sources]
+
+
+def _check_retrieval_backend(config: AgentConfig) -> None:
+    if config.retrieval_backend == "local" and not config.arxiv_corpus_path:
+        raise ValueError("ARXIV_CORPUS_PATH is required when RETRIEVAL_BACKEND is local.")
+
+
+def _mock_sources() -> List[SourceRecord]:
+    return [
+        SourceRecord(
+            source_id="S-ARXIV-0001",
+            title="Coupled AI-physics modeling for multi-physics nuclear simulation",
+            authors=["Kim", "Lee"],
+            year=2024,
+            venue="arXiv",
+            doi="10.48550/arXiv.0000.0000",
+            url="https://arxiv.org/abs/0000.0000",
+            trust_score=0.7,
+            retrieved_at=datetime.utcnow().isoformat(),
+            source_type="paper",
+            identifiers={"arxiv_id": "0000.0000", "doi": "10.48550/arXiv.0000.0000"},
+        )
+    ]
 
-    tasks: List[asyncio.Task[List[SourceRecord]]] = []
+
+async def iter_source_batches(
+    config: AgentConfig,
+    plan_queries: Dict[str, List[str]],
+    store: Optional[EmbeddingStore] = None,
+    query_cache: Optional[QueryCache] = None,
+    submitted_after: Optional[str] = None,
+) -> AsyncIterator[List[SourceRecord]]:
+    """Yield each query's sources as soon as it completes, fastest query first."""
+    if config.mock_mode:
+        yield _mock_sources()
+        return
+    _check_retrieval_backend(config)
+    if query_cache is None:
+        query_cache = QueryCache()
+    # Chapters often share queries; fetch each normalized query once.
+    unique_queries: Dict[str, str] = {}
     for queries in plan_queries.values():
         limited_queries = queries[: config.max_queries_per_chapter]
         for query in limited_queries:
             sanitized_query = query[: config.max_query_length]
-            tasks.append(asyncio.create_task(_fetch_one(config, sanitized_query)))
-    sources: List[SourceRecord] = []
-    if tasks:
-        results = await asyncio.gather(*tasks)
-        for chunk in results:
-            sources.extend(chunk)
+            unique_queries.setdefault(query_key(sanitized_query, config.max_sources), sanitized_query)
+    tasks: List[asyncio.Task[List[SourceRecord]]] = [
+        asyncio.create_task(_fetch_one(config, query, store, query_cache, submitted_after))
+        for query in unique_queries.values()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            batch = await next_done
+            if batch:
+                yield batch
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def retrieve_sources_async(
+    config: AgentConfig,
+    plan_queries: Dict[str, List[str]],
+    llm: Optional[object] = None,
+    emit: Optional[StreamEmit] = None,
+    query_cache: Optional[QueryCache] = None,
+    arxiv_ids: Optional[List[str]] = None,
+    submitted_after: Optional[str] = None,
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
+) -> List[SourceRecord]:
+    """Retrieve and rank sources for the query plan.
+
+    When ``relevance`` is given it is filled with chapter -> source_id -> cosine score
+    for the returned sources, computed from the embeddings cached during ranking.
+    """
     if config.mock_mode:
-        return sources[: config.max_sources]
-    return await _rank_sources_with_embeddings(config, plan_queries, sources)
+        if config.embedding_backend == "openai":
+            return _mock_sources()
+        # Local embedders need no API key, so mock runs still exercise the ranking path.
+        store = _build_embedding_store(config)
+        candidate_scores: Dict[str, Dict[str, float]] = {}
+        ranked = await _rank_sources_with_embeddings(
+            config, plan_queries, _mock_sources(), store, emit, candidate_scores
+        )
+        if relevance is not None:
+            relevance.update(await _ranked_relevance(config, plan_queries, ranked, store, candidate_scores))
+        return ranked
+    _check_retrieval_backend(config)
+    store = _build_embedding_store(config)
+    chapters = list(plan_queries.keys())
+    # Chapter queries and each arriving batch are embedded while slower queries are
+    # still in flight; only the final selection waits for the whole candidate pool.
+    query_task = asyncio.create_task(store.aembed_queries(_chapter_query_texts(config, plan_queries)))
+    known_task = asyncio.create_task(_fetch_known_ids(config, arxiv_ids or [], query_cache))
+    by_id: Dict[str, SourceRecord] = {}
+    embed_tasks: List[asyncio.Task[np.ndarray]] = []
+    candidate_scores: Dict[str, Dict[str, float]] = {}
+    try:
+        async for batch in iter_source_batches(config, plan_queries, store, query_cache, submitted_after):
+            fresh = [source for source in batch if source.source_id not in by_id]
+            for source in fresh:
+                by_id[source.source_id] = source
+            if fresh and chapters:
+                texts = [embedding_text(source.title, source.abstract) for source in fresh]
+                embed_tasks.append(asyncio.create_task(store.aembed_documents(texts)))
+            if emit:
+                emit(
+                    "retriever",
+                    f"source batch received ({len(fresh)} new)",
+                    {"summary": "검색 결과 배치 수신, 임베딩 선행 처리", "candidates": len(by_id)},
+                )
+        known = await known_task
+        unique = list(by_id.values())
+        if not unique or not chapters:
+            ranked = _with_known_sources(config, known, unique)
+        else:
+            matrices = await asyncio.gather(*embed_tasks)
+            query_matrix = await query_task
+            source_matrix = np.concatenate(matrices, axis=0)
+            selected = _select_ranked_sources(
+                config, chapters, unique, source_matrix, query_matrix, store, emit, candidate_scores
+            )
+            ranked = _with_known_sources(config, known, selected)
+    finally:
+        query_task.cancel()
+        known_task.cancel()
+        for task in embed_tasks:
+            task.cancel()
+    if relevance is not None:
+        relevance.update(await _ranked_relevance(config, plan_queries, ranked, store, candidate_scores))
+    return ranked
 
 
 def retrieve_sources(
@@ -121,5 +459,20 @@ def retrieve_sources(
     plan_queries: Dict[str, List[str]],
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
+    query_cache: Optional[QueryCache] = None,
+    arxiv_ids: Optional[List[str]] = None,
+    submitted_after: Optional[str] = None,
+    relevance: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> List[SourceRecord]:
-    return asyncio.run(retrieve_sources_async(config, plan_queries, llm=llm, emit=emit))
+    return asyncio.run(
+        retrieve_sources_async(
+            config,
+            plan_queries,
+            llm=llm,
+            emit=emit,
+            query_cache=query_cache,
+            arxiv_ids=arxiv_ids,
+            submitted_after=submitted_after,
+            relevance=relevance,
+        )
+    )
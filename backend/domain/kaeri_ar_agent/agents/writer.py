@@ -1,46 +1,95 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Tuple
 
 from ..config import AgentConfig
 from ..schemas import DraftNode, EvidenceItem
 from ..llm_stream import StreamEmit, stream_llm_response
+from ..tools.draft_cache import DraftCache
+from ..tools.keyed_cache import text_hash
+from ..tools.token_budget import count_tokens
 
 
-def write_chapters(
+def _evidence_line(item: EvidenceItem) -> str:
+    return f"- [{item.source_id}] {item.snippet}\n"
+
+
+def evidence_hash(items: List[EvidenceItem]) -> str:
+    """Hash of the evidence payload (IDs, snippet and locator) a draft was written from."""
+    return text_hash(
+        "\x1e".join(
+            "\x1f".join([item.claim_id, item.source_id, item.snippet, item.locator or ""]) for item in items
+        )
+    )
+
+
+def select_writer_evidence(config: AgentConfig, items: List[EvidenceItem]) -> List[EvidenceItem]:
+    """Most relevant evidence first, cut to ``writer_evidence_token_budget`` tokens.
+
+    The top item is always kept so a chapter never drafts from an empty list.
+    """
+    ranked = sorted(items, key=lambda item: -item.relevance_score)
+    model = config.agent_settings("writer")["model"]
+    selected: List[EvidenceItem] = []
+    used = 0
+    for item in ranked:
+        tokens = count_tokens(_evidence_line(item), model)
+        if selected and used + tokens > config.writer_evidence_token_budget:
+            break
+        selected.append(item)
+        used += tokens
+    return selected
+
+
+async def write_chapter(
     _config: AgentConfig,
     topic: str,
     scope: Optional[str],
     exclusions: List[str],
-    outline: List[str],
-    evidence: List[EvidenceItem],
+    chapter: str,
+    items: List[EvidenceItem],
     llm: Optional[object] = None,
     emit: Optional[StreamEmit] = None,
     system_prompt: str = "",
-) -> List[DraftNode]:
-    evidence_by_chapter: Dict[str, List[EvidenceItem]] = {}
-    for item in evidence:
-        evidence_by_chapter.setdefault(item.chapter_id or "misc", []).append(item)
+    semaphore: Optional[asyncio.Semaphore] = None,
+    cache: Optional[DraftCache] = None,
+    refresh: bool = False,
+) -> DraftNode:
+    """Draft one chapter from its own evidence set.
 
-    async def _write_one(chapter: str, items: List[EvidenceItem]) -> DraftNode:
-        claim_ids = [item.claim_id for item in items]
-        source_ids = [item.source_id for item in items]
-        if _config.mock_mode or llm is None:
-            text = f"{chapter}는 핵심 기술과 난제를 정리한다. ({', '.join(source_ids)})"
-        else:
-            prompt = (
-                "You are writing a technical Korean report. "
-                "Use only the evidence snippets and cite sources as (canonical_source_id). "
-                "No honorifics. Return a single paragraph.\n\n"
-                f"Chapter: {chapter}\n"
-                f"Report topic: {topic}\n"
-                f"Scope: {scope or ''}\n"
-                f"Exclusions: {', '.join(exclusions) if exclusions else ''}\n"
-                "Evidence:\n"
-            )
-            for item in items:
-                prompt += f"- [{item.source_id}] {item.snippet}\n"
+    Only the evidence kept by ``select_writer_evidence`` reaches the prompt and the
+    draft's claim/citation lists. ``semaphore`` bounds concurrent writer calls.
+    A ``cache`` hit skips the writer call; ``refresh`` redrafts anyway (e.g. after
+    QA rejected the cached text) and stores the new draft.
+    """
+    items = select_writer_evidence(_config, items)
+    claim_ids = [item.claim_id for item in items]
+    source_ids = [item.source_id for item in items]
+    digest = evidence_hash(items)
+    key = None
+    if _config.mock_mode or llm is None:
+        text = f"{chapter}는 핵심 기술과 난제를 정리한다. ({', '.join(source_ids)})"
+    else:
+        if cache is not None:
+            key = cache.key(chapter, topic, scope, exclusions, items, system_prompt)
+            cached = None if refresh else cache.get(key)
+            if cached is not None:
+                return cached.model_copy(update={"evidence_hash": digest})
+        prompt = (
+            "You are writing a technical Korean report. "
+            "Use only the evidence snippets and cite sources as (canonical_source_id). "
+            "No honorifics. Return a single paragraph.\n\n"
+            f"Chapter: {chapter}\n"
+            f"Report topic: {topic}\n"
+            f"Scope: {scope or ''}\n"
+            f"Exclusions: {', '.join(exclusions) if exclusions else ''}\n"
+            "Evidence:\n"
+        )
+        for item in items:
+            prompt += _evidence_line(item)
+        async with semaphore or nullcontext():
             text = await stream_llm_response(
                 llm,
                 prompt,
@@ -48,19 +97,71 @@ def write_chapters(
                 "writer",
                 system_prompt=system_prompt,
             )
-        return DraftNode(
-            chapter_id=chapter,
-            paragraph_id=f"{chapter}-P001",
-            text=text,
-            claim_ids=claim_ids,
-            citation_source_ids=source_ids,
-        )
+    draft = DraftNode(
+        chapter_id=chapter,
+        paragraph_id=f"{chapter}-P001",
+        text=text,
+        claim_ids=claim_ids,
+        citation_source_ids=source_ids,
+        evidence_hash=digest,
+    )
+    if cache is not None and key is not None:
+        cache.put(key, draft)
+    return draft
+
+
+def draft_is_current(config: AgentConfig, draft: DraftNode, items: List[EvidenceItem]) -> bool:
+    """True when ``draft`` was written from exactly the evidence this set would select.
+
+    Besides the claim and source IDs, the snippets must match, so a re-extracted
+    snippet under an unchanged claim ID still triggers a redraft.
+    """
+    selected = select_writer_evidence(config, items)
+    return (
+        draft.claim_ids == [item.claim_id for item in selected]
+        and draft.citation_source_ids == [item.source_id for item in selected]
+        and draft.evidence_hash == evidence_hash(selected)
+    )
+
+
+def write_chapters(
+    _config: AgentConfig,
+    topic: str,
+    scope: Optional[str],
+    exclusions: List[str],
+    outline: List[str],
+    evidence: List[EvidenceItem],
+    llm: Optional[object] = None,
+    emit: Optional[StreamEmit] = None,
+    system_prompt: str = "",
+    cache: Optional[DraftCache] = None,
+    refresh: bool = False,
+) -> List[DraftNode]:
+    evidence_by_chapter: Dict[str, List[EvidenceItem]] = {}
+    for item in evidence:
+        evidence_by_chapter.setdefault(item.chapter_id or "misc", []).append(item)
 
     async def _run_all() -> List[DraftNode]:
+        semaphore = asyncio.Semaphore(max(1, _config.max_concurrency))
         tasks = []
         for chapter in outline:
             chapter_evidence = evidence_by_chapter.get(chapter, [])
-            tasks.append(_write_one(chapter, chapter_evidence))
+            tasks.append(
+                write_chapter(
+                    _config,
+                    topic,
+                    scope,
+                    exclusions,
+                    chapter,
+                    chapter_evidence,
+                    llm=llm,
+                    emit=emit,
+                    system_prompt=system_prompt,
+                    semaphore=semaphore,
+                    cache=cache,
+                    refresh=refresh,
+                )
+            )
         return await asyncio.gather(*tasks)
 
     return asyncio.run(_run_all())
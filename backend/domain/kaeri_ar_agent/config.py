@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import os
 from typing import Optional
 
+from langchain_core.embeddings import Embeddings
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 
@@ -15,6 +16,9 @@ class AgentConfig:
     openai_model: str = "gpt-4o-mini"
     openai_temperature: float = 0.2
     openai_embedding_model: str = "text-embedding-3-small"
+    embedding_backend: str = "openai"
+    local_embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    hashing_embedding_dim: int = 1024
     planner_model: Optional[str] = None
     planner_temperature: Optional[float] = None
     outliner_model: Optional[str] = None
@@ -32,13 +36,30 @@ class AgentConfig:
     qa_model: Optional[str] = None
     qa_temperature: Optional[float] = None
     arxiv_base_url: str = "https://export.arxiv.org/api/query"
+    retrieval_backend: str = "arxiv"
+    arxiv_corpus_path: Optional[str] = None
+    arxiv_id_batch_size: int = 100
+    arxiv_refresh_max_age_s: float = 86400.0
     request_timeout_s: float = 20.0
     request_retry_count: int = 2
     request_retry_backoff_s: float = 1.0
     provider_timeout_s: float = 20.0
     mock_mode: bool = True
     max_sources: int = 20
+    source_selection: str = "ranked"
+    selection_relevance_threshold: float = 0.3
+    selection_chapter_coverage: int = 2
+    selection_redundancy_lambda: float = 0.7
     max_evidence_per_chapter: int = 12
+    evidence_relevance_threshold: float = 0.2
+    extraction_mode: str = "per_pair"
+    extraction_pack_token_budget: int = 6000
+    extractive_max_sentences: int = 2
+    stream_chapter_drafts: bool = False
+    writer_evidence_token_budget: int = 3000
+    qa_min_citations_per_paragraph: int = 1
+    qa_llm_sample_rate: float = 1.0
+    composer_context_token_budget: int = 6000
     max_queries_per_chapter: int = 3
     max_query_length: int = 200
     max_iterations: int = 2
@@ -50,6 +71,13 @@ class AgentConfig:
     openalex_mailto: Optional[str] = None
     unpaywall_email: Optional[str] = None
     semanticscholar_api_key: Optional[str] = None
+    cache_dir: Optional[str] = ".cache"
+    embedding_cache_dtype: str = "float32"
+    query_cache_ttl_s: float = 86400.0
+    extraction_cache_max_entries: int = 20000
+    draft_cache_max_entries: int = 0
+    incremental_mode: bool = False
+    incremental_since: Optional[str] = None
 
     @classmethod
     def from_env(cls) -> "AgentConfig":
@@ -58,6 +86,11 @@ class AgentConfig:
             openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
             openai_temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.2")),
             openai_embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+            embedding_backend=os.getenv("EMBEDDING_BACKEND", "openai"),
+            local_embedding_model=os.getenv(
+                "LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+            ),
+            hashing_embedding_dim=int(os.getenv("HASHING_EMBEDDING_DIM", "1024")),
             planner_model=os.getenv("PLANNER_MODEL"),
             planner_temperature=_float_or_none(os.getenv("PLANNER_TEMPERATURE")),
             outliner_model=os.getenv("OUTLINER_MODEL"),
@@ -75,13 +108,30 @@ class AgentConfig:
             qa_model=os.getenv("QA_MODEL"),
             qa_temperature=_float_or_none(os.getenv("QA_TEMPERATURE")),
             arxiv_base_url=os.getenv("ARXIV_BASE_URL", "https://export.arxiv.org/api/query"),
+            retrieval_backend=os.getenv("RETRIEVAL_BACKEND", "arxiv"),
+            arxiv_corpus_path=os.getenv("ARXIV_CORPUS_PATH"),
+            arxiv_id_batch_size=int(os.getenv("ARXIV_ID_BATCH_SIZE", "100")),
+            arxiv_refresh_max_age_s=float(os.getenv("ARXIV_REFRESH_MAX_AGE_S", "86400")),
             request_timeout_s=float(os.getenv("REQUEST_TIMEOUT_S", "20")),
             request_retry_count=int(os.getenv("REQUEST_RETRY_COUNT", "2")),
             request_retry_backoff_s=float(os.getenv("REQUEST_RETRY_BACKOFF_S", "1.0")),
             provider_timeout_s=float(os.getenv("PROVIDER_TIMEOUT_S", os.getenv("REQUEST_TIMEOUT_S", "20"))),
             mock_mode=os.getenv("MOCK_MODE", "true").lower() == "true",
             max_sources=int(os.getenv("MAX_SOURCES", "20")),
+            source_selection=os.getenv("SOURCE_SELECTION", "ranked"),
+            selection_relevance_threshold=float(os.getenv("SELECTION_RELEVANCE_THRESHOLD", "0.3")),
+            selection_chapter_coverage=int(os.getenv("SELECTION_CHAPTER_COVERAGE", "2")),
+            selection_redundancy_lambda=float(os.getenv("SELECTION_REDUNDANCY_LAMBDA", "0.7")),
             max_evidence_per_chapter=int(os.getenv("MAX_EVIDENCE_PER_CHAPTER", "12")),
+            evidence_relevance_threshold=float(os.getenv("EVIDENCE_RELEVANCE_THRESHOLD", "0.2")),
+            extraction_mode=os.getenv("EXTRACTION_MODE", "per_pair"),
+            extraction_pack_token_budget=int(os.getenv("EXTRACTION_PACK_TOKEN_BUDGET", "6000")),
+            extractive_max_sentences=int(os.getenv("EXTRACTIVE_MAX_SENTENCES", "2")),
+            stream_chapter_drafts=os.getenv("STREAM_CHAPTER_DRAFTS", "false").lower() == "true",
+            writer_evidence_token_budget=int(os.getenv("WRITER_EVIDENCE_TOKEN_BUDGET", "3000")),
+            qa_min_citations_per_paragraph=int(os.getenv("QA_MIN_CITATIONS_PER_PARAGRAPH", "1")),
+            qa_llm_sample_rate=float(os.getenv("QA_LLM_SAMPLE_RATE", "1.0")),
+            composer_context_token_budget=int(os.getenv("COMPOSER_CONTEXT_TOKEN_BUDGET", "6000")),
             max_queries_per_chapter=int(os.getenv("MAX_QUERIES_PER_CHAPTER", "3")),
             max_query_length=int(os.getenv("MAX_QUERY_LENGTH", "200")),
             max_iterations=int(os.getenv("MAX_ITERATIONS", "2")),
@@ -93,6 +143,13 @@ class AgentConfig:
             openalex_mailto=os.getenv("OPENALEX_MAILTO"),
             unpaywall_email=os.getenv("UNPAYWALL_EMAIL"),
             semanticscholar_api_key=os.getenv("SEMANTICSCHOLAR_API_KEY"),
+            cache_dir=os.getenv("CACHE_DIR", ".cache") or None,
+            embedding_cache_dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float32"),
+            query_cache_ttl_s=float(os.getenv("QUERY_CACHE_TTL_S", "86400")),
+            extraction_cache_max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "20000")),
+            draft_cache_max_entries=int(os.getenv("DRAFT_CACHE_MAX_ENTRIES", "0")),
+            incremental_mode=os.getenv("INCREMENTAL_MODE", "false").lower() == "true",
+            incremental_since=os.getenv("INCREMENTAL_SINCE") or None,
         )
 
     def build_llm(self, agent: Optional[str] = None) -> ChatOpenAI:
@@ -131,7 +188,17 @@ class AgentConfig:
             streaming=True,
         )
 
-    def build_embeddings(self) -> OpenAIEmbeddings:
+    def build_embeddings(self) -> Embeddings:
+        if self.embedding_backend == "hashing":
+            from .tools.local_embeddings import HashingEmbeddings
+
+            return HashingEmbeddings(self.hashing_embedding_dim)
+        if self.embedding_backend == "sentence-transformers":
+            from .tools.local_embeddings import SentenceTransformerEmbeddings
+
+            return SentenceTransformerEmbeddings(self.local_embedding_model)
+        if self.embedding_backend != "openai":
+            raise ValueError(f"Unsupported EMBEDDING_BACKEND: {self.embedding_backend}")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required when mock_mode is false.")
         return OpenAIEmbeddings(
@@ -139,6 +206,19 @@ class AgentConfig:
             api_key=self.openai_api_key,
         )
 
+    def embedding_model_id(self) -> str:
+        """Identifies the vectors produced by ``build_embeddings`` (embedding cache key)."""
+        if self.embedding_backend == "hashing":
+            return f"hashing-{self.hashing_embedding_dim}"
+        if self.embedding_backend == "sentence-transformers":
+            return f"st-{self.local_embedding_model}"
+        return self.openai_embedding_model
+
+    def cache_path(self, name: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, name)
+
     def agent_settings(self, agent: str) -> dict:
         model = self.openai_model
         temperature = self.openai_temperature
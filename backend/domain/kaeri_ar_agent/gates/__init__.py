@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List
 
-from ..schemas import AuditResult, DraftNode, SourceRecord
+from ..schemas import AuditResult, DraftNode, EvidenceItem, SourceRecord
 from .g1a_consensus import gate_g1a_consensus
 
 
@@ -17,6 +17,14 @@ def gate_g1_sources(sources: List[SourceRecord]) -> AuditResult:
     return AuditResult(passed=not issues, issues=issues)
 
 
+def gate_g1b_chapter(chapter: str, evidence: List[EvidenceItem]) -> AuditResult:
+    """Per-chapter evidence gate: the chapter needs at least one usable snippet."""
+    issues: List[str] = []
+    if not any(item.chapter_id == chapter for item in evidence):
+        issues.append(f"No usable evidence for chapter: {chapter}")
+    return AuditResult(passed=not issues, issues=issues)
+
+
 def gate_g2_citations(sources: List[SourceRecord], drafts: List[DraftNode]) -> AuditResult:
     issues: List[str] = []
     canonical_ids = {source.canonical_source_id or source.source_id for source in sources}
@@ -29,4 +37,4 @@ def gate_g2_citations(sources: List[SourceRecord], drafts: List[DraftNode]) -> A
     return AuditResult(passed=not issues, issues=issues)
 
 
-__all__ = ["gate_g1_sources", "gate_g2_citations", "gate_g1a_consensus"]
+__all__ = ["gate_g1_sources", "gate_g1b_chapter", "gate_g2_citations", "gate_g1a_consensus"]
@@ -1,11 +1,91 @@
 from __future__ import annotations
 
 import asyncio
+import re
 import uuid
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 
 StreamEmit = Callable[[str, str, Optional[Dict[str, Any]]], None]
+# Called with each newly streamed chunk (guards keep their own state); returns an
+# abort reason or None to keep going.
+StreamGuard = Callable[[str], Optional[str]]
+
+FENCE_PREFIX = re.compile(r"`{1,3}|```[a-z]*")
+
+
+def strip_code_fence(text: str) -> str:
+    """Drop a Markdown code fence (optionally tagged ``json``) wrapped around a reply."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.strip("`")
+        if cleaned.lower().startswith("json"):
+            cleaned = cleaned[4:]
+    return cleaned.strip()
+
+
+class StreamAborted(Exception):
+    """Raised when a stream guard stops a response before the model finished it."""
+
+    def __init__(self, reason: str, text: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.text = text
+
+
+class JsonPrefixGuard:
+    """Incrementally checks that streamed text can still become one JSON value.
+
+    Each call takes only the newly streamed chunk. A leading Markdown code fence is
+    tolerated. Returns ``"invalid_json"`` as soon as the text starts with something
+    other than an object or array, closes a bracket it never opened, or carries
+    content after the top-level value is complete.
+    """
+
+    def __init__(self) -> None:
+        self._stack: List[str] = []
+        self._started = False
+        self._closed = False
+        self._in_string = False
+        self._escaped = False
+        self._fence = ""
+
+    def __call__(self, text: str) -> Optional[str]:
+        for char in text:
+            if not self._started:
+                if char.isspace():
+                    continue
+                if char in "{[":
+                    self._started = True
+                    self._stack.append(char)
+                    continue
+                # Allow an opening ```json fence before the value.
+                self._fence += char.lower()
+                if not FENCE_PREFIX.fullmatch(self._fence):
+                    return "invalid_json"
+                continue
+            if self._closed:
+                if char.isspace() or char == "`":
+                    continue
+                return "invalid_json"
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack or "{[".index(self._stack.pop()) != "}]".index(char):
+                    return "invalid_json"
+                if not self._stack:
+                    self._closed = True
+        return None
 
 
 async def stream_llm_response(
@@ -14,7 +94,14 @@ async def stream_llm_response(
     emit: Optional[StreamEmit],
     agent: str,
     system_prompt: Optional[str] = None,
+    should_abort: Optional[StreamGuard] = None,
 ) -> str:
+    """Stream ``llm`` output to ``emit`` and return the full text.
+
+    ``should_abort`` sees each chunk as it arrives; when it reports a reason, the
+    underlying stream is closed right away and ``StreamAborted`` is raised with the
+    partial text.
+    """
     stream_id = uuid.uuid4().hex
     full_prompt = prompt
     if system_prompt:
@@ -32,7 +119,9 @@ async def stream_llm_response(
             },
         )
     chunks = []
-    async for chunk in llm.astream(full_prompt):
+    abort_reason: Optional[str] = None
+    stream = llm.astream(full_prompt)
+    async for chunk in stream:
         text = getattr(chunk, "content", str(chunk))
         if text:
             chunks.append(text)
@@ -42,8 +131,29 @@ async def stream_llm_response(
                     "llm stream chunk",
                     {"type": "llm_stream", "stream_id": stream_id, "delta": text},
                 )
+            if should_abort is not None:
+                abort_reason = should_abort(text)
+                if abort_reason:
+                    break
         await asyncio.sleep(0)
     full_text = "".join(chunks)
+    if abort_reason:
+        close = getattr(stream, "aclose", None)
+        if close is not None:
+            await close()
+        if emit:
+            emit(
+                agent,
+                "llm stream aborted",
+                {
+                    "type": "llm_stream_end",
+                    "stream_id": stream_id,
+                    "length": len(full_text),
+                    "aborted": True,
+                    "reason": abort_reason,
+                },
+            )
+        raise StreamAborted(abort_reason, full_text)
     if emit:
         emit(
             agent,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 import re
 
@@ -7,23 +9,33 @@ from langgraph.graph import END, StateGraph
 
 from .agents.auditor import audit_citations
 from .agents.composer import compose_text
-from .agents.extractor import extract_evidence
+from .agents.extractor import extract_evidence_async, predicted_llm_calls, select_extraction_pairs
 from .agents.outliner import generate_outline
 from .agents.planner import build_query_plan
-from .agents.qa import qa_checks
+from .agents.qa import issue_chapter, qa_checks
 from .agents.resolver import resolve_sources
 from .agents.retriever import retrieve_sources
 from .agents.refiner import refine_query_plan
 from .agents.status_checker import check_status
-from .agents.writer import write_chapters
+from .agents.writer import draft_is_current, write_chapter, write_chapters
 from .config import AgentConfig
-from .gates import gate_g1_sources, gate_g1a_consensus
+from .gates import gate_g1_sources, gate_g1a_consensus, gate_g1b_chapter
 from .prompts import load_prompts
-from .schemas import PipelineInputs
+from .schemas import DraftNode, EvidenceItem, PipelineInputs, RunSnapshot
 from .state import PipelineState
+from .tools.draft_cache import DraftCache
+from .tools.extraction_cache import ExtractionCache
+from .tools.query_cache import QueryCache
+from .tools.run_snapshot import RunSnapshotStore, merge_evidence, new_sources, snapshot_key
 
 
 def _init_state(inputs: PipelineInputs, config: AgentConfig) -> PipelineState:
+    previous_run = None
+    submitted_after = config.incremental_since
+    if config.incremental_mode:
+        previous_run = RunSnapshotStore(config.cache_path("snapshots")).load(snapshot_key(inputs))
+        if previous_run and not submitted_after:
+            submitted_after = previous_run.created_at[:10]
     return {
         "inputs": inputs,
         "gates": {},
@@ -37,6 +49,11 @@ def _init_state(inputs: PipelineInputs, config: AgentConfig) -> PipelineState:
         "qa_route": None,
         "retrieval_stats": {},
         "evidence_stats": {},
+        "query_cache": {},
+        "extraction_cache": {},
+        "draft_cache": {},
+        "previous_run": previous_run,
+        "submitted_after": submitted_after if config.incremental_mode else None,
     }
 
 
@@ -66,6 +83,7 @@ def _outline_node(
         outline=list(payload.get("outline") or []),
         scope=payload.get("scope"),
         exclusions=list(payload.get("exclusions") or []),
+        arxiv_ids=list(state["inputs"].arxiv_ids),
     )
     errors = list(state.get("errors", []))
     if not inputs.outline:
@@ -141,12 +159,37 @@ def _retrieve_node(
         )
     llm = config.build_llm("retriever") if not config.mock_mode else None
     plan_queries = state["plan_queries"]
-    sources = retrieve_sources(config, plan_queries, llm=llm, emit=emit)
+    query_cache = QueryCache(
+        config.cache_path("queries"),
+        ttl_s=config.query_cache_ttl_s,
+        run_entries=state.get("query_cache"),
+    )
+    relevance: Dict[str, Dict[str, float]] = {}
+    sources = retrieve_sources(
+        config,
+        plan_queries,
+        llm=llm,
+        emit=emit,
+        query_cache=query_cache,
+        arxiv_ids=state["inputs"].arxiv_ids,
+        submitted_after=state.get("submitted_after"),
+        relevance=relevance,
+    )
     total_queries = sum(len(queries) for queries in plan_queries.values())
+    retrieved = len(sources)
+    previous_run = state.get("previous_run")
+    if previous_run:
+        # Incremental mode: only papers the previous run did not process flow downstream.
+        sources = new_sources(previous_run.sources, sources)
     retrieval_stats = {
         "total_queries": total_queries,
-        "retrieved_sources": len(sources),
+        "retrieved_sources": retrieved,
+        "predicted_extractor_calls": predicted_llm_calls(config, sources, state["inputs"].outline, relevance),
+        **query_cache.stats(),
     }
+    if previous_run:
+        retrieval_stats["new_sources"] = len(sources)
+        retrieval_stats["previous_sources"] = len(previous_run.sources)
     if emit:
         emit(
             "retriever",
@@ -159,7 +202,12 @@ def _retrieve_node(
                 ]
             },
         )
-    return {"sources": sources, "retrieval_stats": retrieval_stats}
+    return {
+        "sources": sources,
+        "retrieval_stats": retrieval_stats,
+        "query_cache": query_cache.run_entries,
+        "source_relevance": relevance,
+    }
 
 
 def _gate_g1_node(
@@ -168,7 +216,9 @@ def _gate_g1_node(
 ) -> Dict:
     if emit:
         emit("gates", "G1 source validation started", {"summary": "출처 무결성(doi/url, 1차 출처) 검증 중"})
-    audit = gate_g1_sources(state.get("sources", []))
+    previous_run = state.get("previous_run")
+    previous_sources = previous_run.sources if previous_run else []
+    audit = gate_g1_sources(previous_sources + state.get("sources", []))
     last_issues: List[str] = []
     gates = {**state.get("gates", {}), "g1_passed": audit.passed}
     errors = list(state.get("errors", []))
@@ -198,18 +248,101 @@ def _extract_node(
         )
     inputs = state["inputs"]
     prompts = state.get("prompts", {})
-    llm = config.build_llm("extractor") if not config.mock_mode else None
-    evidence = extract_evidence(
-        config,
-        state.get("sources", []),
-        inputs.outline,
-        llm=llm,
-        emit=emit,
-        system_prompt=prompts.get("extractor", ""),
+    needs_llm = not config.mock_mode and config.extraction_mode != "extractive"
+    llm = config.build_llm("extractor") if needs_llm else None
+    sources = state.get("sources", [])
+    previous_run = state.get("previous_run")
+    if previous_run:
+        # Resolution may reveal a shared DOI that the arXiv ID check could not.
+        sources = new_sources(previous_run.sources, sources)
+    settings = config.agent_settings("extractor")
+    extraction_cache = ExtractionCache(
+        root=config.cache_path("extraction"),
+        max_entries=config.extraction_cache_max_entries,
+        model=settings["model"],
+        temperature=settings["temperature"],
+        run_entries=state.get("extraction_cache"),
     )
+    stream_stats: Dict[str, int] = {}
+    # Draft chapters while the rest are still being extracted. Incremental runs
+    # renumber claims when merging, so they draft after extraction instead.
+    streaming = config.stream_chapter_drafts and not previous_run
+    streamed: Dict[str, DraftNode] = dict(state.get("streamed_drafts") or {})
+    writer_llm = config.build_llm("writer") if streaming and not config.mock_mode else None
+    drafting: Dict[str, asyncio.Task] = {}
+    writer_slots = asyncio.Semaphore(max(1, config.max_concurrency))
+    draft_cache = _draft_cache(state, config)
+
+    def _on_chapter(chapter: str, items: List[EvidenceItem]) -> None:
+        if not gate_g1b_chapter(chapter, items).passed:
+            return
+        previous = streamed.get(chapter)
+        if previous is not None and draft_is_current(config, previous, items):
+            return
+        if emit:
+            emit(
+                "writer",
+                f"early chapter drafting started: {chapter}",
+                {"summary": "증거가 확정된 챕터부터 초안 작성 시작", "chapter": chapter, "evidence_items": len(items)},
+            )
+        drafting[chapter] = asyncio.create_task(
+            write_chapter(
+                config,
+                inputs.topic,
+                inputs.scope,
+                inputs.exclusions,
+                chapter,
+                items,
+                llm=writer_llm,
+                emit=emit,
+                system_prompt=prompts.get("writer", ""),
+                semaphore=writer_slots,
+                cache=draft_cache,
+            )
+        )
+
+    async def _extract_and_draft() -> List[EvidenceItem]:
+        found = await extract_evidence_async(
+            config,
+            sources,
+            inputs.outline,
+            llm=llm,
+            emit=emit,
+            system_prompt=prompts.get("extractor", ""),
+            source_system_prompt=prompts.get("extractor_multi", ""),
+            packed_system_prompt=prompts.get("extractor_packed", ""),
+            relevance=state.get("source_relevance"),
+            cache=extraction_cache,
+            chapter_queries=state.get("plan_queries"),
+            stats=stream_stats,
+            on_chapter=_on_chapter if streaming else None,
+        )
+        for chapter, task in drafting.items():
+            streamed[chapter] = await task
+        return found
+
+    evidence = asyncio.run(_extract_and_draft())
+    pairs = select_extraction_pairs(config, sources, inputs.outline, state.get("source_relevance"))
     evidence_stats = {
         "evidence_items": len(evidence),
+        "extraction_pairs": sum(len(selected) for selected in pairs.values()),
+        **extraction_cache.stats(),
+        **stream_stats,
     }
+    update: Dict[str, Any] = {}
+    if streaming:
+        evidence_stats["early_drafts"] = len(drafting)
+        update["draft_cache"] = draft_cache.run_entries
+        update["streamed_drafts"] = {
+            chapter: draft
+            for chapter, draft in streamed.items()
+            if draft_is_current(config, draft, [item for item in evidence if item.chapter_id == chapter])
+        }
+    if previous_run:
+        evidence_stats["new_evidence_items"] = len(evidence)
+        evidence = merge_evidence(previous_run.evidence, evidence)
+        evidence_stats["evidence_items"] = len(evidence)
+        update["sources"] = previous_run.sources + sources
     if emit:
         emit(
             "extractor",
@@ -222,7 +355,12 @@ def _extract_node(
                 ]
             },
         )
-    return {"evidence": evidence, "evidence_stats": evidence_stats}
+    return {
+        "evidence": evidence,
+        "evidence_stats": evidence_stats,
+        "extraction_cache": extraction_cache.run_entries,
+        **update,
+    }
 
 
 def _resolve_node(
@@ -250,6 +388,7 @@ def _resolve_node(
                 "resolved_sources": len(resolved),
                 "doi_confirmed": stats.doi_confirmed,
                 "preprint_only": stats.preprint_only,
+                "arxiv_refreshed": stats.arxiv_refreshed,
                 "provider_hits": stats.provider_hits,
                 "provider_misses": stats.provider_misses,
             },
@@ -355,12 +494,13 @@ def _gate_evidence_node(
 ) -> Dict:
     outline = state["inputs"].outline
     evidence = state.get("evidence", [])
-    evidence_by_chapter: Dict[str, int] = {chapter: 0 for chapter in outline}
-    for item in evidence:
-        if item.chapter_id in evidence_by_chapter:
-            evidence_by_chapter[item.chapter_id] += 1
-    missing = [chapter for chapter, count in evidence_by_chapter.items() if count == 0]
-    issues = [f"No usable evidence for chapter: {chapter}" for chapter in missing]
+    missing: List[str] = []
+    issues: List[str] = []
+    for chapter in outline:
+        result = gate_g1b_chapter(chapter, evidence)
+        if not result.passed:
+            missing.append(chapter)
+            issues.extend(result.issues)
     if emit:
         emit(
             "gates",
@@ -394,30 +534,88 @@ def _write_node(
     inputs = state["inputs"]
     prompts = state.get("prompts", {})
     llm = config.build_llm("writer") if not config.mock_mode else None
+    evidence = state.get("evidence", [])
+    reused = _reusable_drafts(state)
+    rewrite = state.get("rewrite_chapters")
+    if rewrite and state.get("drafts"):
+        # QA flagged only these chapters; keep every other draft as it is.
+        reused = {
+            draft.chapter_id: draft
+            for draft in state.get("drafts", [])
+            if draft.chapter_id in inputs.outline and draft.chapter_id not in rewrite
+        }
+    for chapter, draft in (state.get("streamed_drafts") or {}).items():
+        chapter_items = [item for item in evidence if item.chapter_id == chapter]
+        if chapter in inputs.outline and chapter not in reused and draft_is_current(config, draft, chapter_items):
+            reused[chapter] = draft
+    draft_cache = _draft_cache(state, config)
     drafts = write_chapters(
         config,
         inputs.topic,
         inputs.scope,
         inputs.exclusions,
-        inputs.outline,
-        state.get("evidence", []),
+        [chapter for chapter in inputs.outline if chapter not in reused],
+        evidence,
         llm=llm,
         emit=emit,
         system_prompt=prompts.get("writer", ""),
+        cache=draft_cache,
+        # QA sent these chapters back, so their cached text must not be reused.
+        refresh=state.get("qa_route") == "write",
     )
+    written = {draft.chapter_id: draft for draft in drafts}
+    if reused:
+        drafts = [reused.get(chapter) or written[chapter] for chapter in inputs.outline]
     if emit:
         emit(
             "writer",
             f"chapter drafting completed ({len(drafts)} sections)",
             {
-                "summary": "챕터 초안 작성 완료",
+                "summary": "챕터 초안 작성 완료"
+                if not rewrite
+                else f"QA 지적 챕터만 재작성({len(written)}/{len(drafts)})",
                 "draft_sample": [
                     {"chapter_id": draft.chapter_id, "text": draft.text[:140]}
                     for draft in drafts[:3]
-                ]
+                ],
+                "cache": draft_cache.stats(),
             },
         )
-    return {"drafts": drafts}
+    # Early drafts are consumed here; later write routes (QA) must redraft.
+    return {
+        "drafts": drafts,
+        "streamed_drafts": {},
+        "draft_cache": draft_cache.run_entries,
+        "qa_route": None,
+        "rewrite_chapters": None,
+    }
+
+
+def _draft_cache(state: PipelineState, config: AgentConfig) -> DraftCache:
+    settings = config.agent_settings("writer")
+    return DraftCache(
+        root=config.cache_path("drafts"),
+        max_entries=config.draft_cache_max_entries,
+        model=settings["model"],
+        temperature=settings["temperature"],
+        run_entries=state.get("draft_cache"),
+    )
+
+
+def _reusable_drafts(state: PipelineState) -> Dict[str, DraftNode]:
+    """Previous-run drafts for chapters that gained no new evidence (first write only)."""
+    previous_run = state.get("previous_run")
+    if not previous_run or state.get("drafts"):
+        return {}
+    previous_claims = {item.claim_id for item in previous_run.evidence}
+    changed = {
+        item.chapter_id for item in state.get("evidence", []) if item.claim_id not in previous_claims
+    }
+    return {
+        draft.chapter_id: draft
+        for draft in previous_run.drafts
+        if draft.chapter_id in state["inputs"].outline and draft.chapter_id not in changed
+    }
 
 
 def _audit_node(
@@ -436,12 +634,17 @@ def _audit_node(
         )
     llm = config.build_llm("auditor") if not config.mock_mode else None
     prompts = state.get("prompts", {})
+    audit_passed = dict(state.get("audit_passed") or {})
+    audit_stats: Dict[str, int] = {}
     audit = audit_citations(
         state.get("sources", []),
         state.get("drafts", []),
         llm=llm,
         emit=emit,
         system_prompt=prompts.get("auditor", ""),
+        passed=audit_passed,
+        max_concurrency=config.max_concurrency,
+        stats=audit_stats,
     )
     last_issues: List[str] = []
     gates = {**state.get("gates", {}), "g2_passed": audit.passed}
@@ -467,9 +670,10 @@ def _audit_node(
         last_issues = audit.issues
         iteration = iteration + 1
     elif emit:
-        emit("auditor", "G2 passed", {"summary": "인용/출처 매핑 통과"})
+        emit("auditor", "G2 passed", {"summary": "인용/출처 매핑 통과", **audit_stats})
     return {
         "audit": audit,
+        "audit_passed": audit_passed,
         "gates": gates,
         "errors": errors,
         "warnings": warnings,
@@ -507,6 +711,8 @@ def _compose_node(
         llm=llm,
         emit=emit,
         system_prompt=prompts.get("composer", ""),
+        context_token_budget=config.composer_context_token_budget,
+        model=config.agent_settings("composer")["model"],
     )
     if emit:
         emit("composer", "composition completed", {"summary": "문서 구성 완료", "length": len(composed)})
@@ -529,29 +735,46 @@ def _qa_node(
         )
     llm = config.build_llm("qa") if not config.mock_mode else None
     prompts = state.get("prompts", {})
+    qa_stats: Dict[str, int] = {}
+    qa_passed = dict(state.get("qa_passed") or {})
+    rule_routes: Dict[str, str] = {}
     issues = qa_checks(
         state.get("drafts", []),
         llm=llm,
         emit=emit,
         system_prompt=prompts.get("qa", ""),
         context=f"Topic: {state['inputs'].topic}; Scope: {state['inputs'].scope or ''}; Exclusions: {', '.join(state['inputs'].exclusions)}",
+        exclusions=state["inputs"].exclusions,
+        composed_text=state.get("composed_text"),
+        required_sections=_required_sections(state, config),
+        min_citations=config.qa_min_citations_per_paragraph,
+        sample_rate=config.qa_llm_sample_rate,
+        stats=qa_stats,
+        passed=qa_passed,
+        max_concurrency=config.max_concurrency,
+        rule_routes=rule_routes,
     )
     last_issues: List[str] = []
     qa_route = None
+    rewrite_chapters = None
     errors = list(state.get("errors", []))
     if issues:
         errors.extend(issues)
         if emit:
-            emit("qa", "QA issues found", {"summary": "QA 문제 발견", "issues": issues})
+            emit("qa", "QA issues found", {"summary": "QA 문제 발견", "issues": issues, **qa_stats})
         last_issues = issues
-        qa_route = _classify_qa_route(issues)
+        qa_route = _classify_qa_route(issues, rule_routes)
+        if qa_route == "write":
+            rewrite_chapters = _flagged_chapters(issues, state["inputs"].outline)
         iteration = state.get("iteration", 0) + 1
     elif emit:
-        emit("qa", "QA passed", {"summary": "QA 통과"})
+        emit("qa", "QA passed", {"summary": "QA 통과", **qa_stats})
     return {
         "errors": errors,
         "last_issues": last_issues if issues else [],
         "qa_route": qa_route,
+        "rewrite_chapters": rewrite_chapters,
+        "qa_passed": qa_passed,
         "iteration": iteration if issues else state.get("iteration", 0),
     }
 
@@ -607,7 +830,32 @@ def _classify_g2_route(issues: List[str]) -> str:
     return "refine"
 
 
-def _classify_qa_route(issues: List[str]) -> str:
+def _required_sections(state: PipelineState, config: AgentConfig) -> List[str]:
+    """Sections the composer produces for this state, which QA expects to find non-empty."""
+    required = [] if config.mock_mode else ["초록", "키워드"]
+    if state.get("plan_queries"):
+        required.append("방법론")
+    if any(draft.citation_source_ids for draft in state.get("drafts", [])):
+        required.append("참고문헌")
+    return required
+
+
+def _flagged_chapters(issues: List[str], outline: List[str]) -> Optional[List[str]]:
+    """Chapters named by QA issues, or None when any issue is not tied to one chapter."""
+    flagged: List[str] = []
+    for issue in issues:
+        chapter = issue_chapter(issue)
+        if chapter not in outline:
+            return None
+        if chapter not in flagged:
+            flagged.append(chapter)
+    return flagged or None
+
+
+QA_ROUTE_PRIORITY = ["outline", "compose", "write", "refine"]
+
+
+def _classify_keyword_route(issues: List[str]) -> str:
     joined = " ".join(issues)
     if any(key in joined for key in ["주제", "일관성", "스코프", "범위"]):
         return "outline"
@@ -620,6 +868,19 @@ def _classify_qa_route(issues: List[str]) -> str:
     return "write"
 
 
+def _classify_qa_route(issues: List[str], rule_routes: Optional[Dict[str, str]] = None) -> str:
+    """Route for a QA pass: local rule findings carry their own route, LLM issues go by keyword.
+
+    When both are present the earliest stage in ``QA_ROUTE_PRIORITY`` wins.
+    """
+    rule_routes = rule_routes or {}
+    routes = {rule_routes[issue] for issue in issues if issue in rule_routes}
+    reviewed = [issue for issue in issues if issue not in rule_routes]
+    if reviewed or not routes:
+        routes.add(_classify_keyword_route(reviewed))
+    return min(routes, key=QA_ROUTE_PRIORITY.index)
+
+
 def build_pipeline(
     config: AgentConfig,
     emit: Optional[Callable[[str, str, Optional[Dict[str, Any]]], None]] = None,
@@ -706,4 +967,17 @@ def run_pipeline(
 ) -> PipelineState:
     graph = build_pipeline(config, emit)
     app = graph.compile()
-    return app.invoke(_init_state(inputs, config), config={"recursion_limit": 100})
+    started_at = datetime.utcnow().isoformat()
+    state = app.invoke(_init_state(inputs, config), config={"recursion_limit": 100})
+    # Saved on every run with a cache dir so a later incremental run has a baseline.
+    if state.get("composed_text"):
+        RunSnapshotStore(config.cache_path("snapshots")).save(
+            RunSnapshot(
+                key=snapshot_key(inputs),
+                created_at=started_at,
+                sources=state.get("sources", []),
+                evidence=state.get("evidence", []),
+                drafts=state.get("drafts", []),
+            )
+        )
+    return state
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List
 
 from .schemas import PipelineInputs
+from .tools.arxiv_client import extract_arxiv_ids
 
 
 def parse_prompt(prompt: str) -> PipelineInputs:
@@ -24,6 +25,7 @@ def parse_prompt(prompt: str) -> PipelineInputs:
         raw_prompt=prompt,
         topic="AR 기술동향 보고서",
         outline=[],
+        arxiv_ids=extract_arxiv_ids(prompt),
     )
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -94,6 +94,8 @@ class EvidenceItem(BaseModel):
     locator: Optional[str] = None
     relevance_score: float = 0.0
     chapter_id: Optional[str] = None
+    # Character spans of the quoted sentences within the source abstract.
+    offsets: List[Tuple[int, int]] = Field(default_factory=list)
 
 
 class DraftNode(BaseModel):
@@ -102,6 +104,7 @@ class DraftNode(BaseModel):
     text: str
     claim_ids: List[str] = Field(default_factory=list)
     citation_source_ids: List[str] = Field(default_factory=list)
+    evidence_hash: str = ""
 
 
 class AuditResult(BaseModel):
@@ -118,3 +121,12 @@ class PipelineInputs(BaseModel):
     template_id: str = "ar-report-template"
     language: str = "ko"
     style: str = "technical"
+    arxiv_ids: List[str] = Field(default_factory=list)
+
+
+class RunSnapshot(BaseModel):
+    key: str
+    created_at: str
+    sources: List[SourceRecord] = Field(default_factory=list)
+    evidence: List[EvidenceItem] = Field(default_factory=list)
+    drafts: List[DraftNode] = Field(default_factory=list)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 from typing_extensions import TypedDict
 
-from .schemas import AuditResult, DraftNode, EvidenceItem, PipelineInputs, SourceRecord
+from .schemas import AuditResult, DraftNode, EvidenceItem, PipelineInputs, RunSnapshot, SourceRecord
 
 
 class PipelineState(TypedDict, total=False):
@@ -25,3 +25,13 @@ class PipelineState(TypedDict, total=False):
     qa_route: Optional[str]
     retrieval_stats: Dict[str, int]
     evidence_stats: Dict[str, int]
+    query_cache: Dict[str, List[dict]]
+    extraction_cache: Dict[str, dict]
+    draft_cache: Dict[str, dict]
+    source_relevance: Dict[str, Dict[str, float]]
+    streamed_drafts: Dict[str, DraftNode]
+    rewrite_chapters: Optional[List[str]]
+    audit_passed: Dict[str, str]
+    qa_passed: Dict[str, str]
+    previous_run: Optional[RunSnapshot]
+    submitted_after: Optional[str]
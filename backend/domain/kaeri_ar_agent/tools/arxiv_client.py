@@ -1,24 +1,48 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+from datetime import datetime, timezone
+import re
+import time
+from typing import Dict, Iterable, List, Optional
 
 import feedparser
 import httpx
 
 
-def query_arxiv(
-    base_url: str,
-    query: str,
+ARXIV_ID_PATTERN = re.compile(
+    r"(?:arxiv:\s*|arxiv\.org/(?:abs|pdf)/|S-ARXIV-)?"
+    r"\b(\d{4}\.\d{4,5}(?:v\d+)?|[a-z-]+(?:\.[A-Z]{2})?/\d{7}(?:v\d+)?)\b",
+    re.IGNORECASE,
+)
+ID_LIST_BATCH_SIZE = 100
+
+
+def _request_params(
     max_results: int,
+    search_query: Optional[str] = None,
+    id_list: Optional[List[str]] = None,
+    sort_by: Optional[str] = None,
+) -> Dict[str, object]:
+    params: Dict[str, object] = {"start": 0, "max_results": max_results}
+    if search_query is not None:
+        params["search_query"] = search_query
+    if id_list is not None:
+        params["id_list"] = ",".join(id_list)
+    if sort_by:
+        params["sortBy"] = sort_by
+        params["sortOrder"] = "descending"
+    return params
+
+
+def _get_feed(
+    base_url: str,
+    params: Dict[str, object],
     timeout_s: float,
-    retry_count: int = 2,
-    retry_backoff_s: float = 1.0,
+    retry_count: int,
+    retry_backoff_s: float,
 ) -> str:
-    params = {
-        "search_query": query,
-        "start": 0,
-        "max_results": max_results,
-    }
+    """One API request (``search_query`` or ``id_list``) with linear-backoff retries."""
     last_error: Optional[Exception] = None
     for attempt in range(retry_count + 1):
         try:
@@ -33,47 +57,143 @@ def query_arxiv(
         except Exception as exc:
             last_error = exc
             if attempt < retry_count:
-                import time
-
                 time.sleep(retry_backoff_s * (attempt + 1))
     if last_error:
         raise last_error
     return ""
 
 
-async def query_arxiv_async(
+async def _aget_feed(
+    client: httpx.AsyncClient,
     base_url: str,
-    query: str,
-    max_results: int,
-    timeout_s: float,
-    retry_count: int = 2,
-    retry_backoff_s: float = 1.0,
+    params: Dict[str, object],
+    retry_count: int,
+    retry_backoff_s: float,
 ) -> str:
-    params = {
-        "search_query": query,
-        "start": 0,
-        "max_results": max_results,
-    }
     last_error: Optional[Exception] = None
     for attempt in range(retry_count + 1):
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=timeout_s) as client:
-                response = await client.get(base_url, params=params)
+            response = await client.get(base_url, params=params)
             response.raise_for_status()
             return response.text
         except Exception as exc:
             last_error = exc
             if attempt < retry_count:
-                import asyncio
-
                 await asyncio.sleep(retry_backoff_s * (attempt + 1))
     if last_error:
         raise last_error
     return ""
 
 
+def query_arxiv(
+    base_url: str,
+    query: str,
+    max_results: int,
+    timeout_s: float,
+    retry_count: int = 2,
+    retry_backoff_s: float = 1.0,
+    sort_by: Optional[str] = None,
+) -> str:
+    params = _request_params(max_results, search_query=query, sort_by=sort_by)
+    return _get_feed(base_url, params, timeout_s, retry_count, retry_backoff_s)
+
+
+async def query_arxiv_async(
+    base_url: str,
+    query: str,
+    max_results: int,
+    timeout_s: float,
+    retry_count: int = 2,
+    retry_backoff_s: float = 1.0,
+    sort_by: Optional[str] = None,
+) -> str:
+    params = _request_params(max_results, search_query=query, sort_by=sort_by)
+    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout_s) as client:
+        return await _aget_feed(client, base_url, params, retry_count, retry_backoff_s)
+
+
+def submitted_since_query(query: str, since: str, until: Optional[str] = None) -> str:
+    """Restrict a search_query to papers submitted on or after ``since`` (YYYY-MM-DD)."""
+    start = since.replace("-", "")[:8]
+    end = (until or datetime.now(timezone.utc).strftime("%Y-%m-%d")).replace("-", "")[:8]
+    return f"({query}) AND submittedDate:[{start}0000 TO {end}2359]"
+
+
+def normalize_arxiv_id(value: str) -> Optional[str]:
+    match = ARXIV_ID_PATTERN.search(value.strip())
+    return match.group(1) if match else None
+
+
+def extract_arxiv_ids(text: str) -> List[str]:
+    """Return arXiv IDs mentioned in free text (bare, ``arXiv:`` or abs/pdf URLs), in order."""
+    ids: List[str] = []
+    for match in ARXIV_ID_PATTERN.finditer(text):
+        # Old-style IDs are only trusted with an explicit prefix; bare "a/1234567" is too loose.
+        if "/" in match.group(1) and match.group(0) == match.group(1):
+            continue
+        if match.group(1) not in ids:
+            ids.append(match.group(1))
+    return ids
+
+
+def _id_chunks(arxiv_ids: Iterable[str], batch_size: int) -> List[List[str]]:
+    unique: List[str] = []
+    for value in arxiv_ids:
+        arxiv_id = normalize_arxiv_id(value)
+        if arxiv_id and arxiv_id not in unique:
+            unique.append(arxiv_id)
+    size = max(1, batch_size)
+    return [unique[start : start + size] for start in range(0, len(unique), size)]
+
+
+def _parse_id_list_feed(feed_xml: str) -> List[dict]:
+    # Unknown or malformed IDs come back as a single "Error" entry under api/errors.
+    return [entry for entry in parse_arxiv_feed(feed_xml) if "#" not in entry["identifiers"]["arxiv_id"]]
+
+
+def fetch_by_ids(
+    base_url: str,
+    arxiv_ids: Iterable[str],
+    timeout_s: float,
+    retry_count: int = 2,
+    retry_backoff_s: float = 1.0,
+    batch_size: int = ID_LIST_BATCH_SIZE,
+) -> List[dict]:
+    """Fetch metadata for known arXiv IDs with one ``id_list`` request per batch."""
+    results: List[dict] = []
+    for chunk in _id_chunks(arxiv_ids, batch_size):
+        params = _request_params(len(chunk), id_list=chunk)
+        results.extend(_parse_id_list_feed(_get_feed(base_url, params, timeout_s, retry_count, retry_backoff_s)))
+    return results
+
+
+async def fetch_by_ids_async(
+    base_url: str,
+    arxiv_ids: Iterable[str],
+    timeout_s: float,
+    retry_count: int = 2,
+    retry_backoff_s: float = 1.0,
+    batch_size: int = ID_LIST_BATCH_SIZE,
+    max_concurrency: int = 1,
+) -> List[dict]:
+    """Async ``fetch_by_ids``; at most ``max_concurrency`` batches are in flight at once."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _fetch(client: httpx.AsyncClient, chunk: List[str]) -> List[dict]:
+        params = _request_params(len(chunk), id_list=chunk)
+        async with semaphore:
+            feed_xml = await _aget_feed(client, base_url, params, retry_count, retry_backoff_s)
+        return _parse_id_list_feed(feed_xml)
+
+    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout_s) as client:
+        batches = await asyncio.gather(*(_fetch(client, chunk) for chunk in _id_chunks(arxiv_ids, batch_size)))
+    return [entry for batch in batches for entry in batch]
+
+
 def parse_arxiv_feed(feed_xml: str) -> List[dict]:
     feed = feedparser.parse(feed_xml)
+    # Live API records carry their fetch time; offline corpus/snapshot records do not.
+    retrieved_at = datetime.utcnow().isoformat()
     results: List[dict] = []
     for entry in feed.entries:
         arxiv_id = entry.get("id", "").split("/")[-1]
@@ -90,6 +210,7 @@ def parse_arxiv_feed(feed_xml: str) -> List[dict]:
                 "trust_score": 0.6,
                 "source_type": "paper",
                 "identifiers": {"arxiv_id": arxiv_id, "doi": entry.get("arxiv_doi")},
+                "retrieved_at": retrieved_at,
             }
         )
     return results
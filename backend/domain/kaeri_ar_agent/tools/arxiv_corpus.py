@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import json
+import math
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .arxiv_client import normalize_arxiv_id
+from .embedding_store import EmbeddingStore, content_hash, embedding_text
+
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+# arXiv search_query field prefixes and boolean operators carry no lexical signal.
+QUERY_SYNTAX = {"all", "ti", "abs", "au", "cat", "co", "jr", "rn", "id", "and", "or", "andnot"}
+STOPWORDS = {
+    "a", "an", "the", "of", "for", "in", "on", "to", "and", "or", "with", "by", "from", "at",
+    "as", "is", "are", "be", "we", "this", "that", "these", "our", "via", "using", "arxiv",
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _query_tokens(query: str) -> List[str]:
+    tokens = TOKEN_PATTERN.findall(query.lower())
+    return [token for token in tokens if token not in STOPWORDS and token not in QUERY_SYNTAX]
+
+
+def _clean(text: Optional[str]) -> str:
+    return " ".join((text or "").split())
+
+
+def _snapshot_date(entry: dict) -> Optional[str]:
+    """Submission date (YYYY-MM-DD) of the first version, else the snapshot's update date."""
+    versions = entry.get("versions") or []
+    if versions and isinstance(versions[0], dict) and versions[0].get("created"):
+        try:
+            return parsedate_to_datetime(versions[0]["created"]).date().isoformat()
+        except (TypeError, ValueError):
+            pass
+    update_date = str(entry.get("update_date") or "")[:10]
+    return update_date if re.fullmatch(r"\d{4}-\d{2}-\d{2}", update_date) else None
+
+
+def _snapshot_year(entry: dict) -> Optional[int]:
+    date = _snapshot_date(entry)
+    if date:
+        return int(date[:4])
+    update_date = str(entry.get("update_date") or "")
+    return int(update_date[:4]) if update_date[:4].isdigit() else None
+
+
+def submitted_on_or_after(record: dict, since: str) -> bool:
+    """Compare the record's full submission date with ``since`` (YYYY-MM-DD).
+
+    Records built before ``published`` was stored only carry the year and are
+    compared by year.
+    """
+    published = str(record.get("published") or "")
+    if published:
+        return published[:10] >= since[:10]
+    return (record.get("year") or 0) >= int(since[:4])
+
+
+def _snapshot_authors(entry: dict) -> List[str]:
+    parsed = entry.get("authors_parsed")
+    if isinstance(parsed, list) and parsed:
+        names = []
+        for parts in parsed:
+            last, first = (list(parts) + ["", ""])[:2]
+            names.append(" ".join(part for part in [first, last] if part).strip())
+        return [name for name in names if name]
+    raw = _clean(entry.get("authors"))
+    return [name.strip() for name in re.split(r",| and ", raw) if name.strip()]
+
+
+def snapshot_entry_to_record(entry: dict) -> dict:
+    """Map one arXiv metadata snapshot line onto the ``parse_arxiv_feed`` record shape."""
+    if entry.get("source_id"):
+        return entry
+    base_id = str(entry.get("id") or "").strip()
+    versions = entry.get("versions") or []
+    latest = versions[-1].get("version", "") if versions and isinstance(versions[-1], dict) else ""
+    arxiv_id = f"{base_id}{latest}" if base_id else ""
+    return {
+        "source_id": f"S-ARXIV-{arxiv_id}" if arxiv_id else "S-ARXIV-UNKNOWN",
+        "title": _clean(entry.get("title")),
+        "authors": _snapshot_authors(entry),
+        "year": _snapshot_year(entry),
+        "published": _snapshot_date(entry),
+        "venue": "arXiv",
+        "doi": entry.get("doi"),
+        "url": f"http://arxiv.org/abs/{arxiv_id}" if arxiv_id else None,
+        "abstract": _clean(entry.get("abstract")) or None,
+        "trust_score": 0.6,
+        "source_type": "paper",
+        "identifiers": {"arxiv_id": arxiv_id, "doi": entry.get("doi")},
+    }
+
+
+def read_snapshot(path: str) -> Iterable[dict]:
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                yield snapshot_entry_to_record(entry)
+
+
+class ArxivCorpus:
+    """Offline arXiv metadata index: BM25 over title+abstract plus an optional dense index.
+
+    Postings are stored CSR-style (``offsets`` into ``doc_ids``/``tfs``) so the index
+    can be saved with ``np.savez`` and scored with vectorized numpy operations.
+    """
+
+    def __init__(
+        self,
+        records: List[dict],
+        vocab: Dict[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+    ) -> None:
+        self.records = records
+        self.vocab = vocab
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.avg_len = float(doc_len.mean()) if len(doc_len) else 0.0
+        self._keys: Optional[List[str]] = None
+        self._dense_rows: Optional[np.ndarray] = None
+        self._dense_matrix: Optional[np.ndarray] = None
+        self._dense_size = -1
+        self._by_arxiv_id: Optional[Dict[str, int]] = None
+        self._since_masks: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def build(cls, records: Iterable[dict]) -> "ArxivCorpus":
+        kept: List[dict] = []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths: List[int] = []
+        seen = set()
+        for record in records:
+            if record["source_id"] in seen:
+                continue
+            seen.add(record["source_id"])
+            doc = len(kept)
+            kept.append(record)
+            tokens = tokenize(f"{record.get('title', '')} {record.get('abstract') or ''}")
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc, count))
+        vocab = {term: index for index, term in enumerate(sorted(postings))}
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        doc_ids: List[int] = []
+        tfs: List[int] = []
+        for term, index in vocab.items():
+            entries = postings[term]
+            offsets[index + 1] = offsets[index] + len(entries)
+            doc_ids.extend(doc for doc, _ in entries)
+            tfs.extend(count for _, count in entries)
+        return cls(
+            kept,
+            vocab,
+            offsets,
+            np.asarray(doc_ids, dtype=np.int32),
+            np.asarray(tfs, dtype=np.float32),
+            np.asarray(lengths, dtype=np.float32),
+        )
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "ArxivCorpus":
+        return cls.build(read_snapshot(path))
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "records.jsonl"), "w", encoding="utf-8") as handle:
+            for record in self.records:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        with open(os.path.join(directory, "vocab.json"), "w", encoding="utf-8") as handle:
+            json.dump(sorted(self.vocab, key=self.vocab.__getitem__), handle, ensure_ascii=False)
+        np.savez(
+            os.path.join(directory, "bm25.npz"),
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            tfs=self.tfs,
+            doc_len=self.doc_len,
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> "ArxivCorpus":
+        with open(os.path.join(directory, "records.jsonl"), "r", encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        with open(os.path.join(directory, "vocab.json"), "r", encoding="utf-8") as handle:
+            vocab = {term: index for index, term in enumerate(json.load(handle))}
+        arrays = np.load(os.path.join(directory, "bm25.npz"))
+        return cls(
+            records,
+            vocab,
+            arrays["offsets"],
+            arrays["doc_ids"],
+            arrays["tfs"],
+            arrays["doc_len"],
+        )
+
+    def get_by_ids(self, arxiv_ids: Iterable[str]) -> List[dict]:
+        """Records for known arXiv IDs; unversioned IDs match the indexed version."""
+        if self._by_arxiv_id is None:
+            self._by_arxiv_id = {}
+            for doc, record in enumerate(self.records):
+                arxiv_id = (record.get("identifiers") or {}).get("arxiv_id") or ""
+                self._by_arxiv_id[arxiv_id] = doc
+                self._by_arxiv_id.setdefault(re.sub(r"v\d+$", "", arxiv_id), doc)
+        docs: List[int] = []
+        for value in arxiv_ids:
+            doc = self._by_arxiv_id.get(normalize_arxiv_id(value) or "")
+            if doc is not None and doc not in docs:
+                docs.append(doc)
+        return [dict(self.records[doc]) for doc in docs]
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.records), dtype=np.float32)
+        if not self.records:
+            return scores
+        total = len(self.records)
+        for term in set(_query_tokens(query)):
+            index = self.vocab.get(term)
+            if index is None:
+                continue
+            start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            idf = math.log(1.0 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.doc_len[docs] / max(self.avg_len, 1.0))
+            scores[docs] += idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return scores
+
+    def _since_mask(self, submitted_after: str) -> np.ndarray:
+        """Documents submitted on or after ``submitted_after``, cached per date."""
+        mask = self._since_masks.get(submitted_after)
+        if mask is None:
+            mask = np.fromiter(
+                (submitted_on_or_after(record, submitted_after) for record in self.records),
+                dtype=bool,
+                count=len(self.records),
+            )
+            self._since_masks[submitted_after] = mask
+        return mask
+
+    def _refresh_dense(self, store: EmbeddingStore) -> None:
+        # Keyed on document rows: query embeddings land in the same store and must
+        # not force a rescan of every corpus key.
+        if self._dense_size == store.document_rows:
+            return
+        if self._keys is None:
+            self._keys = [
+                content_hash(embedding_text(record.get("title", ""), record.get("abstract")))
+                for record in self.records
+            ]
+        cached = store.lookup(self._keys)
+        rows = [doc for doc, key in enumerate(self._keys) if key in cached]
+        if rows:
+            matrix = np.stack([cached[self._keys[doc]] for doc in rows])
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._dense_matrix = matrix / np.where(norms == 0.0, 1.0, norms)
+        else:
+            self._dense_matrix = None
+        self._dense_rows = np.asarray(rows, dtype=np.int64)
+        self._dense_size = store.document_rows
+
+    def dense_scores(self, query_vector: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine scores for documents whose embeddings are already in the cache."""
+        if self._dense_matrix is None or self._dense_rows is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return self._dense_rows, self._dense_matrix @ (query / norm)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        query_vector: Optional[np.ndarray] = None,
+        submitted_after: Optional[str] = None,
+    ) -> List[dict]:
+        """Hybrid BM25 + dense search fused by reciprocal rank.
+
+        ``submitted_after`` (YYYY-MM-DD) drops older papers before ranking, so the
+        ``limit`` results are all recent ones.
+        """
+        if limit <= 0 or not self.records:
+            return []
+        depth = limit * 4
+        mask = self._since_mask(submitted_after) if submitted_after else None
+        bm25 = self.bm25_scores(query)
+        if mask is not None:
+            bm25[~mask] = 0.0
+        fused: Dict[int, float] = {}
+        for rank, doc in enumerate(_top_indices(bm25, depth)):
+            if bm25[doc] > 0.0:
+                fused[int(doc)] = fused.get(int(doc), 0.0) + 1.0 / (RRF_K + rank + 1)
+        if query_vector is not None:
+            rows, dense = self.dense_scores(query_vector)
+            if mask is not None:
+                recent = mask[rows]
+                rows, dense = rows[recent], dense[recent]
+            for rank, position in enumerate(_top_indices(dense, depth)):
+                doc = int(rows[position])
+                fused[doc] = fused.get(doc, 0.0) + 1.0 / (RRF_K + rank + 1)
+        ranked = sorted(fused.items(), key=lambda pair: (-pair[1], pair[0]))[:limit]
+        return [dict(self.records[doc]) for doc, _ in ranked]
+
+    async def asearch(
+        self,
+        query: str,
+        limit: int,
+        store: Optional[EmbeddingStore] = None,
+        submitted_after: Optional[str] = None,
+    ) -> List[dict]:
+        query_vector = None
+        if store is not None:
+            self._refresh_dense(store)
+            if self._dense_matrix is not None:
+                query_vector = await store.aembed_query(query)
+        return self.search(query, limit, query_vector=query_vector, submitted_after=submitted_after)
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@lru_cache(maxsize=4)
+def load_arxiv_corpus(path: str) -> ArxivCorpus:
+    if os.path.isdir(path):
+        return ArxivCorpus.load(path)
+    return ArxivCorpus.from_jsonl(path)
+
+
+_LOAD_LOCK = threading.Lock()
+
+
+async def aload_arxiv_corpus(path: str) -> ArxivCorpus:
+    """``load_arxiv_corpus`` off the event loop; indexing a raw snapshot can take minutes.
+
+    The lock lets concurrent first callers wait for one build instead of each starting their own.
+    """
+
+    def _load() -> ArxivCorpus:
+        with _LOAD_LOCK:
+            return load_arxiv_corpus(path)
+
+    return await asyncio.to_thread(_load)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build an offline arXiv metadata index.")
+    parser.add_argument("snapshot", help="arXiv metadata snapshot (JSONL)")
+    parser.add_argument("output", help="index directory to write")
+    args = parser.parse_args()
+    corpus = ArxivCorpus.from_jsonl(args.snapshot)
+    corpus.save(args.output)
+    print(f"indexed {len(corpus)} records, {len(corpus.vocab)} terms -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import re
+from typing import List, Set
+
+
+CITATION_GROUP = re.compile(r"\(([^()]*)\)")
+ID_SHAPED = re.compile(r"^(?:doi:\s*10\.\d{4,9}/\S+|arxiv:\s*\S+|S-ARXIV-\S+)$", re.IGNORECASE)
+
+
+def citation_key(source_id: str) -> str:
+    """Comparable form of a cited ID (``S-ARXIV-xv1``, ``arXiv:xv1`` and ``arxiv:x`` agree)."""
+    key = source_id.strip().rstrip(".").lower()
+    if key.startswith("s-arxiv-"):
+        key = "arxiv:" + key[len("s-arxiv-"):]
+    key = re.sub(r"^(doi|arxiv):\s+", r"\1:", key)
+    if key.startswith("arxiv:"):
+        key = re.sub(r"v\d+$", "", key)
+    return key
+
+
+def parse_citations(text: str, known: Set[str]) -> List[str]:
+    """Citation keys found in ``(id, id)`` groups: known source IDs or ID-shaped tokens."""
+    cited: List[str] = []
+    for group in CITATION_GROUP.findall(text):
+        for token in re.split(r"[,;]", group):
+            token = token.strip()
+            if not token:
+                continue
+            key = citation_key(token)
+            if (key in known or ID_SHAPED.match(token)) and key not in cited:
+                cited.append(key)
+    return cited
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from ..schemas import DraftNode, EvidenceItem
+from .keyed_cache import KeyedFileCache, text_hash
+
+
+def draft_key(
+    chapter: str,
+    topic: str,
+    scope: Optional[str],
+    exclusions: List[str],
+    items: List[EvidenceItem],
+    system_prompt: str,
+    model: str,
+    temperature: Optional[float],
+) -> str:
+    evidence = sorted(f"{item.claim_id}|{item.source_id}|{text_hash(item.snippet)}" for item in items)
+    parts = [
+        " ".join(chapter.split()),
+        topic.strip(),
+        (scope or "").strip(),
+        "\x1f".join(exclusions),
+        "\x1f".join(evidence),
+        text_hash(system_prompt),
+        model,
+        "" if temperature is None else repr(float(temperature)),
+    ]
+    return text_hash("\x00".join(parts))
+
+
+class DraftCache(KeyedFileCache):
+    """Cache of writer drafts keyed by the chapter's request and evidence fingerprint.
+
+    A chapter whose topic, scope, exclusions, prompt evidence, writer prompt and model
+    are unchanged gets its earlier ``DraftNode`` back without a writer call.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_entries: int = 0,
+        model: str = "",
+        temperature: Optional[float] = None,
+        run_entries: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        super().__init__(root=root, max_entries=max_entries, run_entries=run_entries)
+        self.model = model
+        self.temperature = temperature
+
+    def key(
+        self,
+        chapter: str,
+        topic: str,
+        scope: Optional[str],
+        exclusions: List[str],
+        items: List[EvidenceItem],
+        system_prompt: str,
+    ) -> str:
+        return draft_key(chapter, topic, scope, exclusions, items, system_prompt, self.model, self.temperature)
+
+    def get(self, key: str) -> Optional[DraftNode]:
+        payload = self.lookup(key)
+        if payload is None:
+            return None
+        try:
+            return DraftNode.model_validate(payload.get("draft"))
+        except ValueError:
+            return None
+
+    def put(self, key: str, draft: DraftNode) -> None:
+        self.store(key, {"draft": draft.model_dump()})
+
+    def stats(self) -> Dict[str, int]:
+        return {"draft_cache_hits": self.hits, "draft_cache_misses": self.misses}
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within one process are serialized.
+    fcntl = None
+
+
+SUPPORTED_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+_STORE_LOCKS: Dict[str, threading.Lock] = {}
+_STORE_LOCKS_GUARD = threading.Lock()
+
+
+def content_hash(text: str, kind: str = "document") -> str:
+    return hashlib.sha256(f"{kind}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_text(title: str, abstract: Optional[str]) -> str:
+    return f"{title}\n{abstract or ''}".strip()
+
+
+def _model_slug(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model).strip("_") or "default"
+
+
+def _store_lock(path: str) -> threading.Lock:
+    with _STORE_LOCKS_GUARD:
+        lock = _STORE_LOCKS.get(path)
+        if lock is None:
+            lock = threading.Lock()
+            _STORE_LOCKS[path] = lock
+        return lock
+
+
+@contextmanager
+def _exclusive(path: str) -> Iterator[None]:
+    """Hold the per-directory thread lock and, where available, an flock on ``path/.lock``."""
+    with _store_lock(path):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(path, ".lock"), "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """Embedding cache keyed by (model, content hash) over a memory-mapped matrix.
+
+    Vectors are appended to ``vectors.bin`` as a row-major matrix of ``dtype``;
+    ``keys.log`` records one ``hash<TAB>kind`` line per row in the same order and
+    ``index.json`` only holds the model and dimension. Appends take an exclusive
+    lock on the directory (threads and, on POSIX, other processes) and first read
+    the log lines other writers added since the last read, so concurrent runs
+    sharing a cache directory do not overwrite each other's rows and a put costs
+    O(new rows), not O(store size). When ``root`` is None the store only caches
+    in memory for the lifetime of the instance.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        model: str,
+        root: Optional[str] = None,
+        dtype: str = "float32",
+    ) -> None:
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.embeddings = embeddings
+        self.model = model
+        self.dtype = SUPPORTED_DTYPES[dtype]
+        self.hits = 0
+        self.misses = 0
+        self._dim: Optional[int] = None
+        self._documents = 0
+        self._index: Dict[str, int] = {}
+        self._rows_logged = 0
+        self._log_offset = 0
+        self._memory: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._dir: Optional[str] = None
+        if root:
+            self._dir = os.path.join(root, _model_slug(model), dtype)
+            os.makedirs(self._dir, exist_ok=True)
+            self._load_index()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self._dir or "", "index.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._dir or "", "vectors.bin")
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self._dir or "", "keys.log")
+
+    def __len__(self) -> int:
+        return len(self._index) if self._dir else len(self._memory)
+
+    @property
+    def document_rows(self) -> int:
+        """Number of document vectors stored; query vectors do not change it."""
+        return self._documents
+
+    def _reset(self, dim: Optional[int]) -> None:
+        self._dim = dim
+        self._index = {}
+        self._documents = 0
+        self._rows_logged = 0
+        self._log_offset = 0
+        self._matrix = None
+
+    def _load_index(self) -> None:
+        """Catch up with the header and the key log lines appended since the last read."""
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as handle:
+                header = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if header.get("model") != self.model or not header.get("dim"):
+            return
+        dim = int(header["dim"])
+        try:
+            log_size = os.path.getsize(self._log_path)
+        except OSError:
+            log_size = 0
+        if dim != self._dim or log_size < self._log_offset:
+            # First read, or another process started the store over.
+            self._reset(dim)
+        row_bytes = dim * np.dtype(self.dtype).itemsize
+        try:
+            available = os.path.getsize(self._vectors_path) // row_bytes
+        except OSError:
+            available = 0
+        try:
+            with open(self._log_path, "rb") as handle:
+                handle.seek(self._log_offset)
+                tail = handle.read()
+        except OSError:
+            return
+        # A line without its newline, or naming a row past the end of the matrix,
+        # belongs to an interrupted append; the next put truncates it away.
+        for line in tail.split(b"\n")[:-1]:
+            if self._rows_logged >= available:
+                break
+            key, _, kind = line.decode("utf-8").partition("\t")
+            self._index.setdefault(key, self._rows_logged)
+            if kind == "document":
+                self._documents += 1
+            self._rows_logged += 1
+            self._log_offset += len(line) + 1
+
+    def _write_header(self) -> None:
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"model": self.model, "dim": self._dim}, handle)
+        os.replace(tmp_path, self._index_path)
+
+    def _rows(self, keys: List[str]) -> np.ndarray:
+        if self._matrix is None or self._matrix.shape[0] < self._rows_logged:
+            self._matrix = np.memmap(
+                self._vectors_path,
+                dtype=self.dtype,
+                mode="r",
+                shape=(self._rows_logged, self._dim or 0),
+            )
+        return np.asarray(self._matrix[[self._index[key] for key in keys]], dtype=np.float32)
+
+    def lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not self._dir:
+            return {key: self._memory[key] for key in keys if key in self._memory}
+        found = [key for key in keys if key in self._index]
+        if not found:
+            return {}
+        return dict(zip(found, self._rows(found)))
+
+    def put(self, keys: List[str], vectors: np.ndarray, kind: str = "document") -> None:
+        if not keys:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not self._dir:
+            for key, vector in zip(keys, vectors):
+                if kind == "document" and key not in self._memory:
+                    self._documents += 1
+                self._memory[key] = vector
+            return
+        with _exclusive(self._dir):
+            self._load_index()
+            dim = int(vectors.shape[1])
+            if self._dim != dim:
+                # New store, or the model behind this name changed its output size.
+                self._reset(dim)
+                open(self._vectors_path, "wb").close()
+                open(self._log_path, "wb").close()
+                self._write_header()
+            fresh = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._index]
+            if not fresh:
+                return
+            start = self._rows_logged
+            with open(self._vectors_path, "ab") as handle:
+                handle.truncate(start * dim * np.dtype(self.dtype).itemsize)
+                handle.write(np.stack([vector for _, vector in fresh]).astype(self.dtype).tobytes())
+            # The log is written after the vectors so every logged row is on disk.
+            lines = "".join(f"{key}\t{kind}\n" for key, _ in fresh).encode("utf-8")
+            with open(self._log_path, "ab") as handle:
+                handle.truncate(self._log_offset)
+                handle.write(lines)
+            for offset, (key, _) in enumerate(fresh):
+                self._index[key] = start + offset
+            if kind == "document":
+                self._documents += len(fresh)
+            self._rows_logged += len(fresh)
+            self._log_offset += len(lines)
+            self._matrix = None
+
+    async def _aembed(self, texts: List[str], kind: str) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        keys = [content_hash(text, kind) for text in texts]
+        cached = self.lookup(list(dict.fromkeys(keys)))
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            fresh = np.asarray(vectors, dtype=np.float32)
+            self.put(list(missing.keys()), fresh, kind)
+            cached.update(zip(missing.keys(), fresh))
+        return np.stack([cached[key] for key in keys]).astype(np.float32)
+
+    async def aembed_documents(self, texts: List[str]) -> np.ndarray:
+        return await self._aembed(texts, "document")
+
+    async def aembed_queries(self, texts: List[str]) -> np.ndarray:
+        return await self._aembed(texts, "query")
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        return (await self._aembed([text], "query"))[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"embedding_cache_hits": self.hits, "embedding_cache_misses": self.misses}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from .keyed_cache import KeyedFileCache, text_hash
+
+
+def extraction_key(
+    abstract: str,
+    chapter: str,
+    system_prompt: str,
+    model: str,
+    temperature: Optional[float],
+) -> str:
+    parts = [
+        text_hash(abstract.strip()),
+        " ".join(chapter.split()),
+        text_hash(system_prompt),
+        model,
+        "" if temperature is None else repr(float(temperature)),
+    ]
+    return text_hash("\x00".join(parts))
+
+
+class ExtractionCache(KeyedFileCache):
+    """Cache of parsed extractor outputs keyed by (abstract, chapter, prompt, model, temperature).
+
+    Entries hold the parsed ``(snippet, locator)``; a ``None`` snippet records that the
+    model judged the abstract irrelevant to the chapter. See ``KeyedFileCache`` for the
+    run-scoped and on-disk layers.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_entries: int = 0,
+        model: str = "",
+        temperature: Optional[float] = None,
+        run_entries: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        super().__init__(root=root, max_entries=max_entries, run_entries=run_entries)
+        self.model = model
+        self.temperature = temperature
+
+    def key(self, abstract: str, chapter: str, system_prompt: str) -> str:
+        return extraction_key(abstract, chapter, system_prompt, self.model, self.temperature)
+
+    def get(self, abstract: str, chapter: str, system_prompt: str) -> Optional[Tuple[Any, Any]]:
+        payload = self.lookup(self.key(abstract, chapter, system_prompt))
+        if payload is None:
+            return None
+        return payload.get("snippet"), payload.get("locator")
+
+    def put(self, abstract: str, chapter: str, system_prompt: str, snippet: Any, locator: Any) -> None:
+        self.store(self.key(abstract, chapter, system_prompt), {"snippet": snippet, "locator": locator})
+
+    def stats(self) -> Dict[str, int]:
+        return {"extraction_cache_hits": self.hits, "extraction_cache_misses": self.misses}
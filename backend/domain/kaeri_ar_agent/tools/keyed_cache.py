@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class KeyedFileCache:
+    """Two-layer cache of JSON payloads keyed by a content hash.
+
+    ``run_entries`` is the run-scoped layer kept in pipeline state. When ``root`` is
+    set, entries are also persisted as one JSON file per key; reads refresh the file
+    mtime and the least recently used files are evicted once more than
+    ``max_entries`` are stored.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_entries: int = 0,
+        run_entries: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self.run_entries: Dict[str, dict] = dict(run_entries or {})
+        self.hits = 0
+        self.misses = 0
+        self._stored: Optional[int] = None
+
+    @property
+    def persistent(self) -> bool:
+        return bool(self.root) and self.max_entries > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root or "", f"{key}.json")
+
+    def lookup(self, key: str) -> Optional[dict]:
+        payload = self.run_entries.get(key)
+        if payload is None and self.persistent:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+                os.utime(path)
+            except (OSError, ValueError):
+                payload = None
+            if not isinstance(payload, dict) or payload.get("key") != key:
+                payload = None
+            if payload is not None:
+                self.run_entries[key] = payload
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def store(self, key: str, payload: dict) -> None:
+        payload = {**payload, "key": key, "stored_at": time.time()}
+        self.run_entries[key] = payload
+        if not self.persistent:
+            return
+        os.makedirs(self.root or "", exist_ok=True)
+        path = self._path(key)
+        existed = os.path.exists(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        if self._stored is None:
+            self._stored = len(self._entry_files())
+        elif not existed:
+            self._stored += 1
+        if self._stored > self.max_entries:
+            self._evict()
+
+    def _entry_files(self) -> List[str]:
+        try:
+            names = os.listdir(self.root or "")
+        except OSError:
+            return []
+        return [os.path.join(self.root or "", name) for name in names if name.endswith(".json")]
+
+    def _evict(self) -> None:
+        # Trim to 90% of the budget so eviction does not rescan on every put.
+        files = []
+        for path in self._entry_files():
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        files.sort()
+        keep = int(self.max_entries * 0.9)
+        for _, path in files[: max(0, len(files) - keep)]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        self._stored = min(len(files), keep)
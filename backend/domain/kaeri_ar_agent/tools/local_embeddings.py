@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from functools import lru_cache
+import hashlib
+import math
+from typing import Any, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .arxiv_corpus import tokenize
+
+
+def _features(text: str) -> Counter:
+    tokens = tokenize(text)
+    bigrams = [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+    return Counter(tokens + bigrams)
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dim, 1.0 if (digest >> 63) & 1 else -1.0
+
+
+class HashingEmbeddings(Embeddings):
+    """Local CPU embedder: signed feature hashing of unigrams and bigrams.
+
+    Term frequencies are sublinear (``1 + log tf``) and rows are L2-normalized, so
+    cosine similarity behaves like a TF weighted lexical overlap. Deterministic and
+    dependency free; no network or model download is involved.
+    """
+
+    def __init__(self, dim: int = 1024) -> None:
+        if dim <= 0:
+            raise ValueError("Hashing embedding dimension must be positive.")
+        self.dim = dim
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in _features(text).items():
+                index, sign = _bucket(feature, self.dim)
+                matrix[row, index] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0.0, 1.0, norms)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_matrix([text])[0].tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """Small local transformer embedder (requires the optional ``sentence-transformers``)."""
+
+    def __init__(self, model: str, batch_size: int = 32) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise ValueError(
+                "EMBEDDING_BACKEND=sentence-transformers requires `pip install sentence-transformers`."
+            ) from exc
+        self.model: Any = SentenceTransformer(model, device="cpu")
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return np.asarray(vectors, dtype=np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Encoding is CPU bound; keep the event loop free for in-flight retrieval.
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
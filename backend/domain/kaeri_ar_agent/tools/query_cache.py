@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def query_key(query: str, max_results: int) -> str:
+    return f"{max_results}:{normalize_query(query)}"
+
+
+class QueryCache:
+    """Two-level cache of raw retrieval results keyed by (normalized query, max_results).
+
+    ``run_entries`` is the run-scoped layer kept in pipeline state, so refine loops
+    never refetch a query within a run. When ``root`` is set, results are also
+    persisted as one JSON file per key and reused across runs for ``ttl_s`` seconds.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        ttl_s: float = 0.0,
+        run_entries: Optional[Dict[str, List[dict]]] = None,
+    ) -> None:
+        self.root = root
+        self.ttl_s = ttl_s
+        self.run_entries: Dict[str, List[dict]] = dict(run_entries or {})
+        self.run_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root or "", f"{digest}.json")
+
+    def get(self, query: str, max_results: int) -> Optional[List[dict]]:
+        key = query_key(query, max_results)
+        if key in self.run_entries:
+            self.run_hits += 1
+            return self.run_entries[key]
+        if self.root and self.ttl_s > 0:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+            except (OSError, ValueError):
+                payload = None
+            if (
+                isinstance(payload, dict)
+                and payload.get("key") == key
+                and time.time() - float(payload.get("fetched_at", 0)) <= self.ttl_s
+            ):
+                entries = list(payload.get("entries") or [])
+                self.run_entries[key] = entries
+                self.persistent_hits += 1
+                return entries
+        self.misses += 1
+        return None
+
+    def put(self, query: str, max_results: int, entries: List[dict]) -> None:
+        key = query_key(query, max_results)
+        self.run_entries[key] = entries
+        if not self.root or self.ttl_s <= 0:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"key": key, "fetched_at": time.time(), "entries": entries}, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "query_cache_run_hits": self.run_hits,
+            "query_cache_persistent_hits": self.persistent_hits,
+            "query_cache_misses": self.misses,
+        }
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..schemas import EvidenceItem, PipelineInputs, RunSnapshot, SourceRecord
+from .arxiv_client import normalize_arxiv_id
+
+
+CLAIM_NUMBER_PATTERN = re.compile(r"-C(\d+)$")
+VERSION_SUFFIX = re.compile(r"v\d+$")
+
+
+def snapshot_key(inputs: PipelineInputs) -> str:
+    """Recurring reports are identified by the user prompt, not the generated outline."""
+    basis = " ".join((inputs.raw_prompt or inputs.topic).lower().split())
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+class RunSnapshotStore:
+    """Canonical sources, evidence and drafts of the last completed run, one JSON file per report."""
+
+    def __init__(self, root: Optional[str]) -> None:
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root or "", f"{key}.json")
+
+    def load(self, key: str) -> Optional[RunSnapshot]:
+        if not self.root:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as handle:
+                return RunSnapshot.model_validate(json.load(handle))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, snapshot: RunSnapshot) -> None:
+        if not self.root:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(snapshot.key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(snapshot.model_dump_json())
+        os.replace(tmp_path, path)
+
+
+def _source_keys(source: SourceRecord) -> Set[str]:
+    keys = {source.source_id}
+    if source.canonical_source_id:
+        keys.add(source.canonical_source_id)
+    arxiv_id = normalize_arxiv_id(source.identifiers.arxiv_id or source.source_id)
+    if arxiv_id:
+        # A new arXiv version of an already processed paper is not new material.
+        keys.add(f"arxiv:{VERSION_SUFFIX.sub('', arxiv_id)}")
+    return keys
+
+
+def new_sources(previous: Iterable[SourceRecord], sources: List[SourceRecord]) -> List[SourceRecord]:
+    known: Set[str] = set()
+    for source in previous:
+        known |= _source_keys(source)
+    return [source for source in sources if not _source_keys(source) & known]
+
+
+def merge_evidence(previous: List[EvidenceItem], fresh: List[EvidenceItem]) -> List[EvidenceItem]:
+    """Append fresh evidence, renumbering claim IDs after the previous run's per chapter."""
+    next_number: Dict[str, int] = {}
+    for item in previous:
+        match = CLAIM_NUMBER_PATTERN.search(item.claim_id)
+        number = int(match.group(1)) if match else 0
+        chapter = item.chapter_id or ""
+        next_number[chapter] = max(next_number.get(chapter, 0), number)
+    merged = list(previous)
+    for item in fresh:
+        chapter = item.chapter_id or ""
+        next_number[chapter] = next_number.get(chapter, 0) + 1
+        claim_id = f"{chapter}-C{next_number[chapter]:03d}"
+        merged.append(item.model_copy(update={"claim_id": claim_id}))
+    return merged
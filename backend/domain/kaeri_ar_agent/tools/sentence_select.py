@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Tuple
+
+from .local_embeddings import HashingEmbeddings
+
+
+SENTENCE_BREAK = re.compile(r"(?<=[.!?。])\s+(?=[\"'(\[]?[A-Z0-9가-힣])")
+
+_EMBEDDER = HashingEmbeddings()
+
+Span = Tuple[int, int]
+
+
+def sentence_spans(text: str) -> List[Span]:
+    """Character spans of the sentences in ``text`` (end exclusive, whitespace trimmed)."""
+    spans: List[Span] = []
+    start = 0
+    for match in SENTENCE_BREAK.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text.rstrip())))
+    trimmed: List[Span] = []
+    for begin, end in spans:
+        while begin < end and text[begin].isspace():
+            begin += 1
+        if begin < end:
+            trimmed.append((begin, end))
+    return trimmed
+
+
+def select_sentences(
+    text: str,
+    queries: List[str],
+    max_sentences: int = 2,
+    embedder: Optional[HashingEmbeddings] = None,
+) -> List[Span]:
+    """Spans of the sentences most similar to any of ``queries``, in reading order.
+
+    Sentences are scored by cosine similarity of hashed unigram/bigram features.
+    Only sentences with some overlap are kept; with none at all, the lead sentence
+    stands in, since abstracts usually open with their main claim.
+    """
+    spans = sentence_spans(text)
+    queries = [query for query in queries if query.strip()]
+    if not spans or not queries:
+        return spans[:1]
+    if len(spans) == 1:
+        return spans
+    embedder = embedder or _EMBEDDER
+    sentence_matrix = embedder.embed_matrix([text[begin:end] for begin, end in spans])
+    query_matrix = embedder.embed_matrix(queries)
+    scores = (sentence_matrix @ query_matrix.T).max(axis=1)
+    ranked = sorted(range(len(spans)), key=lambda position: (-float(scores[position]), position))
+    chosen = [position for position in ranked[: max(1, max_sentences)] if scores[position] > 0.0]
+    if not chosen:
+        chosen = [0]
+    return [spans[position] for position in sorted(chosen)]
+
+
+def excerpt(text: str, spans: List[Span]) -> str:
+    return " ".join(text[begin:end] for begin, end in spans)
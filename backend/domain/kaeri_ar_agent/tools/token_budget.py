@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import math
+from typing import Any, Optional
+
+
+DEFAULT_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str) -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts fall back to the estimate.
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative estimate: ~4 ASCII characters per token, one token per other character."""
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,84 @@
+"""Citation renumbering benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_citations [--references 100,300,1000] [--paragraphs 200]
+
+Compares the single-scan ``renumber_citations`` against the former loop of one
+``str.replace`` per cited source plus two regex passes, on synthetic reports
+whose DOIs include prefixes of each other (``.../p12`` and ``.../p123``). The
+pattern build (trie + compile, once per report) is reported apart from the scan,
+which is the part that grows with report length. Also reports how many
+citations the legacy loop corrupted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from backend.domain.kaeri_ar_agent.agents.composer import citation_pattern, renumber_citations
+
+
+def _legacy_renumber(text: str, citation_index: Dict[str, int]) -> str:
+    for source_id, idx in citation_index.items():
+        text = text.replace(source_id, f"[{idx}]")
+    text = re.sub(r"\(\[", "[", text)
+    text = re.sub(r"\]\)", "]", text)
+    return text
+
+
+def _report(references: int, paragraphs: int, seed: int = 0) -> tuple[str, Dict[str, int]]:
+    rng = random.Random(seed)
+    ids = [f"doi:10.1000/p{index}" for index in range(1, references + 1)]
+    lines: List[str] = []
+    for position in range(paragraphs):
+        cited = rng.sample(ids, k=min(3, len(ids)))
+        lines.append(f"## C{position}\n핵심 기술과 난제를 정리한다. " * 4 + f"({', '.join(cited)})\n")
+    return "\n".join(lines), {source_id: index + 1 for index, source_id in enumerate(ids)}
+
+
+def run(sizes: List[int], paragraphs: int) -> List[Dict[str, float]]:
+    rows: List[Dict[str, float]] = []
+    for size in sizes:
+        text, citation_index = _report(size, paragraphs)
+        started = time.perf_counter()
+        legacy = _legacy_renumber(text, citation_index)
+        legacy_s = time.perf_counter() - started
+        started = time.perf_counter()
+        pattern = citation_pattern(list(citation_index))
+        build_s = time.perf_counter() - started
+        started = time.perf_counter()
+        single = renumber_citations(text, citation_index, pattern)
+        single_s = time.perf_counter() - started
+        expected = len(re.findall(r"doi:10\.1000/p\d+", text))
+        corrupted = expected - len(re.findall(r"\[\d+\](?!\d)", legacy))
+        assert len(re.findall(r"\[\d+\]", single)) == expected
+        rows.append({"references": size, "legacy_s": legacy_s, "build_s": build_s, "single_s": single_s, "corrupted": corrupted})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--references", default="100,300,1000")
+    parser.add_argument("--paragraphs", type=int, default=500)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.references.split(",") if size]
+    print(
+        f"{'refs':>6} {'legacy (ms)':>12} {'build (ms)':>11} {'scan (ms)':>10} "
+        f"{'scan speedup':>13} {'legacy corrupted':>17}"
+    )
+    for row in run(sizes, args.paragraphs):
+        legacy_ms = row["legacy_s"] * 1000
+        single_ms = row["single_s"] * 1000
+        print(
+            f"{row['references']:>6} {legacy_ms:>12.2f} {row['build_s'] * 1000:>11.2f} {single_ms:>10.2f} "
+            f"{legacy_ms / single_ms:>13.1f} {row['corrupted']:>17}"
+        )
+
+
+if __name__ == "__main__":
+    main()
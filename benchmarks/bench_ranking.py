@@ -0,0 +1,129 @@
+"""Chapter x source ranking benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ranking [--dim 1536] [--chapters 7] [--sizes 100,1000,5000]
+                                       [--embeddings synthetic|hashing]
+
+Compares the vectorized ranker against the former per-pair pure-Python cosine
+loop on synthetic embeddings (no network, embeddings served from memory).
+``--embeddings hashing`` uses the local CPU backend instead, so the warm-up pass
+also reports its embedding cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+from backend.domain.kaeri_ar_agent.agents.retriever import _rank_sources_with_embeddings
+from backend.domain.kaeri_ar_agent.config import AgentConfig
+from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+from backend.domain.kaeri_ar_agent.tools.embedding_store import EmbeddingStore
+from backend.domain.kaeri_ar_agent.tools.local_embeddings import HashingEmbeddings
+
+
+class SyntheticEmbeddings:
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def _vector(self, text: str) -> List[float]:
+        seed = zlib.crc32(text.encode("utf-8"))
+        return np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+def _legacy_rank(
+    query_vectors: List[List[float]],
+    source_vectors: List[List[float]],
+    per_chapter: int,
+) -> List[int]:
+    def cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        na = sum(x * x for x in a) ** 0.5
+        nb = sum(y * y for y in b) ** 0.5
+        return dot / (na * nb) if na and nb else 0.0
+
+    selected: List[int] = []
+    for query_vector in query_vectors:
+        scored = sorted(
+            range(len(source_vectors)),
+            key=lambda index: cosine(query_vector, source_vectors[index]),
+            reverse=True,
+        )
+        selected.extend(scored[:per_chapter])
+    return selected
+
+
+def _sources(count: int) -> List[SourceRecord]:
+    return [
+        SourceRecord(source_id=f"S-{index}", title=f"paper {index}", abstract=f"abstract {index}")
+        for index in range(count)
+    ]
+
+
+def run(
+    dim: int,
+    chapters: int,
+    sizes: List[int],
+    legacy_limit: int,
+    embeddings: str = "synthetic",
+) -> List[Dict[str, float]]:
+    config = AgentConfig(mock_mode=False, max_sources=20, cache_dir=None)
+    plan = {f"C{index}": [f"chapter {index} query"] for index in range(chapters)}
+    rows: List[Dict[str, float]] = []
+    for size in sizes:
+        sources = _sources(size)
+        backend = HashingEmbeddings(dim) if embeddings == "hashing" else SyntheticEmbeddings(dim)
+        store = EmbeddingStore(backend, embeddings)
+        # Warm the store so the timing isolates ranking from embedding.
+        started = time.perf_counter()
+        asyncio.run(_rank_sources_with_embeddings(config, plan, sources, store=store))
+        embed = time.perf_counter() - started
+        started = time.perf_counter()
+        asyncio.run(_rank_sources_with_embeddings(config, plan, sources, store=store))
+        vectorized = time.perf_counter() - started
+        legacy = float("nan")
+        if size <= legacy_limit:
+            source_vectors = asyncio.run(
+                store.aembed_documents([f"{s.title}\n{s.abstract}" for s in sources])
+            ).tolist()
+            query_vectors = asyncio.run(
+                store.aembed_queries([" ".join(queries) for queries in plan.values()])
+            ).tolist()
+            started = time.perf_counter()
+            _legacy_rank(query_vectors, source_vectors, max(1, config.max_sources // chapters))
+            legacy = time.perf_counter() - started
+        rows.append({"sources": size, "embed_s": embed, "vectorized_s": vectorized, "legacy_s": legacy})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--chapters", type=int, default=7)
+    parser.add_argument("--sizes", default="100,1000,5000,10000")
+    parser.add_argument("--legacy-limit", type=int, default=1000)
+    parser.add_argument("--embeddings", choices=["synthetic", "hashing"], default="synthetic")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    print(f"{'sources':>8} {'embed (ms)':>11} {'vectorized (ms)':>16} {'legacy (ms)':>12} {'speedup':>8}")
+    for row in run(args.dim, args.chapters, sizes, args.legacy_limit, args.embeddings):
+        legacy_ms = row["legacy_s"] * 1000
+        vectorized_ms = row["vectorized_s"] * 1000
+        speedup = legacy_ms / vectorized_ms if legacy_ms == legacy_ms else float("nan")
+        print(f"{row['sources']:>8} {row['embed_s'] * 1000:>11.2f} {vectorized_ms:>16.2f} {legacy_ms:>12.2f} {speedup:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,3 +9,23 @@ def test_run_pipeline_mock_mode():
     assert state.get("composed_text")
     assert state.get("sources")
     assert state.get("drafts")
+
+
+def test_run_pipeline_incremental_reuses_previous_run(tmp_path):
+    config = AgentConfig(mock_mode=True, incremental_mode=True, cache_dir=str(tmp_path))
+    inputs = PipelineInputs(raw_prompt="monthly trend report", topic="topic", outline=["C1"])
+    # A regular run already leaves the snapshot the first incremental run builds on.
+    first = run_pipeline(AgentConfig(mock_mode=True, cache_dir=str(tmp_path)), inputs)
+    assert first.get("previous_run") is None
+    assert list((tmp_path / "snapshots").iterdir())
+
+    events = []
+    second = run_pipeline(config, inputs, emit=lambda agent, message, payload=None: events.append(message))
+    assert second["previous_run"] is not None
+    assert second["submitted_after"] == second["previous_run"].created_at[:10]
+    assert second["retrieval_stats"]["new_sources"] == 0
+    assert second["retrieval_stats"]["predicted_extractor_calls"] == 0
+    assert second["evidence_stats"]["new_evidence_items"] == 0
+    assert [draft.text for draft in second["drafts"]] == [draft.text for draft in first["drafts"]]
+    assert [source.source_id for source in second["sources"]] == [source.source_id for source in first["sources"]]
+    assert second.get("composed_text")
@@ -76,3 +76,83 @@ def asyncio_run(coro):
     import asyncio
 
     return asyncio.run(coro)
+
+
+def test_fetch_by_ids_chunks_and_drops_error_entries(monkeypatch):
+    calls = []
+
+    class FakeResponse:
+        def __init__(self, ids):
+            entries = "".join(
+                f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id><title>{arxiv_id}</title></entry>"
+                for arxiv_id in ids
+                if arxiv_id != "0000.00000"
+            )
+            if "0000.00000" in ids:
+                entries += "<entry><id>http://arxiv.org/api/errors#incorrect_id</id><title>Error</title></entry>"
+            self.text = f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+        def raise_for_status(self):
+            return None
+
+    def fake_get(_url, params=None, **_kwargs):
+        calls.append(params)
+        return FakeResponse(params["id_list"].split(","))
+
+    monkeypatch.setattr(arxiv_client.httpx, "get", fake_get)
+    ids = ["arXiv:2401.00001", "2401.00002", "2401.00001", "0000.00000", "not an id"]
+    results = arxiv_client.fetch_by_ids("http://example.com", ids, 1.0, batch_size=2)
+    assert [call["id_list"] for call in calls] == ["2401.00001,2401.00002", "0000.00000"]
+    assert calls[0]["max_results"] == 2
+    assert [entry["source_id"] for entry in results] == ["S-ARXIV-2401.00001v1", "S-ARXIV-2401.00002v1"]
+
+
+def test_fetch_by_ids_async_overlaps_batches_up_to_limit(monkeypatch):
+    import asyncio
+
+    active = {"now": 0, "peak": 0}
+
+    class FakeResponse:
+        def __init__(self, ids):
+            entries = "".join(
+                f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id><title>{arxiv_id}</title></entry>"
+                for arxiv_id in ids
+            )
+            self.text = f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+        def raise_for_status(self):
+            return None
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return None
+
+        async def get(self, _url, params=None):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return FakeResponse(params["id_list"].split(","))
+
+    monkeypatch.setattr(arxiv_client.httpx, "AsyncClient", lambda **_kwargs: FakeClient())
+    ids = [f"2401.0000{index}" for index in range(5)]
+    results = asyncio_run(
+        arxiv_client.fetch_by_ids_async("http://example.com", ids, 1.0, batch_size=1, max_concurrency=2)
+    )
+    assert [entry["identifiers"]["arxiv_id"] for entry in results] == [f"{arxiv_id}v1" for arxiv_id in ids]
+    assert active["peak"] == 2
+    assert all(entry["retrieved_at"] for entry in results)
+
+
+def test_extract_arxiv_ids_from_text():
+    text = "see arXiv:2401.01234v2, https://arxiv.org/pdf/2312.00001 and math/0101001 twice 2401.01234v2"
+    assert arxiv_client.extract_arxiv_ids(text) == ["2401.01234v2", "2312.00001"]
+    assert arxiv_client.normalize_arxiv_id("S-ARXIV-1234.5678v1") == "1234.5678v1"
+
+
+def test_submitted_since_query_adds_date_window():
+    query = arxiv_client.submitted_since_query("all:reactor", "2026-01-15", until="2026-02-01")
+    assert query == "(all:reactor) AND submittedDate:[202601150000 TO 202602012359]"
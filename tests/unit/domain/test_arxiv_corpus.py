@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import numpy as np
+
+from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+from backend.domain.kaeri_ar_agent.tools.arxiv_corpus import (
+    ArxivCorpus,
+    load_arxiv_corpus,
+    snapshot_entry_to_record,
+    submitted_on_or_after,
+    tokenize,
+)
+from backend.domain.kaeri_ar_agent.tools.embedding_store import EmbeddingStore
+
+
+SNAPSHOT = [
+    {
+        "id": "2401.00001",
+        "title": "Neural surrogate for reactor\n  core thermal hydraulics",
+        "abstract": "We train a neural surrogate for reactor core thermal hydraulics.",
+        "authors": "A. Kim and B. Lee",
+        "authors_parsed": [["Kim", "A.", ""], ["Lee", "B.", ""]],
+        "doi": "10.1000/core",
+        "versions": [
+            {"version": "v1", "created": "Mon, 1 Jan 2024 10:00:00 GMT"},
+            {"version": "v2", "created": "Mon, 5 Feb 2024 10:00:00 GMT"},
+        ],
+    },
+    {
+        "id": "2301.00002",
+        "title": "Graph networks for multiphysics coupling",
+        "abstract": "Coupling neutronics and fluid solvers with graph networks.",
+        "authors": "C. Park, D. Choi",
+        "update_date": "2023-03-01",
+    },
+    {
+        "id": "2201.00003",
+        "title": "Language models for code",
+        "abstract": "An unrelated paper about code generation.",
+        "authors": "E. Han",
+        "versions": [{"version": "v1", "created": "Sat, 1 Jan 2022 00:00:00 GMT"}],
+    },
+]
+
+
+class FakeEmbeddings:
+    async def aembed_documents(self, texts):
+        return [[1.0, 0.0] if "code" in text.lower() else [0.0, 1.0] for text in texts]
+
+
+def _write_snapshot(tmp_path):
+    path = tmp_path / "snapshot.jsonl"
+    lines = [json.dumps(entry) for entry in SNAPSHOT] + ["", "not json"]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The AI-based reactor, 노심 해석!") == ["ai", "based", "reactor", "노심", "해석"]
+
+
+def test_snapshot_entry_matches_feed_record_shape():
+    record = snapshot_entry_to_record(SNAPSHOT[0])
+    assert record["source_id"] == "S-ARXIV-2401.00001v2"
+    assert record["title"] == "Neural surrogate for reactor core thermal hydraulics"
+    assert record["authors"] == ["A. Kim", "B. Lee"]
+    assert record["year"] == 2024
+    assert record["published"] == "2024-01-01"
+    assert record["identifiers"] == {"arxiv_id": "2401.00001v2", "doi": "10.1000/core"}
+    assert SourceRecord(**record).url == "http://arxiv.org/abs/2401.00001v2"
+
+
+def test_snapshot_entry_falls_back_to_update_date_and_raw_authors():
+    record = snapshot_entry_to_record(SNAPSHOT[1])
+    assert record["source_id"] == "S-ARXIV-2301.00002"
+    assert record["year"] == 2023
+    assert record["published"] == "2023-03-01"
+    assert record["authors"] == ["C. Park", "D. Choi"]
+    assert snapshot_entry_to_record({})["source_id"] == "S-ARXIV-UNKNOWN"
+
+
+def test_submitted_on_or_after_compares_full_dates():
+    record = snapshot_entry_to_record(SNAPSHOT[0])
+    assert submitted_on_or_after(record, "2024-01-01")
+    assert not submitted_on_or_after(record, "2024-01-15")
+    assert submitted_on_or_after({"year": 2024}, "2024-06-01")
+
+
+def test_bm25_search_ranks_lexical_matches(tmp_path):
+    corpus = ArxivCorpus.from_jsonl(str(_write_snapshot(tmp_path)))
+    assert len(corpus) == 3
+    results = corpus.search("all:reactor AND thermal hydraulics", 5)
+    assert [record["source_id"] for record in results] == ["S-ARXIV-2401.00001v2"]
+    assert corpus.search("reactor", 0) == []
+    assert corpus.search("unknownterm", 5) == []
+
+
+def test_search_filters_by_date_before_truncating():
+    old = [
+        {
+            "id": f"2001.0000{index}",
+            "title": "Reactor reactor core reactor",
+            "abstract": "Reactor core reactor.",
+            "update_date": "2020-01-01",
+        }
+        for index in range(5)
+    ]
+    new = {"id": "2605.00001", "title": "Reactor study", "abstract": "Other.", "update_date": "2026-05-01"}
+    corpus = ArxivCorpus.build(snapshot_entry_to_record(entry) for entry in old + [new])
+    assert "S-ARXIV-2605.00001" not in [record["source_id"] for record in corpus.search("reactor", 2)]
+    recent = corpus.search("reactor", 2, submitted_after="2026-01-01")
+    assert [record["source_id"] for record in recent] == ["S-ARXIV-2605.00001"]
+
+
+def test_corpus_get_by_ids_matches_versioned_and_bare_ids():
+    corpus = ArxivCorpus.build(snapshot_entry_to_record(entry) for entry in SNAPSHOT)
+    records = corpus.get_by_ids(["arXiv:2401.00001", "2201.00003v1", "9999.99999", "2401.00001v2"])
+    assert [record["source_id"] for record in records] == [
+        "S-ARXIV-2401.00001v2",
+        "S-ARXIV-2201.00003v1",
+    ]
+
+
+def test_corpus_build_skips_duplicate_ids():
+    record = snapshot_entry_to_record(SNAPSHOT[2])
+    corpus = ArxivCorpus.build([record, dict(record)])
+    assert len(corpus) == 1
+
+
+def test_corpus_save_and_load_roundtrip(tmp_path):
+    corpus = ArxivCorpus.from_jsonl(str(_write_snapshot(tmp_path)))
+    corpus.save(str(tmp_path / "index"))
+    loaded = ArxivCorpus.load(str(tmp_path / "index"))
+    assert loaded.search("graph coupling", 1) == corpus.search("graph coupling", 1)
+    assert np.allclose(loaded.bm25_scores("neutronics"), corpus.bm25_scores("neutronics"))
+    load_arxiv_corpus.cache_clear()
+    assert len(load_arxiv_corpus(str(tmp_path / "index"))) == 3
+
+
+def test_hybrid_search_uses_cached_embeddings(tmp_path):
+    corpus = ArxivCorpus.from_jsonl(str(_write_snapshot(tmp_path)))
+    store = EmbeddingStore(FakeEmbeddings(), "model")
+    texts = [f"{record['title']}\n{record['abstract']}" for record in corpus.records]
+    asyncio.run(store.aembed_documents(texts))
+    results = asyncio.run(corpus.asearch("code", 2, store=store))
+    assert results[0]["source_id"] == "S-ARXIV-2201.00003v1"
+    assert len(results) == 2
+
+
+def test_asearch_without_cached_vectors_is_bm25_only(tmp_path):
+    corpus = ArxivCorpus.from_jsonl(str(_write_snapshot(tmp_path)))
+    store = EmbeddingStore(FakeEmbeddings(), "model")
+    results = asyncio.run(corpus.asearch("graph", 3, store=store))
+    assert [record["source_id"] for record in results] == ["S-ARXIV-2301.00002"]
+    assert store.misses == 0
+
+
+def test_query_embeddings_do_not_rebuild_dense_matrix(tmp_path):
+    corpus = ArxivCorpus.from_jsonl(str(_write_snapshot(tmp_path)))
+    store = EmbeddingStore(FakeEmbeddings(), "model", root=str(tmp_path / "emb"))
+    asyncio.run(store.aembed_documents([f"{record['title']}\n{record['abstract']}" for record in corpus.records]))
+    asyncio.run(corpus.asearch("code", 2, store=store))
+    matrix = corpus._dense_matrix
+    asyncio.run(corpus.asearch("graph coupling", 2, store=store))
+    assert store.document_rows == 3 and len(store) == 5
+    assert corpus._dense_matrix is matrix
@@ -1,4 +1,4 @@
-from backend.domain.kaeri_ar_agent.agents.auditor import audit_citations
+from backend.domain.kaeri_ar_agent.agents.auditor import audit_citations, check_draft_citations
 from backend.domain.kaeri_ar_agent.schemas import DraftNode, SourceRecord
 
 
@@ -12,3 +12,67 @@ def test_audit_citations_basic():
     )
     audit = audit_citations([source], [draft], llm=None)
     assert audit.passed is True
+
+
+def test_audit_sends_unknown_citation_to_llm_review():
+    prompts = []
+
+    class FakeLLM:
+        async def astream(self, messages):
+            prompts.append(messages)
+            yield type("Chunk", (), {"content": '["Unsupported citation"]'})
+
+    source = SourceRecord(source_id="S-ARXIV-2101.00001v1", title="Title")
+    draft = DraftNode(
+        chapter_id="C1",
+        paragraph_id="P1",
+        text="text (arXiv:2101.00001, doi:10.9999/missing)",
+        citation_source_ids=["S-ARXIV-2101.00001v1"],
+    )
+    assert check_draft_citations(draft, {"arxiv:2101.00001"}) == [
+        "[C1] Citation to unknown source: doi:10.9999/missing"
+    ]
+    assert audit_citations([source], [draft], llm=None).passed is True
+    audit = audit_citations([source], [draft], llm=FakeLLM())
+    assert "Citation to unknown source: doi:10.9999/missing" in prompts[0]
+    assert audit.issues == ["[C1] Unsupported citation"]
+
+
+def test_audit_sends_only_suspicious_changed_chapters_to_llm():
+    prompts = []
+
+    class FakeLLM:
+        async def astream(self, messages):
+            prompts.append(messages)
+            yield type("Chunk", (), {"content": "[]"})
+
+    sources = [SourceRecord(source_id="S-1", title="A"), SourceRecord(source_id="S-2", title="B")]
+    clean = DraftNode(chapter_id="C1", paragraph_id="P1", text="text (S-1)", citation_source_ids=["S-1"])
+    uncited = DraftNode(chapter_id="C2", paragraph_id="P1", text="text", citation_source_ids=["S-2"])
+    passed = {}
+    stats = {}
+    audit = audit_citations(sources, [clean, uncited], llm=FakeLLM(), passed=passed, stats=stats)
+    assert audit.passed is True
+    assert len(prompts) == 1 and "[C2]" in prompts[0] and "[C1]" not in prompts[0]
+    assert set(passed) == {"C1", "C2"}
+
+    audit_citations(sources, [clean, uncited], llm=FakeLLM(), passed=passed, stats=stats)
+    assert len(prompts) == 1
+    assert stats == {"audit_llm_chapters": 0, "audit_skipped_chapters": 1}
+
+
+def test_audit_unparseable_review_is_not_recorded_as_passed():
+    replies = ["Looks fine to me.", '```json\n["Unsupported claim"]\n```']
+
+    class FakeLLM:
+        async def astream(self, messages):
+            yield type("Chunk", (), {"content": replies.pop(0)})
+
+    sources = [SourceRecord(source_id="S-1", title="A")]
+    uncited = DraftNode(chapter_id="C1", paragraph_id="P1", text="text", citation_source_ids=["S-1"])
+    passed = {}
+    audit = audit_citations(sources, [uncited], llm=FakeLLM(), passed=passed)
+    assert audit.passed is True
+    assert passed == {}
+    audit = audit_citations(sources, [uncited], llm=FakeLLM(), passed=passed)
+    assert audit.issues == ["[C1] Unsupported claim"]
@@ -1,5 +1,8 @@
-from backend.domain.kaeri_ar_agent.agents.composer import compose_text
+import asyncio
+
+from backend.domain.kaeri_ar_agent.agents.composer import compose_text, draft_context, renumber_citations
 from backend.domain.kaeri_ar_agent.schemas import DraftNode
+from backend.domain.kaeri_ar_agent.tools.token_budget import count_tokens
 
 
 def test_composer_uses_canonical_metadata_and_preprint_label():
@@ -43,3 +46,48 @@ def test_composer_replaces_source_ids_with_indices():
     sources = [{"source_id": "S-1", "title": "Title"}]
     text = compose_text(drafts, sources)
     assert "[1]" in text
+
+
+def test_renumbering_does_not_corrupt_prefix_ids():
+    text = renumber_citations(
+        "a (doi:10.1/abc) b (doi:10.1/ab, S-1). c doi:10.1/ab. S-10 XS-1",
+        {"doi:10.1/ab": 1, "doi:10.1/abc": 2, "S-1": 3},
+    )
+    assert text == "a [2] b [1], [3]. c [1]. S-10 XS-1"
+
+
+def test_abstract_and_keywords_are_generated_concurrently():
+    active = 0
+    peak = 0
+
+    class FakeLLM:
+        async def astream(self, prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            yield type("Chunk", (), {"content": "키워드1, 키워드2" if "keywords" in prompt else "초록 본문"})
+
+    drafts = [DraftNode(chapter_id="C1", paragraph_id="C1-P1", text="내용", citation_source_ids=[])]
+    text = compose_text(drafts, [], llm=FakeLLM())
+    assert peak == 2
+    assert "## 초록\n초록 본문" in text
+    assert "**키워드**: 키워드1, 키워드2" in text
+
+
+def test_draft_context_keeps_lead_sentences_within_budget():
+    drafts = [
+        DraftNode(
+            chapter_id=f"C{index}",
+            paragraph_id="P1",
+            text="첫 문장이다. " + "긴 부연 설명이 이어진다. " * 50,
+            citation_source_ids=[],
+        )
+        for index in range(2)
+    ]
+    assert draft_context(drafts) == "".join(f"[{draft.chapter_id}] {draft.text}\n" for draft in drafts)
+    context = draft_context(drafts, budget=60)
+    assert count_tokens(context) <= 60
+    assert context.startswith("[C0] 첫 문장이다.")
+    assert "[C1] 첫 문장이다." in context
@@ -50,3 +50,20 @@ def test_build_embeddings_requires_api_key():
     config = AgentConfig(openai_api_key=None, mock_mode=False)
     with pytest.raises(ValueError):
         config.build_embeddings()
+
+
+def test_cache_path_respects_disabled_cache(monkeypatch):
+    assert AgentConfig(cache_dir=None).cache_path("embeddings") is None
+    assert AgentConfig(cache_dir="root").cache_path("embeddings") == os.path.join("root", "embeddings")
+    monkeypatch.setenv("CACHE_DIR", "")
+    assert AgentConfig.from_env().cache_dir is None
+
+
+def test_build_embeddings_local_backend_needs_no_api_key():
+    config = AgentConfig(openai_api_key=None, embedding_backend="hashing", hashing_embedding_dim=64)
+    embeddings = config.build_embeddings()
+    assert len(embeddings.embed_query("reactor")) == 64
+    assert config.embedding_model_id() == "hashing-64"
+    assert AgentConfig().embedding_model_id() == "text-embedding-3-small"
+    with pytest.raises(ValueError):
+        AgentConfig(embedding_backend="unknown").build_embeddings()
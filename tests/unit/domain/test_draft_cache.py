@@ -0,0 +1,46 @@
+import asyncio
+
+from backend.domain.kaeri_ar_agent.agents.writer import write_chapters
+from backend.domain.kaeri_ar_agent.config import AgentConfig
+from backend.domain.kaeri_ar_agent.schemas import EvidenceItem
+from backend.domain.kaeri_ar_agent.tools.draft_cache import DraftCache, draft_key
+
+
+def _item(snippet="snippet", claim_id="C1-001"):
+    return EvidenceItem(claim_id=claim_id, source_id="doi:10.1234/test", snippet=snippet, chapter_id="C1")
+
+
+def test_key_covers_request_evidence_prompt_and_model():
+    items = [_item(claim_id="C1-001"), _item(claim_id="C1-002")]
+    base = draft_key("C1", "topic", None, [], items, "prompt", "m", 0.2)
+    assert draft_key("C1", "topic", "", [], list(reversed(items)), "prompt", "m", 0.2) == base
+    assert draft_key("C1", "topic", None, [], [items[0], _item("changed", "C1-002")], "prompt", "m", 0.2) != base
+    assert draft_key("C1", "topic", "scope", [], items, "prompt", "m", 0.2) != base
+    assert draft_key("C1", "topic", None, ["x"], items, "prompt", "m", 0.2) != base
+    assert draft_key("C1", "topic", None, [], items, "other", "m", 0.2) != base
+    assert draft_key("C1", "topic", None, [], items, "prompt", "other", 0.2) != base
+
+
+def test_writer_skips_llm_for_cached_chapters(tmp_path):
+    calls = []
+
+    class FakeLLM:
+        async def astream(self, messages):
+            calls.append(messages)
+            await asyncio.sleep(0)
+            yield type("Chunk", (), {"content": f"본문 {len(calls)}"})
+
+    config = AgentConfig(mock_mode=False)
+    cache = DraftCache(str(tmp_path), max_entries=10, model="m")
+    first = write_chapters(config, "topic", None, [], ["C1"], [_item()], llm=FakeLLM(), cache=cache)
+    again = write_chapters(config, "topic", None, [], ["C1"], [_item()], llm=FakeLLM(), cache=cache)
+    assert again == first
+    assert len(calls) == 1
+
+    fresh = DraftCache(str(tmp_path), max_entries=10, model="m")
+    assert write_chapters(config, "topic", None, [], ["C1"], [_item()], llm=FakeLLM(), cache=fresh) == first
+    assert fresh.stats() == {"draft_cache_hits": 1, "draft_cache_misses": 0}
+
+    redrafted = write_chapters(config, "topic", None, [], ["C1"], [_item()], llm=FakeLLM(), cache=cache, refresh=True)
+    assert redrafted[0].text == "본문 2"
+    assert cache.get(cache.key("C1", "topic", None, [], [_item()], "")) == redrafted[0]
@@ -0,0 +1,161 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.domain.kaeri_ar_agent.tools.embedding_store import EmbeddingStore, content_hash
+
+
+class CountingEmbeddings:
+    def __init__(self, dim=3):
+        self.dim = dim
+        self.documents = []
+        self.queries = []
+
+    def _vector(self, text):
+        return [float(len(text)), float(text.count("a")), 1.0][: self.dim]
+
+    async def aembed_documents(self, texts):
+        self.documents.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text):
+        self.queries.append(text)
+        return self._vector(text)
+
+
+def test_content_hash_separates_kinds():
+    assert content_hash("text", "query") != content_hash("text", "document")
+    assert content_hash("text") == content_hash("text", "document")
+
+
+def test_store_rejects_unknown_dtype():
+    with pytest.raises(ValueError):
+        EmbeddingStore(CountingEmbeddings(), "model", dtype="int8")
+
+
+def test_in_memory_store_embeds_each_text_once():
+    embeddings = CountingEmbeddings()
+    store = EmbeddingStore(embeddings, "model")
+    first = asyncio.run(store.aembed_documents(["a", "bb", "a"]))
+    second = asyncio.run(store.aembed_documents(["bb"]))
+    assert embeddings.documents == ["a", "bb"]
+    assert first.shape == (3, 3)
+    assert np.allclose(first[1], second[0])
+    assert store.stats() == {"embedding_cache_hits": 2, "embedding_cache_misses": 2}
+
+
+def test_empty_input_returns_empty_matrix():
+    store = EmbeddingStore(CountingEmbeddings(), "model")
+    assert asyncio.run(store.aembed_documents([])).shape[0] == 0
+
+
+def test_persistent_store_survives_new_instance(tmp_path):
+    embeddings = CountingEmbeddings()
+    store = EmbeddingStore(embeddings, "text-embedding/3", root=str(tmp_path))
+    asyncio.run(store.aembed_documents(["alpha", "beta"]))
+    asyncio.run(store.aembed_query("chapter"))
+
+    reopened = EmbeddingStore(CountingEmbeddings(), "text-embedding/3", root=str(tmp_path))
+    vectors = asyncio.run(reopened.aembed_documents(["beta", "alpha"]))
+    query = asyncio.run(reopened.aembed_query("chapter"))
+    assert reopened.embeddings.documents == []
+    assert reopened.embeddings.queries == []
+    assert vectors.dtype == np.float32
+    assert vectors[0].tolist() == [4.0, 1.0, 1.0]
+    assert query.tolist() == [7.0, 1.0, 1.0]
+    assert len(reopened) == 3
+
+
+def test_persistent_store_is_scoped_by_model(tmp_path):
+    asyncio.run(EmbeddingStore(CountingEmbeddings(), "model-a", root=str(tmp_path)).aembed_documents(["x"]))
+    embeddings = CountingEmbeddings()
+    asyncio.run(EmbeddingStore(embeddings, "model-b", root=str(tmp_path)).aembed_documents(["x"]))
+    assert embeddings.documents == ["x"]
+
+
+def test_float16_store_roundtrips(tmp_path):
+    store = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path), dtype="float16")
+    asyncio.run(store.aembed_documents(["aaa"]))
+    reopened = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path), dtype="float16")
+    vectors = asyncio.run(reopened.aembed_documents(["aaa"]))
+    assert reopened.embeddings.documents == []
+    assert vectors.dtype == np.float32
+    assert vectors[0].tolist() == [3.0, 3.0, 1.0]
+
+
+def test_store_ignores_rows_from_interrupted_append(tmp_path):
+    store = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path))
+    asyncio.run(store.aembed_documents(["a", "b"]))
+    vectors_path = store._vectors_path
+    with open(vectors_path, "r+b") as handle:
+        handle.truncate(3 * 4)
+    embeddings = CountingEmbeddings()
+    reopened = EmbeddingStore(embeddings, "model", root=str(tmp_path))
+    asyncio.run(reopened.aembed_documents(["a", "b"]))
+    assert embeddings.documents == ["b"]
+
+
+def test_store_appends_keys_without_rewriting_header(tmp_path):
+    store = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path))
+    asyncio.run(store.aembed_documents(["a"]))
+    with open(store._index_path, "rb") as handle:
+        header = handle.read()
+    asyncio.run(store.aembed_documents(["b", "c"]))
+    asyncio.run(store.aembed_query("d"))
+    with open(store._index_path, "rb") as handle:
+        assert handle.read() == header
+    with open(store._log_path, encoding="utf-8") as handle:
+        kinds = [line.rstrip("\n").split("\t")[1] for line in handle]
+    assert kinds == ["document", "document", "document", "query"]
+    assert store.document_rows == 3
+
+
+def test_store_ignores_partial_key_log_line(tmp_path):
+    store = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path))
+    asyncio.run(store.aembed_documents(["a"]))
+    with open(store._log_path, "ab") as handle:
+        handle.write(content_hash("b").encode("utf-8")[:10])
+    embeddings = CountingEmbeddings()
+    reopened = EmbeddingStore(embeddings, "model", root=str(tmp_path))
+    asyncio.run(reopened.aembed_documents(["a", "b"]))
+    assert embeddings.documents == ["b"]
+    again = EmbeddingStore(CountingEmbeddings(), "model", root=str(tmp_path))
+    vectors = asyncio.run(again.aembed_documents(["b"]))
+    assert again.embeddings.documents == []
+    assert vectors[0].tolist() == [1.0, 0.0, 1.0]
+
+
+def test_store_resets_when_dimension_changes(tmp_path):
+    asyncio.run(EmbeddingStore(CountingEmbeddings(dim=3), "model", root=str(tmp_path)).aembed_documents(["a"]))
+    embeddings = CountingEmbeddings(dim=2)
+    store = EmbeddingStore(embeddings, "model", root=str(tmp_path))
+    asyncio.run(store.aembed_documents(["b"]))
+    vectors = asyncio.run(store.aembed_documents(["b"]))
+    assert vectors.shape == (1, 2)
+
+
+def _append_rows(root, prefix):
+    store = EmbeddingStore(CountingEmbeddings(), "model", root=root)
+    for index in range(20):
+        asyncio.run(store.aembed_documents([f"{prefix}{index}" + "a" * index]))
+
+
+def test_concurrent_processes_do_not_overwrite_rows(tmp_path):
+    import multiprocessing
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_rows, args=(str(tmp_path), prefix)) for prefix in "xy"]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    embeddings = CountingEmbeddings()
+    reopened = EmbeddingStore(embeddings, "model", root=str(tmp_path))
+    texts = [f"{prefix}{index}" + "a" * index for prefix in "xy" for index in range(20)]
+    vectors = asyncio.run(reopened.aembed_documents(texts))
+    assert embeddings.documents == []
+    assert vectors[:, 1].tolist() == [float(index) for _ in "xy" for index in range(20)]
+    assert reopened.document_rows == 40
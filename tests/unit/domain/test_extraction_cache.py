@@ -0,0 +1,40 @@
+import os
+
+from backend.domain.kaeri_ar_agent.tools.extraction_cache import ExtractionCache, extraction_key
+
+
+def test_key_covers_prompt_model_and_temperature():
+    base = extraction_key("abstract", "Intro", "prompt", "gpt-4o-mini", 0.2)
+    assert extraction_key(" abstract ", "Intro ", "prompt", "gpt-4o-mini", 0.2) == base
+    assert extraction_key("abstract", "Intro", "other prompt", "gpt-4o-mini", 0.2) != base
+    assert extraction_key("abstract", "Intro", "prompt", "gpt-5-mini", 0.2) != base
+    assert extraction_key("abstract", "Intro", "prompt", "gpt-4o-mini", 0.7) != base
+
+
+def test_persistent_layer_round_trips_snippets_and_irrelevance(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_entries=10, model="m")
+    assert cache.get("abs", "C1", "p") is None
+    cache.put("abs", "C1", "p", "요약", "abstract")
+    cache.put("abs", "C2", "p", None, None)
+
+    fresh = ExtractionCache(str(tmp_path), max_entries=10, model="m")
+    assert fresh.get("abs", "C1", "p") == ("요약", "abstract")
+    assert fresh.get("abs", "C2", "p") == (None, None)
+    assert ExtractionCache(str(tmp_path), max_entries=10, model="other").get("abs", "C1", "p") is None
+    assert fresh.stats() == {"extraction_cache_hits": 2, "extraction_cache_misses": 0}
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_entries=3, model="m")
+    for index in range(3):
+        cache.put("abs", f"C{index}", "p", f"s{index}", None)
+        path = cache._path(cache.key("abs", f"C{index}", "p"))
+        os.utime(path, (1000 + index, 1000 + index))
+    reader = ExtractionCache(str(tmp_path), max_entries=3, model="m")
+    assert reader.get("abs", "C0", "p") == ("s0", None)
+    cache.put("abs", "C3", "p", "s3", None)
+
+    fresh = ExtractionCache(str(tmp_path), max_entries=3, model="m")
+    assert fresh.get("abs", "C1", "p") is None
+    assert fresh.get("abs", "C0", "p") == ("s0", None)
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) <= 3
@@ -1,6 +1,17 @@
-from backend.domain.kaeri_ar_agent.agents.extractor import extract_evidence
+import asyncio
+
+from backend.domain.kaeri_ar_agent.agents import extractor as extractor_module
+from backend.domain.kaeri_ar_agent.agents.extractor import (
+    extract_evidence,
+    extraction_guard,
+    extract_evidence_async,
+    pack_items,
+    predicted_llm_calls,
+    select_extraction_pairs,
+)
 from backend.domain.kaeri_ar_agent.config import AgentConfig
 from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+from backend.domain.kaeri_ar_agent.tools.extraction_cache import ExtractionCache
 
 
 def test_extractor_uses_canonical_source_id():
@@ -23,3 +34,283 @@ def test_extractor_skips_empty_abstract():
     )
     evidence = extract_evidence(config, [source], ["C1"], llm=None)
     assert evidence == []
+
+
+class FakeLLM:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def astream(self, prompt):
+        self.prompts.append(prompt)
+        yield type("Chunk", (), {"content": self.replies.pop(0)})
+
+
+def _sources():
+    return [
+        SourceRecord(source_id="S-1", title="First", abstract="Reactor core surrogate."),
+        SourceRecord(source_id="S-2", title="Second", abstract="Graph coupling."),
+    ]
+
+
+def test_extractor_per_source_sends_each_abstract_once():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_source")
+    llm = FakeLLM(
+        [
+            '```json\n{"1": {"snippet": "노심 근거", "locator": "abstract"}, "2": null}\n```',
+            '{"1": "not relevant", "C2": "결합 근거"}',
+        ]
+    )
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 2
+    assert all("1. C1\n2. C2" in prompt for prompt in llm.prompts)
+    assert [(item.claim_id, item.snippet) for item in evidence] == [
+        ("C1-C001", "노심 근거"),
+        ("C2-C002", "결합 근거"),
+    ]
+
+
+def test_extractor_per_source_falls_back_to_pairs_on_invalid_json():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_source", max_concurrency=1)
+    sources = _sources()[:1]
+    llm = FakeLLM(["not json", '{"snippet": "첫째", "locator": "abstract"}', '{"snippet": "둘째"}'])
+    evidence = extract_evidence(config, sources, ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 3
+    assert [item.snippet for item in evidence] == ["첫째", "둘째"]
+
+
+def test_extractor_per_pair_mode_calls_once_per_chapter_and_source():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_pair")
+    llm = FakeLLM(['{"snippet": "근거", "locator": "abstract"}'] * 4)
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 4
+    assert [item.claim_id for item in evidence] == ["C1-C001", "C1-C002", "C2-C001", "C2-C002"]
+
+
+def test_select_extraction_pairs_enforces_threshold_and_limit():
+    config = AgentConfig(max_evidence_per_chapter=2, evidence_relevance_threshold=0.3)
+    sources = [SourceRecord(source_id=f"S-{index}", title="t") for index in range(4)]
+    relevance = {
+        "C1": {"S-0": 0.1, "S-1": 0.9, "S-2": 0.5, "S-3": 0.4},
+        "C2": {"S-0": 0.2, "S-1": 0.1, "S-2": 0.05, "S-3": 0.0},
+    }
+    pairs = select_extraction_pairs(config, sources, ["C1", "C2", "C3"], relevance)
+    assert list(pairs["C1"].items()) == [(1, 0.9), (2, 0.5)]
+    assert pairs["C2"] == {0: 0.2}
+    assert list(pairs["C3"]) == [0, 1]
+
+
+def test_predicted_llm_calls_counts_only_sent_pairs():
+    sources = _sources() + [SourceRecord(source_id="S-3", title="Empty", abstract=" ")]
+    relevance = {"C1": {"S-1": 0.8, "S-2": 0.1, "S-3": 0.9}, "C2": {"S-1": 0.6, "S-2": 0.1, "S-3": 0.9}}
+    per_pair = AgentConfig(evidence_relevance_threshold=0.3)
+    assert AgentConfig().extraction_mode == "per_pair"
+    assert predicted_llm_calls(per_pair, sources, ["C1", "C2"], relevance) == 2
+    per_source = AgentConfig(extraction_mode="per_source", evidence_relevance_threshold=0.3)
+    assert predicted_llm_calls(per_source, sources, ["C1", "C2"], relevance) == 1
+    assert predicted_llm_calls(AgentConfig(extraction_mode="extractive"), sources, ["C1"]) == 0
+
+
+def test_extractor_prefilters_pairs_and_records_relevance():
+    config = AgentConfig(
+        mock_mode=False,
+        extraction_mode="per_source",
+        max_evidence_per_chapter=1,
+        evidence_relevance_threshold=0.3,
+    )
+    relevance = {"C1": {"S-1": 0.8, "S-2": 0.1}, "C2": {"S-1": 0.2, "S-2": 0.6}}
+    llm = FakeLLM(['{"snippet": "노심"}', '{"snippet": "결합"}'])
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm, relevance=relevance)
+    assert len(llm.prompts) == 2
+    assert all("Chapters:" not in prompt for prompt in llm.prompts)
+    assert [(item.claim_id, item.relevance_score) for item in evidence] == [("C1-C001", 0.8), ("C2-C002", 0.6)]
+
+
+def test_extractor_cache_skips_llm_on_repeat_run(tmp_path):
+    config = AgentConfig(mock_mode=False, extraction_mode="per_source")
+    replies = ['{"1": {"snippet": "노심 근거"}, "2": null}', '{"1": null, "2": "결합 근거"}']
+    first = ExtractionCache(str(tmp_path), max_entries=100, model="m")
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=FakeLLM(replies), cache=first)
+    assert first.stats() == {"extraction_cache_hits": 0, "extraction_cache_misses": 4}
+
+    llm = FakeLLM([])
+    second = ExtractionCache(str(tmp_path), max_entries=100, model="m")
+    cached = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm, cache=second)
+    assert llm.prompts == []
+    assert second.stats() == {"extraction_cache_hits": 4, "extraction_cache_misses": 0}
+    assert [(item.claim_id, item.snippet) for item in cached] == [
+        (item.claim_id, item.snippet) for item in evidence
+    ]
+
+
+def test_pack_items_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(extractor_module, "count_tokens", lambda text, _model="": len(text))
+    assert pack_items(["aaaa", "bbb", "cc", "dddddddddd", "e"], budget=9, overhead=2) == [[0, 1], [2], [3], [4]]
+
+
+def test_extractor_packed_mode_matches_indexed_items(monkeypatch):
+    monkeypatch.setattr(extractor_module, "count_tokens", lambda text, _model="": len(text) // 4)
+    config = AgentConfig(mock_mode=False, extraction_mode="packed", extraction_pack_token_budget=10000)
+    llm = FakeLLM(
+        [
+            '```json\n[{"index": 3, "snippet": "결합 근거"}, {"index": "1", "snippet": "노심 근거"}, {"index": 2, "snippet": null}]\n```',
+            '{"snippet": "단독 근거"}',
+        ]
+    )
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 2
+    assert "[1]\nChapter: C1" in llm.prompts[0] and "[4]\nChapter: C2" in llm.prompts[0]
+    assert "Chapter: C2\nSource title: Second" in llm.prompts[1]
+    assert [(item.claim_id, item.snippet) for item in evidence] == [
+        ("C1-C001", "노심 근거"),
+        ("C2-C001", "결합 근거"),
+        ("C2-C002", "단독 근거"),
+    ]
+
+
+def test_extractor_packed_mode_keeps_reply_with_leading_prose(monkeypatch):
+    monkeypatch.setattr(extractor_module, "count_tokens", lambda text, _model="": len(text) // 4)
+    config = AgentConfig(mock_mode=False, extraction_mode="packed", extraction_pack_token_budget=10000)
+    reply = (
+        'Here are the results:\n[{"index": 1, "snippet": "노심"}, {"index": 2, "snippet": "결합"}, '
+        '{"index": 3, "snippet": null}, {"index": 4, "snippet": null}]'
+    )
+    llm = FakeLLM([reply])
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 1
+    assert [item.snippet for item in evidence] == ["노심", "결합"]
+
+
+def test_extractor_packed_fallbacks_run_concurrently(monkeypatch):
+    monkeypatch.setattr(extractor_module, "count_tokens", lambda text, _model="": len(text) // 4)
+    config = AgentConfig(
+        mock_mode=False, extraction_mode="packed", extraction_pack_token_budget=10000, max_concurrency=4
+    )
+    active = {"now": 0, "peak": 0}
+
+    class SlowLLM:
+        def __init__(self):
+            self.prompts = []
+
+        async def astream(self, prompt):
+            self.prompts.append(prompt)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            content = "no items" if len(self.prompts) == 1 else '{"snippet": "근거"}'
+            yield type("Chunk", (), {"content": content})
+
+    llm = SlowLLM()
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm)
+    assert len(llm.prompts) == 5
+    assert active["peak"] == 4
+    assert len(evidence) == 4
+
+
+def test_extractor_extractive_mode_quotes_sentences_without_llm():
+    config = AgentConfig(mock_mode=True, extraction_mode="extractive", extractive_max_sentences=1)
+    source = SourceRecord(
+        source_id="S-1",
+        title="First",
+        abstract="We study plant operations. A surrogate predicts reactor core temperature.",
+    )
+    evidence = extract_evidence(config, [source], ["C1"], chapter_queries={"C1": ["reactor core"]})
+    assert [(item.snippet, item.locator, item.offsets) for item in evidence] == [
+        ("A surrogate predicts reactor core temperature.", "abstract", [(27, 73)])
+    ]
+
+
+def test_extractor_extractive_llm_sends_only_selected_sentences():
+    config = AgentConfig(mock_mode=False, extraction_mode="extractive_llm", extractive_max_sentences=1)
+    source = SourceRecord(
+        source_id="S-1",
+        title="First",
+        abstract="We study plant operations. A surrogate predicts reactor core temperature.",
+    )
+    llm = FakeLLM(['{"snippet": "노심 온도 대리모델", "locator": "p.1"}'])
+    evidence = extract_evidence(config, [source], ["reactor core"], llm=llm)
+    assert "Excerpt: A surrogate predicts reactor core temperature." in llm.prompts[0]
+    assert "plant operations" not in llm.prompts[0]
+    assert [(item.snippet, item.locator, item.offsets) for item in evidence] == [
+        ("노심 온도 대리모델", "abstract", [(27, 73)])
+    ]
+
+
+def test_extractor_aborts_refusals_and_counts_them():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_source", max_concurrency=1)
+    llm = FakeLLM(
+        [
+            "Sorry, I do not have access to the full paper text.",
+            '{"snippet": "첫째"}',
+            '{"snippet": "둘째"}',
+            '{"1": null, "2": {"snippet": "결합 근거"}}',
+        ]
+    )
+    stats = {}
+    evidence = extract_evidence(config, _sources(), ["C1", "C2"], llm=llm, stats=stats)
+    assert len(llm.prompts) == 4
+    assert [item.snippet for item in evidence] == ["첫째", "둘째", "결합 근거"]
+    assert stats["extraction_streams_aborted"] == 1
+    assert stats["extraction_aborted_refusal"] == 1
+
+
+def _three_sources():
+    return _sources() + [SourceRecord(source_id="S-3", title="Third", abstract="Thermal hydraulics.")]
+
+
+def test_extraction_guard_reads_chunks_incrementally():
+    guard = extraction_guard(expect_json=False)
+    assert guard("  I am so") is None
+    assert guard("rry, no.") == "refusal"
+    json_guard = extraction_guard(expect_json=True)
+    assert json_guard('{"1": ') is None
+    assert json_guard('"sorry"}') is None
+    assert json_guard(" trailing") == "invalid_json"
+
+
+def test_extractor_per_pair_stops_at_chapter_quota():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_pair", max_evidence_per_chapter=1)
+    relevance = {"C1": {"S-1": 0.9, "S-2": 0.8, "S-3": 0.7}}
+    llm = FakeLLM(["Sorry, I cannot provide that.", '{"snippet": "결합 근거"}'])
+    stats = {}
+    evidence = extract_evidence(config, _three_sources(), ["C1"], llm=llm, relevance=relevance, stats=stats)
+    assert len(llm.prompts) == 2
+    assert "Source title: First" in llm.prompts[0] and "Source title: Second" in llm.prompts[1]
+    assert [(item.claim_id, item.relevance_score) for item in evidence] == [("C1-C002", 0.8)]
+    assert stats["extraction_pairs_skipped"] == 1
+
+
+def test_extractor_per_source_cancels_sources_once_quotas_fill():
+    config = AgentConfig(
+        mock_mode=False,
+        extraction_mode="per_source",
+        max_evidence_per_chapter=1,
+        max_concurrency=1,
+    )
+    relevance = {"C1": {"S-1": 0.4, "S-2": 0.9, "S-3": 0.3}, "C2": {"S-1": 0.5, "S-2": 0.6, "S-3": 0.35}}
+    llm = FakeLLM(['{"1": {"snippet": "노심"}, "2": {"snippet": "결합"}}'])
+    stats = {}
+    evidence = extract_evidence(config, _three_sources(), ["C1", "C2"], llm=llm, relevance=relevance, stats=stats)
+    assert len(llm.prompts) == 1 and "Source title: Second" in llm.prompts[0]
+    assert [item.claim_id for item in evidence] == ["C1-C002", "C2-C002"]
+    assert stats["extraction_tasks_cancelled"] == 2
+
+
+def test_extractor_reports_each_chapter_once_its_evidence_is_final():
+    config = AgentConfig(mock_mode=False, extraction_mode="per_source", max_evidence_per_chapter=1, max_concurrency=1)
+    relevance = {"C1": {"S-1": 0.9, "S-2": 0.5}, "C2": {"S-1": 0.1, "S-2": 0.8}}
+    llm = FakeLLM(['{"snippet": "노심"}', '{"snippet": "결합"}'])
+    completed = []
+    evidence = asyncio.run(
+        extract_evidence_async(
+            config,
+            _sources(),
+            ["C1", "C2"],
+            llm=llm,
+            relevance=relevance,
+            on_chapter=lambda chapter, items: completed.append((chapter, [item.claim_id for item in items], len(llm.prompts))),
+        )
+    )
+    assert completed == [("C1", ["C1-C001"], 1), ("C2", ["C2-C002"], 2)]
+    assert [item.claim_id for item in evidence] == ["C1-C001", "C2-C002"]
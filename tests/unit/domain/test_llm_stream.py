@@ -1,6 +1,8 @@
 import asyncio
 
-from backend.domain.kaeri_ar_agent.llm_stream import stream_llm_response
+import pytest
+
+from backend.domain.kaeri_ar_agent.llm_stream import JsonPrefixGuard, StreamAborted, stream_llm_response
 
 
 class FakeChunk:
@@ -24,3 +26,51 @@ def test_stream_llm_response_collects_chunks():
     assert text == "Hello world"
     assert any(event[1] == "llm stream started" for event in events)
     assert any(event[1] == "llm stream completed" for event in events)
+
+
+class CountingLLM:
+    def __init__(self, parts):
+        self.parts = parts
+        self.yielded = 0
+        self.closed = False
+
+    async def astream(self, _prompt):
+        try:
+            for part in self.parts:
+                self.yielded += 1
+                yield FakeChunk(part)
+        finally:
+            self.closed = True
+
+
+def test_stream_llm_response_aborts_and_closes_stream():
+    events = []
+    llm = CountingLLM(["Sorry, ", "I cannot ", "help", " with", " that."])
+
+    def emit(agent, message, payload):
+        events.append((message, payload))
+
+    seen = []
+
+    def guard(delta):
+        seen.append(delta)
+        return "refusal" if "Sorry" in delta else None
+
+    with pytest.raises(StreamAborted) as aborted:
+        asyncio.run(stream_llm_response(llm, "Prompt", emit, "tester", should_abort=guard))
+    assert aborted.value.reason == "refusal"
+    assert aborted.value.text == "Sorry, "
+    assert llm.yielded == 1 and llm.closed
+    assert seen == ["Sorry, "]
+    assert events[-1][1]["aborted"] is True
+
+
+def test_json_prefix_guard_tracks_validity():
+    guard = JsonPrefixGuard()
+    assert guard("```json\n") is None
+    assert guard('{"1": {"snippet": "a } b"}, ') is None
+    assert guard('"2": null}\n```') is None
+    assert JsonPrefixGuard()("Here is the JSON") == "invalid_json"
+    assert JsonPrefixGuard()('{"a": [1}') == "invalid_json"
+    assert JsonPrefixGuard()('[1, 2] and more') == "invalid_json"
+    assert JsonPrefixGuard()('  [{"s": "\\"quoted\\" ]"}]') is None
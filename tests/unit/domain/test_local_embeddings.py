@@ -0,0 +1,50 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.domain.kaeri_ar_agent.tools.local_embeddings import (
+    HashingEmbeddings,
+    SentenceTransformerEmbeddings,
+)
+
+
+def test_hashing_embeddings_are_deterministic_and_normalized():
+    embeddings = HashingEmbeddings(dim=256)
+    first = np.asarray(embeddings.embed_documents(["reactor core neutron flux", ""]))
+    second = np.asarray(asyncio.run(embeddings.aembed_documents(["reactor core neutron flux"])))
+    assert first.shape == (2, 256)
+    assert np.allclose(first[0], second[0])
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+
+def test_hashing_embeddings_rank_lexical_overlap():
+    embeddings = HashingEmbeddings(dim=1024)
+    query = np.asarray(embeddings.embed_query("neutron flux in reactor core"))
+    related, unrelated = np.asarray(
+        embeddings.embed_documents(
+            ["Neutron flux estimation for reactor core monitoring", "Protein folding with graph networks"]
+        )
+    )
+    assert query @ related > query @ unrelated
+
+
+def test_hashing_embeddings_rejects_invalid_dim():
+    with pytest.raises(ValueError):
+        HashingEmbeddings(dim=0)
+
+
+def test_sentence_transformer_requires_optional_dependency(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "sentence_transformers":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    with pytest.raises(ValueError):
+        SentenceTransformerEmbeddings("any-model")
@@ -1,6 +1,7 @@
 from backend.domain.kaeri_ar_agent.pipeline import (
     _classify_g2_route,
     _classify_qa_route,
+    _flagged_chapters,
     _normalize_citations_node,
 )
 from backend.domain.kaeri_ar_agent.schemas import DraftNode
@@ -16,6 +17,17 @@ def test_classify_qa_route():
     assert _classify_qa_route(["구조 문제"]) == "compose"
     assert _classify_qa_route(["문체 문제"]) == "write"
     assert _classify_qa_route(["출처 문제"]) == "refine"
+    missing = "Missing required section: 방법론"
+    assert _classify_qa_route([missing], {missing: "compose"}) == "compose"
+    leaked = "[C1] Excluded term mentioned: 출처"
+    assert _classify_qa_route([leaked], {leaked: "write"}) == "write"
+    assert _classify_qa_route([leaked, "주제 이탈"], {leaked: "write"}) == "outline"
+
+
+def test_flagged_chapters_requires_every_issue_tagged():
+    assert _flagged_chapters(["[C1] 문체 문제", "[C1] 존칭", "[C2] 문체"], ["C1", "C2"]) == ["C1", "C2"]
+    assert _flagged_chapters(["[C1] 문체 문제", "문체 문제"], ["C1", "C2"]) is None
+    assert _flagged_chapters(["[C9] 문체 문제"], ["C1", "C2"]) is None
 
 
 def test_normalize_citations_node():
@@ -1,3 +1,4 @@
+from backend.domain.kaeri_ar_agent import pipeline
 from backend.domain.kaeri_ar_agent.pipeline import (
     _audit_node,
     _compose_node,
@@ -16,7 +17,7 @@ from backend.domain.kaeri_ar_agent.pipeline import (
     _write_node,
 )
 from backend.domain.kaeri_ar_agent.config import AgentConfig
-from backend.domain.kaeri_ar_agent.schemas import PipelineInputs
+from backend.domain.kaeri_ar_agent.schemas import DraftNode, PipelineInputs
 
 
 def test_pipeline_nodes_mock_flow():
@@ -38,3 +39,53 @@ def test_pipeline_nodes_mock_flow():
     state.update(_qa_node(state, config, emit=None))
     state.update(_refine_node(state, config, emit=None))
     assert state.get("composed_text") is not None
+
+
+def test_extract_node_drafts_chapters_before_write(monkeypatch):
+    config = AgentConfig(mock_mode=True, stream_chapter_drafts=True)
+    inputs = PipelineInputs(topic="topic", outline=["C1", "C2"])
+    state = _init_state(inputs, config)
+    for node in (_plan_node, _retrieve_node):
+        state.update(node(state, config, emit=None))
+    state.update(_resolve_node(state, config, emit=None))
+    state.update(_status_node(state, config, emit=None))
+    events = []
+    state.update(_extract_node(state, config, emit=lambda agent, message, payload: events.append(message)))
+    assert set(state["streamed_drafts"]) == {"C1", "C2"}
+    assert state["evidence_stats"]["early_drafts"] == 2
+    assert events.index("early chapter drafting started: C1") < events.index(
+        next(message for message in events if message.startswith("evidence extraction completed"))
+    )
+
+    written = []
+
+    def fake_write_chapters(_config, _topic, _scope, _exclusions, outline, *_args, **_kwargs):
+        written.append(list(outline))
+        return []
+
+    monkeypatch.setattr(pipeline, "write_chapters", fake_write_chapters)
+    update = _write_node(state, config, emit=None)
+    assert written == [[]]
+    assert [draft.chapter_id for draft in update["drafts"]] == ["C1", "C2"]
+    assert update["streamed_drafts"] == {}
+
+
+def test_qa_write_route_redrafts_only_flagged_chapters():
+    config = AgentConfig(mock_mode=True)
+    inputs = PipelineInputs(topic="topic", outline=["C1", "C2"])
+    state = _init_state(inputs, config)
+    state["gates"] = {"g2_passed": True}
+    state["drafts"] = [
+        DraftNode(chapter_id="C1", paragraph_id="C1-P001", text="C1 본문입니다", citation_source_ids=[]),
+        DraftNode(chapter_id="C2", paragraph_id="C2-P001", text="C2 본문", citation_source_ids=[]),
+    ]
+    state.update(_qa_node(state, config, emit=None))
+    assert state["qa_route"] == "write"
+    assert state["rewrite_chapters"] == ["C1"]
+
+    state.update(_write_node(state, config, emit=None))
+    assert state["drafts"][1].text == "C2 본문"
+    assert "입니다" not in state["drafts"][0].text
+
+    state.update(_qa_node(state, config, emit=None))
+    assert state["last_issues"] == []
@@ -18,6 +18,12 @@ def test_parse_prompt_non_empty():
     inputs = parse_prompt("test prompt")
     assert inputs.raw_prompt == "test prompt"
     assert inputs.outline == []
+    assert inputs.arxiv_ids == []
+
+
+def test_parse_prompt_collects_pasted_arxiv_ids():
+    inputs = parse_prompt("참고: arXiv:2401.01234v2, https://arxiv.org/abs/hep-th/9901001 및 2312.00001")
+    assert inputs.arxiv_ids == ["2401.01234v2", "hep-th/9901001", "2312.00001"]
 
 
 def test_prompt_intro_text():
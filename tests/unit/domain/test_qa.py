@@ -1,6 +1,6 @@
 import asyncio
 
-from backend.domain.kaeri_ar_agent.agents.qa import qa_checks, qa_checks_async
+from backend.domain.kaeri_ar_agent.agents.qa import issue_chapter, qa_checks, qa_checks_async
 from backend.domain.kaeri_ar_agent.schemas import DraftNode
 
 
@@ -18,4 +18,83 @@ def test_qa_checks_basic():
 def test_qa_checks_with_llm():
     drafts = [DraftNode(chapter_id="C1", paragraph_id="P1", text="text", citation_source_ids=[])]
     issues = asyncio.run(qa_checks_async(drafts, llm=FakeLLM()))
-    assert "extra issue" in issues
+    assert "[C1] extra issue" in issues
+
+
+def test_qa_checks_tag_issues_with_chapter():
+    class TaggingLLM:
+        async def astream(self, _prompt):
+            yield type("Chunk", (), {"content": '[{"chapter_id": "C2", "issue": "문체 문제"}]'})
+
+    drafts = [
+        DraftNode(chapter_id="C1", paragraph_id="P1", text="입니다", citation_source_ids=[]),
+        DraftNode(chapter_id="C2", paragraph_id="P1", text="text", citation_source_ids=[]),
+    ]
+    issues = asyncio.run(qa_checks_async(drafts, llm=TaggingLLM()))
+    assert [issue_chapter(issue) for issue in issues] == ["C1", "C2"]
+
+
+def test_qa_llm_reviews_only_chapters_passing_rules():
+    prompts = []
+
+    class RecordingLLM:
+        async def astream(self, prompt):
+            prompts.append(prompt)
+            yield type("Chunk", (), {"content": "[]"})
+
+    drafts = [
+        DraftNode(chapter_id="C1", paragraph_id="P1", text="정리합니다", citation_source_ids=[]),
+        DraftNode(chapter_id="C2", paragraph_id="P1", text="정리한다", citation_source_ids=[]),
+    ]
+    stats = {}
+    issues = asyncio.run(qa_checks_async(drafts, llm=RecordingLLM(), stats=stats))
+    assert [issue_chapter(issue) for issue in issues] == ["C1"]
+    assert "[C2]" in prompts[0] and "[C1]" not in prompts[0]
+    assert stats == {"qa_rule_failed_chapters": 1, "qa_llm_chapters": 1, "qa_cached_chapters": 0}
+
+    asyncio.run(qa_checks_async(drafts[1:], llm=RecordingLLM(), sample_rate=0.0))
+    assert len(prompts) == 1
+
+
+def test_qa_reviews_chapters_concurrently_and_caches_passes():
+    active = 0
+    peak = 0
+    reviewed = []
+
+    class SlowLLM:
+        async def astream(self, prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            reviewed.append(prompt.splitlines()[-1].split("]")[0].lstrip("["))
+            await asyncio.sleep(0.01)
+            active -= 1
+            yield type("Chunk", (), {"content": '["문체 문제"]' if "C2" in prompt else "[]"})
+
+    drafts = [
+        DraftNode(chapter_id=f"C{index}", paragraph_id="P1", text=f"본문 {index}", citation_source_ids=[])
+        for index in range(1, 5)
+    ]
+    passed = {}
+    issues = asyncio.run(qa_checks_async(drafts, llm=SlowLLM(), passed=passed, max_concurrency=2))
+    assert issues == ["[C2] 문체 문제"]
+    assert peak == 2
+    assert set(passed) == {"C1", "C3", "C4"}
+
+    reviewed.clear()
+    rewritten = drafts[:1] + [drafts[1].model_copy(update={"text": "고친 본문"})] + drafts[2:]
+    stats = {}
+    issues = asyncio.run(qa_checks_async(rewritten, llm=SlowLLM(), passed=passed, stats=stats))
+    assert reviewed == ["C2"]
+    assert stats["qa_cached_chapters"] == 3
+
+
+def test_qa_unparseable_review_is_not_cached_as_pass():
+    class ProseLLM:
+        async def astream(self, _prompt):
+            yield type("Chunk", (), {"content": "No problems found."})
+
+    drafts = [DraftNode(chapter_id="C1", paragraph_id="P1", text="text", citation_source_ids=[])]
+    passed = {}
+    assert asyncio.run(qa_checks_async(drafts, llm=ProseLLM(), passed=passed)) == []
+    assert passed == {}
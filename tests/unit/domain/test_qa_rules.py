@@ -0,0 +1,38 @@
+from backend.domain.kaeri_ar_agent.agents.qa_rules import (
+    check_draft_rules,
+    check_required_sections,
+    compile_exclusions,
+)
+from backend.domain.kaeri_ar_agent.schemas import DraftNode
+
+
+def _draft(text, sources=("S-1",)):
+    return DraftNode(chapter_id="C1", paragraph_id="P1", text=text, citation_source_ids=list(sources))
+
+
+def test_rules_accept_plain_cited_report_style():
+    assert check_draft_rules(_draft("핵심 기술을 정리한다 (S-1).\n\n난제를 논의한다 (S-1).")) == []
+
+
+def test_rules_flag_honorifics_uncited_paragraphs_and_exclusions():
+    pattern = compile_exclusions(["Fusion", " "])
+    issues = check_draft_rules(
+        _draft("핵심 기술을 정리합니다 (S-1).\n\nfusion 응용도 다룬다."), pattern, min_citations=1
+    )
+    assert issues == [
+        "[C1] Honorific ending found: 합니다",
+        "[C1] Paragraph 2 has fewer than 1 citation(s).",
+        "[C1] Excluded term mentioned: fusion",
+    ]
+
+
+def test_citation_density_skipped_without_evidence():
+    assert check_draft_rules(_draft("근거 없이 정리한다.", sources=())) == []
+
+
+def test_required_sections_must_be_present_and_non_empty():
+    text = "## 초록\n요약 본문\n**키워드**: \n## 참고문헌\n[1] ref\n"
+    assert check_required_sections(text, ["초록", "키워드", "방법론", "참고문헌"]) == [
+        "Missing required section: 키워드",
+        "Missing required section: 방법론",
+    ]
@@ -0,0 +1,55 @@
+import json
+
+from backend.domain.kaeri_ar_agent.tools import query_cache as query_cache_module
+from backend.domain.kaeri_ar_agent.tools.query_cache import QueryCache, normalize_query, query_key
+
+
+def test_normalize_query_collapses_case_and_whitespace():
+    assert normalize_query("  Reactor   CORE\tAI ") == "reactor core ai"
+    assert query_key("Reactor  core", 5) == query_key("reactor core", 5)
+    assert query_key("reactor core", 5) != query_key("reactor core", 10)
+
+
+def test_run_layer_hits_without_disk():
+    cache = QueryCache()
+    assert cache.get("q", 5) is None
+    cache.put("q", 5, [{"source_id": "S-1"}])
+    assert cache.get(" Q ", 5) == [{"source_id": "S-1"}]
+    assert cache.stats() == {
+        "query_cache_run_hits": 1,
+        "query_cache_persistent_hits": 0,
+        "query_cache_misses": 1,
+    }
+
+
+def test_run_entries_seed_the_run_layer():
+    seeded = QueryCache(run_entries={query_key("q", 5): []})
+    assert seeded.get("q", 5) == []
+
+
+def test_persistent_layer_respects_ttl(tmp_path, monkeypatch):
+    now = {"value": 1000.0}
+    monkeypatch.setattr(query_cache_module.time, "time", lambda: now["value"])
+    QueryCache(str(tmp_path), ttl_s=60).put("q", 5, [{"source_id": "S-1"}])
+
+    fresh = QueryCache(str(tmp_path), ttl_s=60)
+    assert fresh.get("q", 5) == [{"source_id": "S-1"}]
+    assert fresh.persistent_hits == 1
+    assert fresh.get("q", 5) == [{"source_id": "S-1"}]
+    assert fresh.run_hits == 1
+
+    now["value"] = 1061.0
+    assert QueryCache(str(tmp_path), ttl_s=60).get("q", 5) is None
+
+
+def test_zero_ttl_disables_disk_layer(tmp_path):
+    QueryCache(str(tmp_path), ttl_s=0).put("q", 5, [])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_corrupt_cache_file_is_a_miss(tmp_path):
+    cache = QueryCache(str(tmp_path), ttl_s=60)
+    cache.put("q", 5, [])
+    for path in tmp_path.iterdir():
+        path.write_text(json.dumps(["bad"]), encoding="utf-8")
+    assert QueryCache(str(tmp_path), ttl_s=60).get("q", 5) is None
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+from backend.domain.kaeri_ar_agent.agents import resolver
 from backend.domain.kaeri_ar_agent.agents.resolver import resolve_sources
 from backend.domain.kaeri_ar_agent.config import AgentConfig
 from backend.domain.kaeri_ar_agent.providers import ProviderClients
@@ -64,7 +67,8 @@ def test_resolver_prefers_doi_crossref():
     assert resolved[0].canonical_metadata.title == "Canonical Title"
 
 
-def test_resolver_preprint_only_when_no_doi():
+def test_resolver_preprint_only_when_no_doi(monkeypatch):
+    monkeypatch.setattr(resolver, "fetch_by_ids", lambda *_args, **_kwargs: [])
     providers = ProviderClients(
         crossref=FakeCrossref(None),
         openalex=FakeOpenAlex(),
@@ -81,3 +85,38 @@ def test_resolver_preprint_only_when_no_doi():
     assert stats.preprint_only == 1
     assert resolved[0].canonical_source_id == "arxiv:9999.0000"
     assert resolved[0].preprint_only is True
+
+
+def test_resolver_refreshes_missing_dois_in_one_batch(monkeypatch):
+    calls = []
+
+    def fake_fetch_by_ids(base_url, arxiv_ids, timeout_s, **kwargs):
+        calls.append(list(arxiv_ids))
+        return [
+            {
+                "doi": "10.1234/abcd",
+                "abstract": "Fresh abstract",
+                "identifiers": {"arxiv_id": "1234.5678v2", "doi": "10.1234/abcd"},
+            }
+        ]
+
+    monkeypatch.setattr(resolver, "fetch_by_ids", fake_fetch_by_ids)
+    providers = ProviderClients(
+        crossref=FakeCrossref(None),
+        openalex=FakeOpenAlex(),
+        semanticscholar=FakeS2(),
+        unpaywall=FakeUnpaywall(),
+    )
+    sources = [
+        SourceRecord(source_id="S-ARXIV-1234.5678", title="Known"),
+        SourceRecord(source_id="S-ARXIV-9999.0000", title="Unknown"),
+        SourceRecord(source_id="S-ARXIV-1111.2222", title="Has DOI", doi="10.9/x"),
+        SourceRecord(source_id="S-ARXIV-3333.4444", title="Fresh", retrieved_at=datetime.utcnow().isoformat()),
+        SourceRecord(source_id="S-ARXIV-5555.6666", title="Old", retrieved_at="2020-01-01T00:00:00"),
+    ]
+    resolved, stats = resolve_sources(AgentConfig(mock_mode=False), sources, providers=providers)
+    assert calls == [["1234.5678", "9999.0000", "5555.6666"]]
+    assert stats.arxiv_refreshed == 1
+    assert resolved[0].canonical_source_id == "doi:10.1234/abcd"
+    assert resolved[0].abstract == "Fresh abstract"
+    assert resolved[1].preprint_only is True
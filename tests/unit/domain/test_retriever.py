@@ -1,13 +1,348 @@
-from backend.domain.kaeri_ar_agent.agents.retriever import _cosine_similarity, retrieve_sources
+import numpy as np
+
+from backend.domain.kaeri_ar_agent.agents.retriever import (
+    _cosine_similarity,
+    _cosine_similarity_matrix,
+    _select_covering_sources,
+    _top_k_indices,
+    retrieve_sources,
+)
 from backend.domain.kaeri_ar_agent.config import AgentConfig
 
 
 def test_cosine_similarity():
     assert _cosine_similarity([1, 0], [1, 0]) == 1.0
     assert _cosine_similarity([1, 0], [0, 1]) == 0.0
+    assert _cosine_similarity([0, 0], [1, 0]) == 0.0
+    assert _cosine_similarity([1, 0], [1, 0, 0]) == 0.0
+
+
+def test_cosine_similarity_matrix_handles_zero_rows():
+    scores = _cosine_similarity_matrix(np.array([[2.0, 0.0], [0.0, 0.0]]), np.array([[1.0, 0.0], [1.0, 1.0]]))
+    assert scores.shape == (2, 2)
+    assert np.allclose(scores[0], [1.0, 2 ** -0.5])
+    assert np.allclose(scores[1], [0.0, 0.0])
+
+
+def test_top_k_indices_orders_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, 0.3, 0.2, 0.1]])
+    assert _top_k_indices(scores, 2).tolist() == [[1, 3], [0, 1]]
+    assert _top_k_indices(scores, 10).tolist() == [[1, 3, 2, 0], [0, 1, 2, 3]]
+    assert _top_k_indices(scores, 0).shape == (2, 0)
 
 
 def test_retrieve_sources_mock_mode():
     config = AgentConfig(mock_mode=True)
     sources = retrieve_sources(config, {"C1": ["query"]})
     assert sources
+
+
+def test_retrieve_sources_mock_mode_ranks_with_local_backend():
+    config = AgentConfig(mock_mode=True, embedding_backend="hashing", cache_dir=None)
+    events = []
+    sources = retrieve_sources(
+        config,
+        {"C1": ["nuclear simulation"]},
+        emit=lambda agent, message, payload=None: events.append(message),
+    )
+    assert [source.source_id for source in sources] == ["S-ARXIV-0001"]
+    assert "embedding ranking completed" in events
+
+
+def test_select_covering_sources_prefers_shared_coverage():
+    # Source 2 is relevant to both chapters, so it alone covers the outline.
+    scores = np.array([[0.9, 0.1, 0.6], [0.1, 0.9, 0.6]])
+    vectors = np.eye(3)
+    assert _select_covering_sources(scores, vectors, 0.5, 1, 10, 0.7) == [2]
+
+
+def test_select_covering_sources_penalizes_redundant_sources():
+    scores = np.array([[0.9, 0.88, 0.8]])
+    vectors = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+    assert _select_covering_sources(scores, vectors, 0.5, 2, 10, 0.5) == [0, 2]
+
+
+def test_select_covering_sources_falls_back_and_respects_budget():
+    scores = np.array([[0.9, 0.1], [0.2, 0.1]])
+    vectors = np.eye(2)
+    assert _select_covering_sources(scores, vectors, 0.5, 1, 10, 0.7) == [0]
+    scores = np.array([[0.1, 0.2], [0.3, 0.1]])
+    assert _select_covering_sources(scores, vectors, 0.5, 1, 10, 0.7) == [1, 0]
+    assert _select_covering_sources(scores, vectors, 0.5, 1, 1, 0.7) == [1]
+    assert _select_covering_sources(scores, vectors, 0.5, 1, 0, 0.7) == []
+    assert _select_covering_sources(np.zeros((0, 2)), vectors, 0.5, 1, 3, 0.7) == []
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_documents(self, texts):
+        self.calls += 1
+        return [[1.0, 0.0] if "reactor" in text else [0.0, 1.0] for text in texts]
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        return [1.0, 0.0] if "reactor" in text else [0.0, 1.0]
+
+
+def test_rank_sources_reuses_embedding_cache(tmp_path, monkeypatch):
+    import asyncio
+
+    from backend.domain.kaeri_ar_agent.agents.retriever import _rank_sources_with_embeddings
+    from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: embeddings)
+    config = AgentConfig(mock_mode=False, max_sources=1, cache_dir=str(tmp_path))
+    sources = [
+        SourceRecord(source_id="S-1", title="fluid"),
+        SourceRecord(source_id="S-2", title="reactor core"),
+    ]
+    ranked = asyncio.run(_rank_sources_with_embeddings(config, {"C1": ["reactor"]}, sources))
+    assert [source.source_id for source in ranked] == ["S-2"]
+    calls = embeddings.calls
+    asyncio.run(_rank_sources_with_embeddings(config, {"C1": ["reactor"]}, sources))
+    assert embeddings.calls == calls
+
+
+def test_rank_sources_batches_queries_and_drops_duplicates(monkeypatch):
+    import asyncio
+
+    from backend.domain.kaeri_ar_agent.agents.retriever import _rank_sources_with_embeddings
+    from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: embeddings)
+    config = AgentConfig(mock_mode=False, max_sources=4, cache_dir=None, source_selection="ranked")
+    sources = [
+        SourceRecord(source_id="S-1", title="reactor core"),
+        SourceRecord(source_id="S-2", title="fluid"),
+        SourceRecord(source_id="S-1", title="reactor core"),
+        SourceRecord(source_id="S-3", title="reactor physics"),
+    ]
+    plan = {"C1": ["reactor"], "C2": ["fluid"]}
+    ranked = asyncio.run(_rank_sources_with_embeddings(config, plan, sources))
+    assert [source.source_id for source in ranked] == ["S-1", "S-2", "S-3"]
+    assert embeddings.calls == 2
+
+
+def test_retrieve_sources_local_backend(tmp_path, monkeypatch):
+    import json
+
+    import pytest
+
+    from backend.domain.kaeri_ar_agent.tools.arxiv_corpus import load_arxiv_corpus
+
+    snapshot = tmp_path / "snapshot.jsonl"
+    snapshot.write_text(
+        json.dumps({"id": "2401.00001", "title": "Reactor core surrogate", "abstract": "reactor"}) + "\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: FakeEmbeddings())
+    load_arxiv_corpus.cache_clear()
+    config = AgentConfig(
+        mock_mode=False,
+        cache_dir=None,
+        retrieval_backend="local",
+        arxiv_corpus_path=str(snapshot),
+    )
+    sources = retrieve_sources(config, {"C1": ["reactor core"]})
+    assert [source.source_id for source in sources] == ["S-ARXIV-2401.00001"]
+    with pytest.raises(ValueError):
+        retrieve_sources(AgentConfig(mock_mode=False, retrieval_backend="local"), {"C1": ["q"]})
+
+
+def test_rank_sources_coverage_selects_covering_source(monkeypatch):
+    import asyncio
+
+    from backend.domain.kaeri_ar_agent.agents.retriever import _rank_sources_with_embeddings
+    from backend.domain.kaeri_ar_agent.schemas import SourceRecord
+
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: FakeEmbeddings())
+    config = AgentConfig(
+        mock_mode=False,
+        max_sources=10,
+        cache_dir=None,
+        source_selection="coverage",
+        selection_chapter_coverage=1,
+    )
+    sources = [
+        SourceRecord(source_id="S-1", title="reactor core", abstract="Reactor core design."),
+        SourceRecord(source_id="S-2", title="reactor physics", abstract="Reactor physics."),
+        SourceRecord(source_id="S-3", title="fluid", abstract="Fluid flow."),
+    ]
+    events = []
+    ranked = asyncio.run(
+        _rank_sources_with_embeddings(
+            config,
+            {"C1": ["reactor"], "C2": ["reactor"]},
+            sources,
+            emit=lambda agent, message, payload: events.append(payload),
+        )
+    )
+    assert [source.source_id for source in ranked] == ["S-1"]
+    assert events[-1]["selected_sources"] == 1
+    assert "predicted_extractor_calls" not in events[-1]
+
+
+def test_retrieve_sources_fetches_each_query_once(monkeypatch):
+    from backend.domain.kaeri_ar_agent.agents import retriever
+    from backend.domain.kaeri_ar_agent.tools.query_cache import QueryCache
+
+    calls = []
+
+    async def fake_query(_base_url, query, *_args, **_kwargs):
+        calls.append(query)
+        arxiv_id = "1" if "reactor" in query else "2"
+        return (
+            '<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+            f"<id>http://arxiv.org/abs/{arxiv_id}</id><title>{query}</title>"
+            "</entry></feed>"
+        )
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: FakeEmbeddings())
+    config = AgentConfig(mock_mode=False, cache_dir=None)
+    cache = QueryCache()
+    plan = {"C1": ["reactor", "fluid"], "C2": ["Reactor "]}
+    retrieve_sources(config, plan, query_cache=cache)
+    assert sorted(calls) == ["fluid", "reactor"]
+
+    plan["C2"].append("new query")
+    retrieve_sources(config, plan, query_cache=cache)
+    assert sorted(calls) == ["fluid", "new query", "reactor"]
+    assert cache.run_hits == 2
+
+
+def _feed(arxiv_id, title):
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+        f"<id>http://arxiv.org/abs/{arxiv_id}</id><title>{title}</title>"
+        "</entry></feed>"
+    )
+
+
+def test_retrieve_sources_keeps_known_arxiv_ids(monkeypatch):
+    from backend.domain.kaeri_ar_agent.agents import retriever
+    from backend.domain.kaeri_ar_agent.tools.query_cache import QueryCache
+
+    id_calls = []
+
+    async def fake_query(_base_url, query, *_args, **_kwargs):
+        return _feed("2", "fluid dynamics")
+
+    async def fake_fetch_by_ids(_base_url, arxiv_ids, *_args, **_kwargs):
+        id_calls.append(list(arxiv_ids))
+        return [
+            {"source_id": "S-ARXIV-9v1", "title": "pinned paper", "identifiers": {"arxiv_id": "9v1"}},
+            {"source_id": "S-ARXIV-2", "title": "fluid dynamics", "identifiers": {"arxiv_id": "2"}},
+        ]
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    monkeypatch.setattr(retriever, "fetch_by_ids_async", fake_fetch_by_ids)
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: FakeEmbeddings())
+    config = AgentConfig(mock_mode=False, cache_dir=None, max_sources=2)
+    cache = QueryCache()
+    for _ in range(2):
+        sources = retrieve_sources(config, {"C1": ["fluid"]}, query_cache=cache, arxiv_ids=["9", "2"])
+        assert [source.source_id for source in sources] == ["S-ARXIV-9v1", "S-ARXIV-2"]
+    assert id_calls == [["9", "2"]]
+
+
+def test_retrieve_sources_restricts_to_submission_window(monkeypatch):
+    from backend.domain.kaeri_ar_agent.agents import retriever
+
+    calls = []
+
+    async def fake_query(_base_url, query, *_args, sort_by=None, **_kwargs):
+        calls.append((query, sort_by))
+        return _feed("1", "reactor")
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: FakeEmbeddings())
+    config = AgentConfig(mock_mode=False, cache_dir=None)
+    retrieve_sources(config, {"C1": ["reactor"]}, submitted_after="2026-01-15")
+    assert len(calls) == 1
+    assert calls[0][0].startswith("(reactor) AND submittedDate:[202601150000 TO ")
+    assert calls[0][1] == "submittedDate"
+
+
+def test_retrieve_sources_reports_chapter_relevance(monkeypatch):
+    from backend.domain.kaeri_ar_agent.agents import retriever
+
+    async def fake_query(_base_url, query, *_args, **_kwargs):
+        return _feed("1", "reactor core") if "reactor" in query else _feed("2", "fluid")
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: embeddings)
+    rescored = []
+
+    async def fake_score(_config, _plan_queries, sources, _store):
+        rescored.append(sources)
+        return {}
+
+    monkeypatch.setattr(retriever, "score_source_relevance", fake_score)
+    config = AgentConfig(mock_mode=False, cache_dir=None, source_selection="ranked")
+    relevance = {}
+    sources = retrieve_sources(config, {"C1": ["reactor"], "C2": ["fluid"]}, relevance=relevance)
+    assert {source.source_id for source in sources} == {"S-ARXIV-1", "S-ARXIV-2"}
+    # Scores come from the ranking pass; nothing is embedded or looked up again.
+    assert rescored == []
+    assert relevance["C1"]["S-ARXIV-1"] > relevance["C1"]["S-ARXIV-2"]
+    assert relevance["C2"]["S-ARXIV-2"] > relevance["C2"]["S-ARXIV-1"]
+
+
+def test_iter_source_batches_yields_fastest_query_first(monkeypatch):
+    import asyncio
+
+    from backend.domain.kaeri_ar_agent.agents import retriever
+
+    async def fake_query(_base_url, query, *_args, **_kwargs):
+        await asyncio.sleep(0.05 if query == "slow" else 0)
+        return _feed(query, query)
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    config = AgentConfig(mock_mode=False, cache_dir=None)
+
+    async def collect():
+        return [
+            [source.title for source in batch]
+            async for batch in retriever.iter_source_batches(config, {"C1": ["slow", "fast"]})
+        ]
+
+    assert asyncio.run(collect()) == [["fast"], ["slow"]]
+    mock_batches = asyncio.run(_collect_mock())
+    assert len(mock_batches) == 1
+
+
+async def _collect_mock():
+    from backend.domain.kaeri_ar_agent.agents.retriever import iter_source_batches
+
+    return [batch async for batch in iter_source_batches(AgentConfig(mock_mode=True), {"C1": ["q"]})]
+
+
+def test_retrieve_sources_embeds_batches_before_slow_queries_finish(monkeypatch):
+    import asyncio
+
+    from backend.domain.kaeri_ar_agent.agents import retriever
+
+    timeline = []
+
+    async def fake_query(_base_url, query, *_args, **_kwargs):
+        await asyncio.sleep(0.05 if query == "slow fluid" else 0)
+        timeline.append(f"fetched:{query}")
+        return _feed(query.replace(" ", ""), query)
+
+    class RecordingEmbeddings(FakeEmbeddings):
+        async def aembed_documents(self, texts):
+            timeline.append(f"embedded:{','.join(texts)}")
+            return await super().aembed_documents(texts)
+
+    monkeypatch.setattr(retriever, "query_arxiv_async", fake_query)
+    monkeypatch.setattr(AgentConfig, "build_embeddings", lambda self: RecordingEmbeddings())
+    config = AgentConfig(mock_mode=False, cache_dir=None, source_selection="coverage", selection_chapter_coverage=1)
+    sources = retrieve_sources(config, {"C1": ["reactor", "slow fluid"]})
+    assert timeline.index("embedded:reactor") < timeline.index("fetched:slow fluid")
+    assert [source.title for source in sources] == ["reactor"]
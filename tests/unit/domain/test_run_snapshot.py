@@ -0,0 +1,62 @@
+from backend.domain.kaeri_ar_agent.schemas import (
+    EvidenceItem,
+    IdentifierRecord,
+    PipelineInputs,
+    RunSnapshot,
+    SourceRecord,
+)
+from backend.domain.kaeri_ar_agent.tools.run_snapshot import (
+    RunSnapshotStore,
+    merge_evidence,
+    new_sources,
+    snapshot_key,
+)
+
+
+def test_snapshot_key_ignores_whitespace_and_case():
+    first = PipelineInputs(raw_prompt="Monthly  Report", topic="a", outline=[])
+    second = PipelineInputs(raw_prompt="monthly report", topic="b", outline=["C1"])
+    assert snapshot_key(first) == snapshot_key(second)
+
+
+def test_snapshot_store_roundtrip(tmp_path):
+    store = RunSnapshotStore(str(tmp_path))
+    snapshot = RunSnapshot(
+        key="k",
+        created_at="2026-01-01T00:00:00",
+        sources=[SourceRecord(source_id="S-1", title="t")],
+    )
+    store.save(snapshot)
+    assert store.load("k") == snapshot
+    assert store.load("missing") is None
+    assert RunSnapshotStore(None).load("k") is None
+
+
+def test_new_sources_skips_known_ids_versions_and_dois():
+    previous = [
+        SourceRecord(source_id="S-ARXIV-2401.00001v1", title="old"),
+        SourceRecord(source_id="S-2", title="doi", canonical_source_id="doi:10.1/x"),
+    ]
+    retrieved = [
+        SourceRecord(source_id="S-ARXIV-2401.00001v2", title="new version"),
+        SourceRecord(source_id="S-3", title="same doi", canonical_source_id="doi:10.1/x"),
+        SourceRecord(
+            source_id="S-ARXIV-2402.00002v1",
+            title="fresh",
+            identifiers=IdentifierRecord(arxiv_id="2402.00002v1"),
+        ),
+    ]
+    assert [source.title for source in new_sources(previous, retrieved)] == ["fresh"]
+
+
+def test_merge_evidence_renumbers_fresh_claims_per_chapter():
+    previous = [
+        EvidenceItem(claim_id="C1-C001", source_id="a", snippet="x", chapter_id="C1"),
+        EvidenceItem(claim_id="C1-C004", source_id="b", snippet="y", chapter_id="C1"),
+    ]
+    fresh = [
+        EvidenceItem(claim_id="C1-C001", source_id="c", snippet="z", chapter_id="C1"),
+        EvidenceItem(claim_id="C2-C001", source_id="c", snippet="w", chapter_id="C2"),
+    ]
+    merged = merge_evidence(previous, fresh)
+    assert [item.claim_id for item in merged] == ["C1-C001", "C1-C004", "C1-C005", "C2-C001"]
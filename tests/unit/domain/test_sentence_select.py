@@ -0,0 +1,31 @@
+from backend.domain.kaeri_ar_agent.tools.sentence_select import excerpt, select_sentences, sentence_spans
+
+
+ABSTRACT = (
+    "We study nuclear plant operations. "
+    "A graph neural surrogate predicts reactor core temperature. "
+    "Results hold on three benchmarks.  "
+)
+
+
+def test_sentence_spans_trim_and_cover_sentences():
+    spans = sentence_spans(ABSTRACT)
+    assert [ABSTRACT[begin:end] for begin, end in spans] == [
+        "We study nuclear plant operations.",
+        "A graph neural surrogate predicts reactor core temperature.",
+        "Results hold on three benchmarks.",
+    ]
+    assert sentence_spans("") == []
+
+
+def test_select_sentences_prefers_overlap_and_keeps_reading_order():
+    spans = select_sentences(ABSTRACT, ["reactor core temperature surrogate", "nuclear plant"], max_sentences=2)
+    assert excerpt(ABSTRACT, spans) == (
+        "We study nuclear plant operations. A graph neural surrogate predicts reactor core temperature."
+    )
+    assert select_sentences(ABSTRACT, ["reactor core"], max_sentences=1) == [spans[1]]
+
+
+def test_select_sentences_falls_back_to_lead_sentence():
+    spans = select_sentences(ABSTRACT, ["원자로 노심"], max_sentences=2)
+    assert excerpt(ABSTRACT, spans) == "We study nuclear plant operations."
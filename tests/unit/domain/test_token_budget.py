@@ -0,0 +1,13 @@
+from backend.domain.kaeri_ar_agent.tools import token_budget
+from backend.domain.kaeri_ar_agent.tools.token_budget import count_tokens, estimate_tokens
+
+
+def test_estimate_counts_non_ascii_characters_individually():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("노심 ab") == 3
+
+
+def test_count_tokens_falls_back_without_encoding(monkeypatch):
+    monkeypatch.setattr(token_budget, "_encoding", lambda _model: None)
+    assert count_tokens("abcdefgh", "gpt-4o-mini") == 2
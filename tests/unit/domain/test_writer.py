@@ -1,4 +1,6 @@
-from backend.domain.kaeri_ar_agent.agents.writer import write_chapters
+import asyncio
+
+from backend.domain.kaeri_ar_agent.agents.writer import draft_is_current, write_chapters
 from backend.domain.kaeri_ar_agent.config import AgentConfig
 from backend.domain.kaeri_ar_agent.schemas import EvidenceItem
 
@@ -16,3 +18,45 @@ def test_writer_uses_evidence_source_ids():
     drafts = write_chapters(config, "topic", None, [], ["C1"], evidence)
     assert "doi:10.1234/test" in drafts[0].text
     assert drafts[0].citation_source_ids == ["doi:10.1234/test"]
+
+
+def test_writer_keeps_most_relevant_evidence_within_budget():
+    config = AgentConfig(mock_mode=True, writer_evidence_token_budget=20)
+    evidence = [
+        EvidenceItem(
+            claim_id=f"C1-00{index}",
+            source_id=f"doi:10.1234/{index}",
+            snippet="x" * 40,
+            chapter_id="C1",
+            relevance_score=score,
+        )
+        for index, score in enumerate([0.1, 0.9, 0.5])
+    ]
+    drafts = write_chapters(config, "topic", None, [], ["C1"], evidence)
+    assert drafts[0].claim_ids == ["C1-001"]
+    assert draft_is_current(config, drafts[0], evidence)
+    evidence[1] = evidence[1].model_copy(update={"snippet": "y" * 40})
+    assert not draft_is_current(config, drafts[0], evidence)
+
+
+def test_writer_bounds_concurrent_calls():
+    active = 0
+    peak = 0
+
+    class FakeLLM:
+        async def astream(self, _messages):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            yield type("Chunk", (), {"content": "본문"})
+
+    config = AgentConfig(mock_mode=False, max_concurrency=2)
+    evidence = [
+        EvidenceItem(claim_id=f"C{index}-001", source_id="doi:10.1234/test", snippet="snippet", chapter_id=f"C{index}")
+        for index in range(5)
+    ]
+    drafts = write_chapters(config, "topic", None, [], [f"C{index}" for index in range(5)], evidence, llm=FakeLLM())
+    assert len(drafts) == 5
+    assert peak == 2